@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+from tb_leads.utils.html_document import HtmlDocument, parse_html
 
-def detect_contact_signals(html: str) -> tuple[bool, bool]:
-    h = (html or "").lower()
-    has_form = "<form" in h
-    has_cta = any(
-        token in h
-        for token in [
-            "kontakt",
-            "termin",
-            "anfrage",
-            "jetzt anrufen",
-            "kostenloses erstgespräch",
-            "get in touch",
-            "contact",
-        ]
-    )
+CTA_TOKENS = [
+    "kontakt",
+    "termin",
+    "anfrage",
+    "jetzt anrufen",
+    "kostenloses erstgespräch",
+    "get in touch",
+    "contact",
+]
+
+
+def detect_contact_signals_in_document(doc: HtmlDocument) -> tuple[bool, bool]:
+    h = doc.search_text
+    has_form = doc.form_count > 0
+    has_cta = any(token in h for token in CTA_TOKENS)
     return has_cta, has_form
+
+
+def detect_contact_signals(html: str) -> tuple[bool, bool]:
+    return detect_contact_signals_in_document(parse_html(html))
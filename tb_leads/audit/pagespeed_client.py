@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import json
+import math
+import threading
 import urllib.parse
-from typing import Any
+from collections.abc import Mapping
+from datetime import UTC, datetime, timedelta
+from typing import Any, Protocol
 
-from tb_leads.utils.errors import ToolError
+from tb_leads.utils.errors import ErrorCode, ToolError
 from tb_leads.utils.http import HttpClient
 
 
@@ -34,19 +38,155 @@ def _heuristic_result(response_time_ms: int | None, source: str, warning: str |
     }
 
 
+class PageSpeedStore(Protocol):
+    """Persistence behind ``PageSpeedLedger``; the CLI injects the SQLite repository."""
+
+    def get_pagespeed_measurements(self, urls: list[str], strategy: str) -> dict[str, dict[str, Any]]: ...
+
+    def put_pagespeed_measurements(self, strategy: str, results: Mapping[str, dict[str, Any]]) -> None: ...
+
+    def reserve_pagespeed_calls(self, day: str, wanted: int, daily_quota: int) -> int: ...
+
+    def release_pagespeed_calls(self, day: str, calls: int) -> None: ...
+
+    def exhaust_pagespeed_quota(self, day: str, daily_quota: int) -> None: ...
+
+
+class PageSpeedLedger:
+    """Persisted PageSpeed results plus a daily API quota shared by all runs.
+
+    ``plan()`` decides up front which URLs of a run may spend an API call: the
+    run reserves up to ``daily_quota / runs_per_day`` calls (capped by what is
+    left today) in one booking, handed out to URLs without a measurement first,
+    then to the oldest ones. Everything else is served from the cache, stale if
+    need be. Audit workers only touch in-memory state: new measurements and a
+    remote quota exhaustion are queued and written by ``close()`` on the calling
+    thread, which also gives unspent calls back.
+    """
+
+    def __init__(
+        self,
+        store: PageSpeedStore,
+        strategy: str = "mobile",
+        ttl_hours: float = 168,
+        daily_quota: int = 25000,
+        runs_per_day: int = 4,
+    ):
+        self.store = store
+        self.strategy = strategy
+        self.ttl_hours = float(ttl_hours)
+        self.daily_quota = max(0, int(daily_quota))
+        self.runs_per_day = max(1, int(runs_per_day))
+        self._known: dict[str, dict[str, Any]] = {}
+        self._allowed: set[str] = set()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._day = self._today()
+        self._unspent = 0
+        self._exhausted = False
+        self._exhaust_pending = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(UTC).date().isoformat()
+
+    def _is_fresh(self, measured_at: str) -> bool:
+        cutoff = (datetime.now(UTC) - timedelta(hours=self.ttl_hours)).isoformat()
+        return measured_at >= cutoff
+
+    def plan(self, urls: list[str]) -> None:
+        self.close()
+        urls = [u for u in dict.fromkeys(urls) if u]
+        self._known = self.store.get_pagespeed_measurements(urls, self.strategy)
+
+        due = [u for u in urls if u not in self._known or not self._is_fresh(self._known[u]["measured_at"])]
+        # never measured first, then oldest measurement first
+        due.sort(key=lambda u: (u in self._known, self._known.get(u, {}).get("measured_at", "")))
+        wanted = min(len(due), math.ceil(self.daily_quota / self.runs_per_day))
+        self._day = self._today()
+        self._exhausted = False
+        self._unspent = self.store.reserve_pagespeed_calls(self._day, wanted, self.daily_quota) if wanted else 0
+        self._allowed = set(due[: self._unspent])
+
+    def lookup(self, url: str) -> tuple[dict[str, Any] | None, bool]:
+        """Returns (cached result, is_fresh)."""
+        with self._lock:
+            hit = self._known.get(url)
+        if hit is None:
+            return None, False
+        return dict(hit["result"]), self._is_fresh(hit["measured_at"])
+
+    def try_spend(self, url: str) -> bool:
+        with self._lock:
+            if url not in self._allowed:
+                return False
+            self._allowed.discard(url)
+            self._unspent -= 1
+            return True
+
+    def store_result(self, url: str, result: dict[str, Any]) -> None:
+        with self._lock:
+            self._known[url] = {"result": dict(result), "measured_at": datetime.now(UTC).isoformat()}
+            self._pending[url] = dict(result)
+
+    def mark_exhausted(self) -> None:
+        """Remote quota is gone (HTTP 429): stop spending calls for the rest of the day."""
+        with self._lock:
+            if self._exhausted:
+                return
+            self._exhausted = True
+            self._exhaust_pending = True
+            self._allowed.clear()
+            self._unspent = 0
+
+    def close(self) -> None:
+        """Writes queued measurements and quota changes; call once the audit workers are done."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            unspent, self._unspent = self._unspent, 0
+            exhausted, self._exhaust_pending = self._exhaust_pending, False
+            self._allowed.clear()
+        if batch:
+            self.store.put_pagespeed_measurements(self.strategy, batch)
+        if exhausted:
+            self.store.exhaust_pagespeed_quota(self._day, self.daily_quota)
+        elif unspent > 0:
+            self.store.release_pagespeed_calls(self._day, unspent)
+
+
+def _from_cache(cached: dict[str, Any], source: str, warning: str | None = None) -> dict[str, Any]:
+    out = dict(cached)
+    out["source"] = source
+    out["warnings"] = [warning] if warning else []
+    out["error_codes"] = []
+    return out
+
+
 def fetch_pagespeed(
     url: str | None,
     api_key: str | None,
     http_client: HttpClient,
     strategy: str = "mobile",
     response_time_ms: int | None = None,
+    ledger: PageSpeedLedger | None = None,
 ) -> dict[str, Any]:
     if not url:
         return _heuristic_result(response_time_ms, source="heuristic_no_url", warning="PAGESPEED:NO_URL")
 
+    cached, fresh = ledger.lookup(url) if ledger else (None, False)
+    if cached and fresh:
+        return _from_cache(cached, source="google_pagespeed_cache")
+
     if not api_key:
+        if cached:
+            return _from_cache(cached, source="google_pagespeed_stale", warning="PAGESPEED:API_KEY_MISSING")
         return _heuristic_result(response_time_ms, source="heuristic_no_api_key", warning="PAGESPEED:API_KEY_MISSING")
 
+    if ledger and not ledger.try_spend(url):
+        if cached:
+            return _from_cache(cached, source="google_pagespeed_stale", warning="PAGESPEED:QUOTA_DEFERRED")
+        return _heuristic_result(response_time_ms, source="heuristic_quota_deferred", warning="PAGESPEED:QUOTA_DEFERRED")
+
     endpoint = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
     params = urllib.parse.urlencode({"url": url, "strategy": strategy, "key": api_key})
     req_url = f"{endpoint}?{params}"
@@ -63,7 +203,7 @@ def fetch_pagespeed(
         tbt = int(float(audits.get("total-blocking-time", {}).get("numericValue", 0)))
         cls = float(audits.get("cumulative-layout-shift", {}).get("numericValue", 0.0))
 
-        return {
+        result = {
             "mobile_pagespeed_score": perf,
             "cwv_lcp_ms": lcp,
             "cwv_tbt_ms": tbt,
@@ -72,7 +212,16 @@ def fetch_pagespeed(
             "warnings": [],
             "error_codes": [],
         }
+        if ledger:
+            ledger.store_result(url, result)
+        return result
     except ToolError as exc:
+        if ledger and exc.code == ErrorCode.NETWORK_RATE_LIMITED:
+            ledger.mark_exhausted()
+        if cached:
+            out = _from_cache(cached, source="google_pagespeed_stale", warning=f"PAGESPEED:FALLBACK:{exc.code}")
+            out["error_codes"] = [exc.code]
+            return out
         return _heuristic_result(
             response_time_ms,
             source="heuristic_fallback",
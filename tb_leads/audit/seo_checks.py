@@ -1,19 +1,22 @@
 from __future__ import annotations
 
-import re
+from tb_leads.utils.html_document import HtmlDocument, parse_html
 
 
-def seo_score_from_html(html: str) -> int:
-    h = html or ""
+def seo_score_from_document(doc: HtmlDocument) -> int:
     score = 0
 
-    if re.search(r"<title>[^<]{10,}</title>", h, re.IGNORECASE):
+    if any(len(t) >= 10 for t in doc.titles):
         score += 35
-    if re.search(r"<meta[^>]+name=[\"']description[\"'][^>]+content=[\"'][^\"']{40,}[\"']", h, re.IGNORECASE):
+    if any(len(d) >= 40 for d in doc.meta_descriptions):
         score += 30
-    if re.search(r"<h1[^>]*>[^<]{3,}</h1>", h, re.IGNORECASE):
+    if any(len(h) >= 3 for h in doc.h1):
         score += 20
-    if "viewport" in h.lower():
+    if doc.has_viewport:
         score += 15
 
     return min(score, 100)
+
+
+def seo_score_from_html(html: str) -> int:
+    return seo_score_from_document(parse_html(html))
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from typing import Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, Iterator
 
-from tb_leads.audit.cta_checks import detect_contact_signals
-from tb_leads.audit.pagespeed_client import fetch_pagespeed
-from tb_leads.audit.seo_checks import seo_score_from_html
+from tb_leads.audit.cta_checks import detect_contact_signals_in_document
+from tb_leads.audit.pagespeed_client import PageSpeedLedger, fetch_pagespeed
+from tb_leads.audit.seo_checks import seo_score_from_document
 from tb_leads.audit.website_probe import probe_website
 from tb_leads.enrich.contact_enrichment import enrich_contact_data
+from tb_leads.utils.html_document import parse_html
 from tb_leads.utils.http import HttpClient
+from tb_leads.utils.page_cache import PageCache
 
 
 def run_audit(
@@ -16,11 +20,17 @@ def run_audit(
     http_client: HttpClient,
     strategy: str = "mobile",
     enrichment_max_pages: int = 4,
+    pagespeed_ledger: PageSpeedLedger | None = None,
+    enrichment_early_stop_score: int | None = None,
 ) -> dict[str, Any]:
-    probe = probe_website(url=website_url, http_client=http_client)
+    # probe and enrichment share one cache, so the homepage is downloaded only once
+    page_cache = PageCache(http_client)
+    probe = probe_website(url=website_url, http_client=http_client, page_cache=page_cache)
     html = probe.get("html", "")
-    has_cta, has_form = detect_contact_signals(html)
-    seo_score = seo_score_from_html(html) if html else 0
+    # enrichment reuses this document (and its cached fields) for the homepage
+    doc = page_cache.get_document(website_url) if html and website_url else parse_html("")
+    has_cta, has_form = detect_contact_signals_in_document(doc)
+    seo_score = seo_score_from_document(doc) if html else 0
 
     ps = fetch_pagespeed(
         url=website_url,
@@ -28,12 +38,15 @@ def run_audit(
         http_client=http_client,
         strategy=strategy,
         response_time_ms=probe.get("response_time_ms"),
+        ledger=pagespeed_ledger,
     )
 
     enrichment = enrich_contact_data(
         website_url,
         http_client=http_client,
         max_pages=max(1, int(enrichment_max_pages)),
+        page_cache=page_cache,
+        early_stop_min_email_score=enrichment_early_stop_score,
     )
 
     # Tech health rough aggregation 0..100
@@ -58,6 +71,7 @@ def run_audit(
         "website_present": bool(probe.get("website_present")),
         "http_status": probe.get("http_status"),
         "mobile_pagespeed_score": ps.get("mobile_pagespeed_score"),
+        "pagespeed_source": ps.get("source"),
         "seo_score": seo_score,
         "cwv_lcp_ms": ps.get("cwv_lcp_ms"),
         "cwv_cls": ps.get("cwv_cls"),
@@ -72,4 +86,56 @@ def run_audit(
         "enriched_address": enrichment.address,
         "enriched_contact_source_url": enrichment.source_url,
         "enrichment_pages_checked": enrichment.pages_checked,
+        "enrichment_discovery": enrichment.discovery,
+        "enrichment_pages_skipped": enrichment.pages_skipped,
+        "pages_fetched": page_cache.fetch_count,
     }
+
+
+def iter_audits(
+    website_urls: Iterable[str | None],
+    page_speed_api_key: str | None,
+    http_client: HttpClient,
+    strategy: str = "mobile",
+    enrichment_max_pages: int = 4,
+    workers: int = 1,
+    pagespeed_ledger: PageSpeedLedger | None = None,
+    enrichment_early_stop_score: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Audits many websites and yields the results in input order.
+
+    With ``workers > 1`` up to ``workers`` audits run in parallel threads; at most
+    ``2 * workers`` audits are in flight so that closing the iterator early
+    (e.g. on an abort threshold) does not leave a long tail of queued work.
+    """
+
+    def audit_one(url: str | None) -> dict[str, Any]:
+        return run_audit(
+            url,
+            page_speed_api_key,
+            http_client=http_client,
+            strategy=strategy,
+            enrichment_max_pages=enrichment_max_pages,
+            pagespeed_ledger=pagespeed_ledger,
+            enrichment_early_stop_score=enrichment_early_stop_score,
+        )
+
+    workers = max(1, int(workers))
+    if workers == 1:
+        for url in website_urls:
+            yield audit_one(url)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tb-leads-audit")
+    pending: deque[Future[dict[str, Any]]] = deque()
+    try:
+        for url in website_urls:
+            pending.append(executor.submit(audit_one, url))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
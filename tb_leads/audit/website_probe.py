@@ -5,9 +5,10 @@ from typing import Any
 
 from tb_leads.utils.errors import ToolError
 from tb_leads.utils.http import HttpClient
+from tb_leads.utils.page_cache import PageCache
 
 
-def probe_website(url: str | None, http_client: HttpClient) -> dict[str, Any]:
+def probe_website(url: str | None, http_client: HttpClient, page_cache: PageCache | None = None) -> dict[str, Any]:
     if not url:
         return {
             "website_present": False,
@@ -20,7 +21,7 @@ def probe_website(url: str | None, http_client: HttpClient) -> dict[str, Any]:
 
     start = time.perf_counter()
     try:
-        html = http_client.get_text(url)
+        html = page_cache.get_text(url) if page_cache is not None else http_client.get_text(url)
         elapsed_ms = int((time.perf_counter() - start) * 1000)
         return {
             "website_present": True,
@@ -5,24 +5,28 @@ import time
 from dataclasses import dataclass
 from typing import Any
 
-from tb_leads.audit.service import run_audit
+from tb_leads.audit.pagespeed_client import PageSpeedLedger
+from tb_leads.audit.service import iter_audits
 from tb_leads.collectors.manual_public_csv import collect_from_csv
 from tb_leads.collectors.seed_public_demo import collect as seed_collect
 from tb_leads.collectors.public_osm import collect_osm_public
 from tb_leads.collectors.public_nominatim import collect_nominatim_public
 from tb_leads.compliance.checker import basic_record_checks
-from tb_leads.config.loader import load_config
-from tb_leads.db.repository import Repository
+from tb_leads.config.loader import load_config, load_scoring_override
+from tb_leads.db.repository import CompanyRecord, LeadQuery, Repository
 from tb_leads.db.schema import init_db
 from tb_leads.reporting.csv_exporter import export_scored_leads
 from tb_leads.reporting.summary import summarize
-from tb_leads.scoring.engine import score_lead
+from tb_leads.scoring.batch import AuditColumns, score_batch
+from tb_leads.scoring.model import compile_scoring_model, model_from_config
+from tb_leads.scoring.simulate import format_simulation, simulate_scoring
 from tb_leads.sync.notion_client import NotionClient
 from tb_leads.enrich.validators import validate_lead_record
 from tb_leads.utils.errors import ErrorCode, ToolError
 from tb_leads.utils.http import HttpClient
+from tb_leads.utils.http_pool import ConnectionPool
 from tb_leads.utils.retry import RetryPolicy
-from tb_leads.utils.throttle import RateLimiter
+from tb_leads.utils.throttle import HostRateLimiter, RateLimiter, SqliteLimiterStore
 from tb_leads.utils.runlog import RunLogger
 
 
@@ -31,7 +35,10 @@ class RunCounters:
     collected: int = 0
     audited: int = 0
     enriched: int = 0
+    enrichment_pages_saved: int = 0
+    audit_cache_hits: int = 0
     scored: int = 0
+    scores_recomputed: int = 0
     sync_success: int = 0
     sync_created: int = 0
     sync_updated: int = 0
@@ -63,6 +70,8 @@ def build_parser() -> argparse.ArgumentParser:
 
     audit = sub.add_parser("audit", help="Auditiert Websites für bestehenden Run")
     audit.add_argument("--run-id", required=True)
+    audit.add_argument("--workers", type=int, default=None, help="Parallele Audits (default: audit.concurrency)")
+    audit.add_argument("--no-audit-cache", action="store_true", help="Audit-Cache früherer Runs ignorieren")
 
     score = sub.add_parser("score", help="Scored Leads für bestehenden Run")
     score.add_argument("--run-id", required=True)
@@ -89,6 +98,15 @@ def build_parser() -> argparse.ArgumentParser:
     run.add_argument("--skip-sync", action="store_true")
     run.add_argument("--resume-run-id")
     run.add_argument("--resume-latest", action="store_true")
+    run.add_argument("--workers", type=int, default=None, help="Parallele Audits (default: audit.concurrency)")
+    run.add_argument("--no-audit-cache", action="store_true", help="Audit-Cache früherer Runs ignorieren")
+
+    simulate = sub.add_parser(
+        "simulate-scoring", help="Vergleicht alternative Scoring-Regeln mit allen historischen Audits (schreibt nichts)"
+    )
+    simulate.add_argument("--scoring-config", required=True, help="YAML mit alternativem scoring-Abschnitt")
+    simulate.add_argument("--run-id", action="append", default=None, help="Nur diese Runs (mehrfach möglich)")
+    simulate.add_argument("--top", type=int, default=50, help="Größe der Top-Liste für den Rangvergleich")
 
     return parser
 
@@ -104,10 +122,38 @@ def _make_http_client(cfg: dict[str, Any]) -> HttpClient:
         jitter_s=float(network_cfg.get("jitter_seconds", 0.2)),
     )
 
+    timeout_s = float(network_cfg.get("timeout_seconds", 10))
+    pool = ConnectionPool(
+        timeout_s=timeout_s,
+        max_per_host=int(network_cfg.get("pool_max_per_host", 2)),
+        max_hosts=int(network_cfg.get("pool_max_hosts", 64)),
+        max_idle_s=float(network_cfg.get("pool_idle_seconds", 30)),
+    )
+
+    throttle_cfg = cfg.get("throttle", {})
+    shared_store = None
+    if throttle_cfg.get("shared_state"):
+        # global + API budgets are shared by every tb-leads process pointing at the same state file
+        state_path = throttle_cfg.get("shared_state_path") or f"{cfg.get('db_path', 'tb_leads.db')}.ratelimit"
+        shared_store = SqliteLimiterStore(state_path)
+
+    host_limiter = HostRateLimiter(
+        default_requests_per_minute=float(throttle_cfg.get("per_host_requests_per_minute", 20)),
+        burst=int(throttle_cfg.get("per_host_burst", 4)),
+        groups=throttle_cfg.get("apis") or {},
+        store=shared_store,
+    )
+
     return HttpClient(
-        timeout_s=float(network_cfg.get("timeout_seconds", 10)),
-        rate_limiter=RateLimiter(max_requests_per_minute=max_rpm),
+        timeout_s=timeout_s,
+        rate_limiter=RateLimiter(
+            max_requests_per_minute=max_rpm,
+            burst=int(throttle_cfg.get("global_burst", 5)),
+            store=shared_store,
+        ),
         retry_policy=retry_policy,
+        pool=pool,
+        host_limiter=host_limiter,
     )
 
 
@@ -165,149 +211,291 @@ def _collect_records(
 
     allowed = cfg.get("compliance", {}).get("allowed_sources", [])
     seen_keys: set[tuple[str, str | None, str]] = set()
-
-    for record in records:
-        validation = validate_lead_record(record)
-        if not validation.valid:
-            for code in validation.errors:
-                repo.insert_compliance_event(
-                    run_id=run_id,
-                    severity="error",
-                    rule_id=code,
-                    message="Lead record validation failed",
-                    context={"record": record.get("name"), "source": record.get("source_primary")},
+    compliance_events: list[dict[str, Any]] = []
+    accepted: list[dict[str, Any]] = []
+
+    # the whole stage is one transaction; companies, events and source rows go in as bulk statements
+    with repo.transaction():
+        for record in records:
+            validation = validate_lead_record(record)
+            if not validation.valid:
+                for code in validation.errors:
+                    compliance_events.append(
+                        {
+                            "severity": "error",
+                            "rule_id": code,
+                            "message": "Lead record validation failed",
+                            "context": {"record": record.get("name"), "source": record.get("source_primary")},
+                        }
+                    )
+                    counters.error_count += 1
+                continue
+
+            normalized = validation.normalized
+
+            dedupe_key = (
+                (normalized.get("name") or "").lower(),
+                (normalized.get("website_url") or "").lower() or None,
+                (normalized.get("city") or "").lower(),
+            )
+            if dedupe_key in seen_keys:
+                compliance_events.append(
+                    {
+                        "severity": "info",
+                        "rule_id": "DEDUP:IN_RUN_DUPLICATE",
+                        "message": "Duplicate lead dropped within current run",
+                        "context": {"name": normalized.get("name"), "city": normalized.get("city")},
+                    }
                 )
-                counters.error_count += 1
-            continue
+                continue
+            seen_keys.add(dedupe_key)
 
-        normalized = validation.normalized
+            events = basic_record_checks(normalized, allowed)
+            compliance_events.extend(events)
+            counters.error_count += sum(1 for ev in events if ev["severity"] == "error")
 
-        dedupe_key = (
-            (normalized.get("name") or "").lower(),
-            (normalized.get("website_url") or "").lower() or None,
-            (normalized.get("city") or "").lower(),
-        )
-        if dedupe_key in seen_keys:
-            repo.insert_compliance_event(
-                run_id=run_id,
-                severity="info",
-                rule_id="DEDUP:IN_RUN_DUPLICATE",
-                message="Duplicate lead dropped within current run",
-                context={"name": normalized.get("name"), "city": normalized.get("city")},
-            )
-            continue
-        seen_keys.add(dedupe_key)
-
-        events = basic_record_checks(normalized, allowed)
-        for ev in events:
-            repo.insert_compliance_event(
-                run_id=run_id,
-                severity=ev["severity"],
-                rule_id=ev["rule_id"],
-                message=ev["message"],
-                context=ev.get("context"),
-            )
-            if ev["severity"] == "error":
-                counters.error_count += 1
+            if any(ev["severity"] == "error" for ev in events):
+                continue
 
-        if any(ev["severity"] == "error" for ev in events):
-            continue
+            accepted.append(normalized)
 
-        company_id = repo.upsert_company(normalized)
-        repo.insert_source_record(
-            company_id=company_id,
-            run_id=run_id,
-            source_name=normalized.get("source_primary", "unknown"),
-            source_url=normalized.get("source_ref"),
-            raw_payload=normalized,
+        company_ids = repo.upsert_companies(accepted)
+        repo.insert_compliance_events(run_id, compliance_events)
+        repo.insert_source_records(
+            run_id,
+            (
+                {
+                    "company_id": company_id,
+                    "source_name": normalized.get("source_primary", "unknown"),
+                    "source_url": normalized.get("source_ref"),
+                    "raw_payload": normalized,
+                }
+                for company_id, normalized in zip(company_ids, accepted)
+            ),
         )
 
-    companies = repo.get_companies_for_run(run_id)
-    counters.collected = len(companies)
+    counters.collected = repo.count_companies_for_run(run_id)
     repo.update_run_counts(run_id, collected_count=counters.collected, error_count=counters.error_count)
     return counters.collected
 
 
+def _audit_workers(cfg: dict[str, Any], workers: int | None = None) -> int:
+    if workers is None:
+        workers = int(cfg.get("audit", {}).get("concurrency", 1))
+    return max(1, int(workers))
+
+
+def _audit_cache_ttl_hours(cfg: dict[str, Any]) -> float | None:
+    audit_cfg = cfg.get("audit", {})
+    if not audit_cfg.get("cache_enabled", True):
+        return None
+    ttl = float(audit_cfg.get("cache_ttl_hours", 0) or 0)
+    return ttl if ttl > 0 else None
+
+
+def _pagespeed_ledger(cfg: dict[str, Any], repo: Repository, strategy: str) -> PageSpeedLedger | None:
+    ps_cfg = cfg.get("pagespeed", {})
+    if not ps_cfg.get("cache_enabled", True):
+        return None
+    return PageSpeedLedger(
+        repo,
+        strategy=strategy,
+        ttl_hours=float(ps_cfg.get("cache_ttl_hours", 168)),
+        daily_quota=int(ps_cfg.get("daily_quota", 25000)),
+        runs_per_day=int(ps_cfg.get("runs_per_day", 4)),
+    )
+
+
+def _write_batch_size(cfg: dict[str, Any]) -> int:
+    return max(1, int(cfg.get("db", {}).get("write_batch_size", 50)))
+
+
+# PageSpeed values measured by Google in this audit (fresh call or fresh ledger entry);
+# heuristic placeholders and stale values must be refetched, not reused for the cache TTL.
+MEASURED_PAGESPEED_SOURCES = {"google_pagespeed", "google_pagespeed_cache"}
+
+
+def _is_cacheable_audit(audit: dict[str, Any]) -> bool:
+    return (
+        bool(audit.get("website_present"))
+        and not audit.get("error_codes")
+        and not audit.get("network_error_count")
+        and audit.get("pagespeed_source") in MEASURED_PAGESPEED_SOURCES
+    )
+
+
 def _audit_records(
     run_id: str,
     cfg: dict[str, Any],
     repo: Repository,
     counters: RunCounters,
     http_client: HttpClient,
+    workers: int | None = None,
+    limits: RunLimits | None = None,
+    use_cache: bool = True,
 ) -> dict[str, int]:
     repo.set_run_stage(run_id, "audit")
 
+    # kept as a list: PageSpeed budget planning and the cache lookups need the whole run up front
     companies = repo.get_companies_for_run(run_id)
     strategy = cfg.get("pagespeed", {}).get("strategy", "mobile")
     key = cfg.get("page_speed_api_key")
-    enrichment_max_pages = int(cfg.get("enrichment", {}).get("max_pages", 4))
+    enrichment_cfg = cfg.get("enrichment", {})
+    enrichment_max_pages = int(enrichment_cfg.get("max_pages", 4))
+    early_stop_score = (
+        int(enrichment_cfg.get("early_stop_min_email_score", 6)) if enrichment_cfg.get("early_stop_enabled", True) else None
+    )
+    cache_ttl_hours = _audit_cache_ttl_hours(cfg)
+
+    # domain-level cache from earlier runs; only the misses go to the network.
+    # use_cache=False bypasses reads but still refreshes the cache with the new results.
+    cached: dict[str, dict[str, Any]] = {}
+    if use_cache and cache_ttl_hours is not None:
+        for company in companies:
+            domain = company.website_domain
+            if domain and domain not in cached:
+                hit = repo.get_cached_audit(domain, max_age_hours=cache_ttl_hours)
+                # entries written before the PageSpeed-source check may hold placeholder values
+                if hit is not None and _is_cacheable_audit(hit):
+                    cached[domain] = hit
+    # each domain is audited once per run; further companies on it reuse that audit
+    to_audit: list[CompanyRecord] = []
+    queued: set[str] = set()
+    for company in companies:
+        domain = company.website_domain
+        if domain and (domain in cached or domain in queued):
+            continue
+        if domain:
+            queued.add(domain)
+        to_audit.append(company)
+
+    pagespeed_ledger = _pagespeed_ledger(cfg, repo, strategy)
+    if pagespeed_ledger is not None:
+        pagespeed_ledger.plan([c.website_url for c in to_audit if c.website_url])
 
     repo.clear_run_audits(run_id)
     enriched_count = 0
-    for company in companies:
-        audit = run_audit(
-            company.website_url,
-            key,
-            http_client=http_client,
-            strategy=strategy,
-            enrichment_max_pages=enrichment_max_pages,
-        )
-        repo.insert_website_audit(company.id, run_id, audit)
-
-        email = audit.get("enriched_email")
-        address = audit.get("enriched_address")
-        source_url = audit.get("enriched_contact_source_url")
-        if any([email, address]):
-            enriched_count += 1
-
-        counters.network_error_count += int(audit.get("network_error_count") or 0)
-        counters.error_count += len(audit.get("error_codes") or [])
-
-        repo.update_company_enrichment(
-            company_id=company.id,
-            email=email,
-            address_enriched=address,
-            contact_source_url=source_url,
-        )
+    audited_count = 0
+    cache_hits = 0
+    fresh_audits = iter_audits(
+        (company.website_url for company in to_audit),
+        key,
+        http_client=http_client,
+        strategy=strategy,
+        enrichment_max_pages=max(1, enrichment_max_pages),
+        workers=_audit_workers(cfg, workers),
+        pagespeed_ledger=pagespeed_ledger,
+        enrichment_early_stop_score=early_stop_score,
+    )
+    pages_saved = 0
+    batch_size = _write_batch_size(cfg)
+    pending: list[tuple[CompanyRecord, dict[str, Any], bool]] = []
+
+    def flush() -> None:
+        # one commit per batch; never held while waiting on audit workers (they write PageSpeed results)
+        if not pending:
+            return
+        with repo.transaction():
+            repo.insert_website_audits(run_id, ((company.id, audit) for company, audit, _ in pending))
+            for company, audit, cache_write in pending:
+                if cache_write:
+                    repo.put_cached_audit(company.website_domain or "", company.website_url, audit)
+                repo.update_company_enrichment(
+                    company_id=company.id,
+                    email=audit.get("enriched_email"),
+                    address_enriched=audit.get("enriched_address"),
+                    contact_source_url=audit.get("enriched_contact_source_url"),
+                )
+        pending.clear()
+
+    try:
+        # results arrive in company order, so DB writes stay deterministic with any worker count
+        run_audits: dict[str, dict[str, Any]] = {}
+        for company in companies:
+            domain = company.website_domain or ""
+            cached_audit = cached.get(domain) or run_audits.get(domain)
+            cache_write = False
+            if cached_audit is not None:
+                audit = dict(cached_audit, from_cache=True)
+                cache_hits += 1
+            else:
+                audit = next(fresh_audits)
+                if domain:
+                    run_audits[domain] = audit
+                cache_write = cache_ttl_hours is not None and bool(domain) and _is_cacheable_audit(audit)
+                pages_saved += int(audit.get("enrichment_pages_skipped") or 0)
+                counters.network_error_count += int(audit.get("network_error_count") or 0)
+                counters.error_count += len(audit.get("error_codes") or [])
+
+            pending.append((company, audit, cache_write))
+            audited_count += 1
+            if audit.get("enriched_email") or audit.get("enriched_address"):
+                enriched_count += 1
+
+            if len(pending) >= batch_size:
+                flush()
+            if limits is not None:
+                _check_abort_thresholds(run_id, counters, limits, repo)
+    finally:
+        fresh_audits.close()
+        if pagespeed_ledger is not None:
+            pagespeed_ledger.close()
+        flush()
+        counters.audited = audited_count
+        counters.enriched = enriched_count
+        counters.audit_cache_hits = cache_hits
+        counters.enrichment_pages_saved = pages_saved
 
-    counters.audited = len(companies)
-    counters.enriched = enriched_count
     repo.update_run_counts(
         run_id,
         error_count=counters.error_count,
         network_error_count=counters.network_error_count,
     )
-    return {"audited": counters.audited, "enriched": counters.enriched}
+    return {
+        "audited": counters.audited,
+        "enriched": counters.enriched,
+        "cache_hits": cache_hits,
+        "enrichment_pages_saved": pages_saved,
+    }
 
 
-def _score_records(run_id: str, repo: Repository, counters: RunCounters) -> int:
+def _score_records(run_id: str, cfg: dict[str, Any], repo: Repository, counters: RunCounters) -> int:
+    """Rescores only companies whose audit inputs or scoring model changed, then re-ranks the run."""
     repo.set_run_stage(run_id, "score")
-
-    companies = repo.get_companies_for_run(run_id)
-    audits = repo.latest_audit_for_run(run_id)
-
-    repo.clear_run_scores(run_id)
-    scored: list[tuple[str, dict[str, Any]]] = []
-    for company in companies:
-        audit = audits.get(company.id)
-        if not audit:
-            continue
-        result = score_lead(audit)
-        scored.append((company.id, result))
-
-    scored.sort(key=lambda x: x[1]["total"], reverse=True)
-    for rank, (company_id, result) in enumerate(scored, start=1):
-        repo.insert_lead_score(
-            company_id=company_id,
-            run_id=run_id,
-            score_total=result["total"],
-            score_class=result["class"],
-            breakdown=result["breakdown"],
-            priority_rank=rank,
+    model = model_from_config(cfg)
+
+    stored = repo.score_fingerprints_for_run(run_id)
+    changed = AuditColumns.for_model(model)
+    fingerprints: dict[str, str] = {}
+    for audit in repo.iter_latest_audits_for_run(run_id):
+        company_id = audit["company_id"]
+        fingerprint = model.input_fingerprint(audit)
+        fingerprints[company_id] = fingerprint
+        if stored.get(company_id) != fingerprint:
+            changed.append(company_id, audit)
+    # outdated scores plus scores of companies that no longer have an audit
+    stale = [cid for cid, fingerprint in stored.items() if fingerprints.get(cid) != fingerprint]
+
+    scores = score_batch(changed, model)
+    counters.scored = len(fingerprints)
+    counters.scores_recomputed = len(scores.keys)
+    with repo.transaction():
+        repo.delete_lead_scores(run_id, stale)
+        repo.insert_lead_scores(
+            run_id,
+            (
+                {
+                    "company_id": row["key"],
+                    "score_total": row["total"],
+                    "score_class": row["class"],
+                    "breakdown": row["breakdown"],
+                    "input_fingerprint": fingerprints[row["key"]],
+                }
+                for row in scores.rows()
+            ),
         )
-
-    counters.scored = len(scored)
-    repo.update_run_counts(run_id, scored_count=counters.scored)
+        repo.update_priority_ranks(run_id, partition_by=cfg.get("ranking", {}).get("partition_by") or ())
+        repo.update_run_counts(run_id, scored_count=counters.scored)
     return counters.scored
 
 
@@ -323,28 +511,20 @@ def _sync_records(
     repo.set_run_stage(run_id, "sync")
 
     effective_min_score = int(min_score if min_score is not None else cfg.get("min_score_for_sync", 0))
-    if min_class:
-        effective_min_class = min_class
-    else:
-        if effective_min_score >= 80:
-            effective_min_class = "A"
-        elif effective_min_score >= 50:
-            effective_min_class = "B"
-        else:
-            effective_min_class = "C"
-
-    leads = repo.get_scored_leads_for_run(run_id, min_class=effective_min_class)
-
-    if effective_min_score > 0:
-        leads = [lead for lead in leads if int(lead.get("score_total") or 0) >= effective_min_score]
+    # same class cutoffs as the score stage, so sync never disagrees with stored classes
+    effective_min_class = min_class or model_from_config(cfg).classify(effective_min_score)
 
     filters = cfg.get("filters", {})
-    if filters.get("require_website_for_sync"):
-        leads = [lead for lead in leads if lead.get("website_url")]
-    if filters.get("require_contact_for_sync"):
-        leads = [lead for lead in leads if lead.get("email") or lead.get("phone")]
-    if filters.get("require_email_for_sync"):
-        leads = [lead for lead in leads if lead.get("email")]
+    leads = repo.iter_scored_leads(
+        run_id,
+        LeadQuery(
+            min_class=effective_min_class,
+            min_score=effective_min_score,
+            require_website=bool(filters.get("require_website_for_sync")),
+            require_contact=bool(filters.get("require_contact_for_sync")),
+            require_email=bool(filters.get("require_email_for_sync")),
+        ),
+    )
 
     notion = NotionClient(
         token=cfg.get("notion_token"),
@@ -365,46 +545,60 @@ def _sync_records(
     example_lines: list[str] = []
 
     seen_sync_keys: set[tuple[str, str]] = set()
+    batch_size = _write_batch_size(cfg)
+    sync_rows: list[dict[str, Any]] = []
 
-    for lead in leads:
-        sync_key = ((lead.get("name") or "").strip().lower(), (lead.get("website_domain") or lead.get("website_url") or "").strip().lower())
-        if sync_key in seen_sync_keys:
-            result = {"status": "skipped", "reason": "in_run_duplicate_sync_key", "action": "dedupe"}
-        else:
-            seen_sync_keys.add(sync_key)
-            result = notion.upsert_lead(lead)
-
-        status = result.get("status", "failed")
-        action = result.get("action")
-
-        if status == "success":
-            result_counts["success"] += 1
-            if action == "created":
-                result_counts["created"] += 1
-            if action == "updated":
-                result_counts["updated"] += 1
-        elif status == "skipped":
-            result_counts["skipped"] += 1
-        else:
-            result_counts["failed"] += 1
-            counters.error_count += 1
-            if str(result.get("error_code", "")).startswith("NOTION_"):
-                counters.network_error_count += 1
-
-        if len(example_lines) < 5:
-            example_lines.append(
-                f"- {lead.get('name')} | {lead.get('score_class')} {lead.get('score_total')} | "
-                f"email={lead.get('email') or '-'} | address={lead.get('address') or '-'} | "
-                f"sync={status}/{action or '-'}"
-            )
+    def flush() -> None:
+        if sync_rows:
+            repo.insert_notion_syncs(run_id, sync_rows)
+            sync_rows.clear()
 
-        repo.insert_notion_sync(
-            company_id=lead["company_id"],
-            run_id=run_id,
-            status=status,
-            notion_page_id=result.get("notion_page_id"),
-            sync_error=result.get("error") or result.get("reason"),
-        )
+    # sync log rows are committed per batch; already sent leads are still logged on errors
+    try:
+        for lead in leads:
+            sync_key = ((lead.name or "").strip().lower(), (lead.get("website_domain") or lead.get("website_url") or "").strip().lower())
+            if sync_key in seen_sync_keys:
+                result = {"status": "skipped", "reason": "in_run_duplicate_sync_key", "action": "dedupe"}
+            else:
+                seen_sync_keys.add(sync_key)
+                result = notion.upsert_lead(lead)
+
+            status = result.get("status", "failed")
+            action = result.get("action")
+
+            if status == "success":
+                result_counts["success"] += 1
+                if action == "created":
+                    result_counts["created"] += 1
+                if action == "updated":
+                    result_counts["updated"] += 1
+            elif status == "skipped":
+                result_counts["skipped"] += 1
+            else:
+                result_counts["failed"] += 1
+                counters.error_count += 1
+                if str(result.get("error_code", "")).startswith("NOTION_"):
+                    counters.network_error_count += 1
+
+            if len(example_lines) < 5:
+                example_lines.append(
+                    f"- {lead.name} | {lead.score_class} {lead.score_total} | "
+                    f"email={lead.email or '-'} | address={lead.address or '-'} | "
+                    f"sync={status}/{action or '-'}"
+                )
+
+            sync_rows.append(
+                {
+                    "company_id": lead.company_id,
+                    "status": status,
+                    "notion_page_id": result.get("notion_page_id"),
+                    "sync_error": result.get("error") or result.get("reason"),
+                }
+            )
+            if len(sync_rows) >= batch_size:
+                flush()
+    finally:
+        flush()
 
     counters.sync_success = result_counts["success"]
     counters.sync_created = result_counts["created"]
@@ -423,13 +617,27 @@ def _sync_records(
 
 def _report(run_id: str, out: str, repo: Repository) -> str:
     repo.set_run_stage(run_id, "report")
-    leads = repo.get_scored_leads_for_run(run_id, min_class="C")
-    path = export_scored_leads(leads, out, run_id)
-    print(summarize(leads))
+    # two streaming passes instead of holding the whole run in memory
+    path = export_scored_leads(repo.iter_scored_leads_for_run(run_id, min_class="C"), out, run_id)
+    print(summarize(repo.iter_scored_leads_for_run(run_id, min_class="C")))
     print(f"CSV: {path}")
     return path
 
 
+def _simulate_scoring(args: argparse.Namespace, cfg: dict[str, Any], repo: Repository) -> int:
+    baseline = model_from_config(cfg)
+    try:
+        candidate = compile_scoring_model(load_scoring_override(args.scoring_config, baseline.spec))
+    except Exception as exc:  # noqa: BLE001
+        print(f"Scoring-Config ungültig: {args.scoring_config} - {exc}")
+        return 2
+
+    fields = {*baseline.flag_fields, *baseline.value_fields, *candidate.flag_fields, *candidate.value_fields}
+    audits = repo.iter_latest_audits(sorted(fields), run_ids=args.run_id)
+    print(format_simulation(simulate_scoring(audits, baseline, candidate, top=args.top)))
+    return 0
+
+
 def _resolve_run_for_execution(args: argparse.Namespace, cfg: dict[str, Any], repo: Repository) -> tuple[str, bool]:
     """Returns (run_id, resumed)."""
     if getattr(args, "resume_run_id", None):
@@ -497,21 +705,32 @@ def _run_pipeline(args: argparse.Namespace, cfg: dict[str, Any], repo: Repositor
             run_logger.event("collect", "skipped", {"reason": "resumed"})
         _check_abort_thresholds(run_id, counters, limits, repo)
 
-        _audit_records(run_id, cfg, repo, counters, http_client)
+        _audit_records(
+            run_id,
+            cfg,
+            repo,
+            counters,
+            http_client,
+            workers=args.workers,
+            limits=limits,
+            use_cache=not args.no_audit_cache,
+        )
         run_logger.event(
             "audit",
             "done",
             {
                 "audited": counters.audited,
                 "enriched": counters.enriched,
+                "cache_hits": counters.audit_cache_hits,
+                "enrichment_pages_saved": counters.enrichment_pages_saved,
                 "errors": counters.error_count,
                 "network_errors": counters.network_error_count,
             },
         )
         _check_abort_thresholds(run_id, counters, limits, repo)
 
-        _score_records(run_id, repo, counters)
-        run_logger.event("score", "done", {"scored": counters.scored})
+        _score_records(run_id, cfg, repo, counters)
+        run_logger.event("score", "done", {"scored": counters.scored, "recomputed": counters.scores_recomputed})
         _check_abort_thresholds(run_id, counters, limits, repo)
 
         sync_result = {"counts": {"success": 0, "created": 0, "updated": 0, "failed": 0, "skipped": 0}, "examples": []}
@@ -570,20 +789,7 @@ def _run_pipeline(args: argparse.Namespace, cfg: dict[str, Any], repo: Repositor
             repo.set_run_stage(run_id, "partial")
 
 
-def main(argv: list[str] | None = None) -> int:
-    args = build_parser().parse_args(argv)
-    cfg = load_config()
-    db_path = cfg.get("db_path", "tb_leads.db")
-
-    if args.command == "init-db":
-        init_db(db_path)
-        print(f"DB initialisiert: {db_path}")
-        return 0
-
-    init_db(db_path)
-    repo = Repository(db_path)
-    http_client = _make_http_client(cfg)
-
+def _dispatch(args: argparse.Namespace, cfg: dict[str, Any], repo: Repository, http_client: HttpClient) -> int:
     if args.command == "collect":
         run_id = repo.create_run(args.region, args.industry, args.limit)
         counters = RunCounters()
@@ -595,18 +801,26 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.command == "audit":
         counters = RunCounters()
-        result = _audit_records(args.run_id, cfg, repo, counters, http_client)
+        result = _audit_records(
+            args.run_id,
+            cfg,
+            repo,
+            counters,
+            http_client,
+            workers=args.workers,
+            use_cache=not args.no_audit_cache,
+        )
         print(
             f"Audit abgeschlossen für {result['audited']} Companies "
-            f"(Enrichment mit E-Mail/Adresse: {result['enriched']}) "
+            f"(Enrichment mit E-Mail/Adresse: {result['enriched']}, aus Cache: {result['cache_hits']}) "
             f"errors={counters.error_count} net_errors={counters.network_error_count}"
         )
         return 0
 
     if args.command == "score":
         counters = RunCounters()
-        scored = _score_records(args.run_id, repo, counters)
-        print(f"Scoring abgeschlossen. Scores: {scored} (run_id={args.run_id})")
+        scored = _score_records(args.run_id, cfg, repo, counters)
+        print(f"Scoring abgeschlossen. Scores: {scored}, neu berechnet: {counters.scores_recomputed} (run_id={args.run_id})")
         return 0
 
     if args.command == "sync":
@@ -622,8 +836,30 @@ def main(argv: list[str] | None = None) -> int:
     if args.command == "run":
         return _run_pipeline(args, cfg, repo, http_client)
 
+    if args.command == "simulate-scoring":
+        return _simulate_scoring(args, cfg, repo)
+
     return 1
 
 
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    cfg = load_config()
+    db_path = cfg.get("db_path", "tb_leads.db")
+
+    if args.command == "init-db":
+        init_db(db_path)
+        print(f"DB initialisiert: {db_path}")
+        return 0
+
+    init_db(db_path)
+    with Repository(db_path) as repo:
+        http_client = _make_http_client(cfg)
+        try:
+            return _dispatch(args, cfg, repo, http_client)
+        finally:
+            http_client.close()
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
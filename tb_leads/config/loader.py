@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import copy
 import os
 from pathlib import Path
 from typing import Any
 
+from tb_leads.scoring.model import DEFAULT_SCORING, compile_scoring_model
+
 
 def _fallback_config() -> dict[str, Any]:
     return {
@@ -11,7 +14,14 @@ def _fallback_config() -> dict[str, Any]:
         "default_radius_km": 30,
         "default_limit": 30,
         "min_score_for_sync": 50,
-        "pagespeed": {"strategy": "mobile"},
+        "pagespeed": {
+            "strategy": "mobile",
+            "cache_enabled": True,
+            "cache_ttl_hours": 168,
+            "daily_quota": 25000,
+            "runs_per_day": 4,
+        },
+        "audit": {"concurrency": 4, "cache_enabled": True, "cache_ttl_hours": 72},
         "notion": {"enabled": True, "api_base_url": "https://api.notion.com/v1"},
         "compliance": {
             "allowed_sources": ["manual_public_csv", "seed_public_demo", "osm_overpass_public", "nominatim_public"],
@@ -24,6 +34,26 @@ def _fallback_config() -> dict[str, Any]:
             "backoff_base_seconds": 0.35,
             "backoff_max_seconds": 4.0,
             "jitter_seconds": 0.2,
+            "pool_max_per_host": 2,
+            "pool_max_hosts": 64,
+            "pool_idle_seconds": 30,
+        },
+        "throttle": {
+            "global_burst": 5,
+            "shared_state": False,
+            "shared_state_path": None,
+            "per_host_requests_per_minute": 20,
+            "per_host_burst": 4,
+            "apis": {
+                "nominatim": {"hosts": ["nominatim.openstreetmap.org"], "requests_per_minute": 50, "burst": 1},
+                "overpass": {
+                    "hosts": ["overpass-api.de", "overpass.kumi.systems", "overpass.openstreetmap.ru"],
+                    "requests_per_minute": 10,
+                    "burst": 2,
+                },
+                "pagespeed": {"hosts": ["www.googleapis.com"], "requests_per_minute": 240, "burst": 10},
+                "notion": {"hosts": ["api.notion.com"], "requests_per_minute": 180, "burst": 3},
+            },
         },
         "run": {
             "max_errors_per_run": 50,
@@ -34,9 +64,18 @@ def _fallback_config() -> dict[str, Any]:
             "require_contact_for_sync": False,
             "require_email_for_sync": False,
         },
+        "db": {
+            "write_batch_size": 50,
+        },
         "enrichment": {
             "max_pages": 4,
+            "early_stop_enabled": True,
+            "early_stop_min_email_score": 6,
+        },
+        "ranking": {
+            "partition_by": [],
         },
+        "scoring": copy.deepcopy(DEFAULT_SCORING),
     }
 
 
@@ -57,6 +96,9 @@ def load_config(path: str | None = None) -> dict[str, Any]:
             # keep fallback defaults if YAML is unavailable or malformed
             pass
 
+    # invalid scoring rules (e.g. a class the DB does not accept) fail here, not mid-run
+    compile_scoring_model(cfg["scoring"])
+
     db_path = os.getenv("TB_LEADS_DB_PATH")
     if db_path:
         cfg["db_path"] = db_path
@@ -74,6 +116,10 @@ def load_config(path: str | None = None) -> dict[str, Any]:
     # optional overrides
     if os.getenv("TB_LEADS_MAX_REQUESTS_PER_MINUTE"):
         cfg.setdefault("compliance", {})["max_requests_per_minute"] = int(os.getenv("TB_LEADS_MAX_REQUESTS_PER_MINUTE", "30"))
+    if os.getenv("TB_LEADS_SHARED_RATE_LIMIT"):
+        cfg.setdefault("throttle", {})["shared_state"] = os.getenv("TB_LEADS_SHARED_RATE_LIMIT", "").lower() in {"1", "true", "yes"}
+    if os.getenv("TB_LEADS_RATE_LIMIT_STATE_PATH"):
+        cfg.setdefault("throttle", {})["shared_state_path"] = os.getenv("TB_LEADS_RATE_LIMIT_STATE_PATH")
     if os.getenv("TB_LEADS_MAX_ERRORS_PER_RUN"):
         cfg.setdefault("run", {})["max_errors_per_run"] = int(os.getenv("TB_LEADS_MAX_ERRORS_PER_RUN", "50"))
     if os.getenv("TB_LEADS_MAX_NETWORK_ERRORS_PER_RUN"):
@@ -90,6 +136,14 @@ def load_config(path: str | None = None) -> dict[str, Any]:
     if os.getenv("TB_LEADS_JITTER_SECONDS"):
         cfg.setdefault("network", {})["jitter_seconds"] = float(os.getenv("TB_LEADS_JITTER_SECONDS", "0.2"))
 
+    if os.getenv("TB_LEADS_AUDIT_CONCURRENCY"):
+        cfg.setdefault("audit", {})["concurrency"] = int(os.getenv("TB_LEADS_AUDIT_CONCURRENCY", "4"))
+
+    if os.getenv("TB_LEADS_PAGESPEED_DAILY_QUOTA"):
+        cfg.setdefault("pagespeed", {})["daily_quota"] = int(os.getenv("TB_LEADS_PAGESPEED_DAILY_QUOTA", "25000"))
+    if os.getenv("TB_LEADS_AUDIT_CACHE_TTL_HOURS"):
+        cfg.setdefault("audit", {})["cache_ttl_hours"] = float(os.getenv("TB_LEADS_AUDIT_CACHE_TTL_HOURS", "72"))
+
     if os.getenv("TB_LEADS_ENRICHMENT_MAX_PAGES"):
         cfg.setdefault("enrichment", {})["max_pages"] = int(os.getenv("TB_LEADS_ENRICHMENT_MAX_PAGES", "4"))
 
@@ -104,3 +158,18 @@ def deep_merge(base: dict[str, Any], update: dict[str, Any]) -> dict[str, Any]:
         else:
             result[key] = value
     return result
+
+
+def load_scoring_override(path: str, base: dict[str, Any]) -> dict[str, Any]:
+    """Reads an alternative ``scoring`` section (a full config file or only the section) merged over ``base``."""
+    import yaml  # type: ignore
+
+    loaded = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    if not isinstance(loaded, dict):
+        raise ValueError(f"{path}: expected a mapping")
+    section = loaded.get("scoring", loaded)
+    if not isinstance(section, dict):
+        raise ValueError(f"{path}: scoring must be a mapping")
+    merged = deep_merge(base, section)
+    compile_scoring_model(merged)
+    return merged
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from typing import Any
+
+CODEC_ZLIB = "zlib"
+
+
+def canonical_json(payload: dict[str, Any]) -> bytes:
+    """Stable encoding, so equal payloads hash equal regardless of key order."""
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def encode_payload(payload: dict[str, Any]) -> tuple[str, bytes]:
+    """Returns (sha256 hex of the canonical JSON, zlib-compressed JSON)."""
+    raw = canonical_json(payload)
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, 6)
+
+
+def decode_payload(codec: str, data: bytes) -> dict[str, Any]:
+    if codec != CODEC_ZLIB:
+        raise ValueError(f"unknown payload codec: {codec}")
+    return json.loads(zlib.decompress(data).decode("utf-8"))
@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 import uuid
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
+from tb_leads.db.payloads import CODEC_ZLIB, decode_payload, encode_payload
+
 
 def utcnow_iso() -> str:
     return datetime.now(UTC).isoformat()
@@ -28,8 +34,15 @@ def domain_of(url: str | None) -> str | None:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class CompanyRecord:
+    """One company of a run, copied out of its row into slots.
+
+    The optional columns are plain short strings, so they are copied eagerly:
+    reading them lazily would keep the whole ``sqlite3.Row`` alive per record,
+    which measured about a quarter more memory than these slots.
+    """
+
     id: str
     name: str
     industry: str
@@ -46,16 +59,190 @@ class CompanyRecord:
     contact_source_url: str | None
 
 
+class LeadRow(Mapping[str, Any]):
+    """One scored lead as read from the DB.
+
+    Wraps the tuple-backed ``sqlite3.Row`` instead of copying it into a dict;
+    still usable wherever a read-only mapping (``lead.get(...)``) is expected.
+    """
+
+    __slots__ = ("_row",)
+
+    def __init__(self, row: sqlite3.Row):
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._row[key]
+        except IndexError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._row.keys())
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def __repr__(self) -> str:
+        return f"LeadRow({dict(self)!r})"
+
+    @property
+    def company_id(self) -> str:
+        return self._row["company_id"]
+
+    @property
+    def name(self) -> str:
+        return self._row["name"]
+
+    @property
+    def score_total(self) -> int:
+        return int(self._row["score_total"])
+
+    @property
+    def score_class(self) -> str:
+        return self._row["score_class"]
+
+    @property
+    def email(self) -> str | None:
+        return self._row["email"]
+
+    @property
+    def address(self) -> str | None:
+        return self._row["address"]
+
+
+CLASS_RANK = {"A": 3, "B": 2, "C": 1}
+
+# allowed ranking partitions -> company column
+RANK_PARTITIONS = {"region": "c.city", "industry": "c.industry"}
+
+LEAD_COLUMNS = """
+  ls.*,
+  c.name,
+  c.industry,
+  c.city,
+  c.website_url,
+  c.website_domain,
+  c.phone,
+  c.email,
+  c.address AS address_source,
+  c.address_enriched,
+  COALESCE(c.address_enriched, c.address) AS address,
+  c.contact_source_url
+"""
+
+
+def _partition_columns(partition_by: Iterable[str]) -> list[str]:
+    columns = []
+    for name in partition_by:
+        if name not in RANK_PARTITIONS:
+            raise ValueError(f"unknown rank partition: {name} (allowed: {', '.join(RANK_PARTITIONS)})")
+        columns.append(RANK_PARTITIONS[name])
+    return columns
+
+
+def _rank_window(partition_by: Iterable[str]) -> str:
+    columns = _partition_columns(partition_by)
+    partition = f"PARTITION BY {', '.join(columns)} " if columns else ""
+    return f"RANK() OVER ({partition}ORDER BY ls.score_total DESC)"
+
+
+@dataclass
+class LeadQuery:
+    """Filters for scored leads of one run, translated into SQL by ``where()``."""
+
+    min_class: str = "C"
+    min_score: int = 0
+    require_website: bool = False
+    require_contact: bool = False
+    require_email: bool = False
+
+    def where(self) -> tuple[list[str], list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        min_rank = CLASS_RANK.get(self.min_class.upper(), 1)
+        if min_rank > 1:
+            classes = [cls for cls, rank in CLASS_RANK.items() if rank >= min_rank]
+            clauses.append(f"ls.score_class IN ({', '.join('?' for _ in classes)})")
+            params.extend(classes)
+        if self.min_score > 0:
+            clauses.append("ls.score_total >= ?")
+            params.append(int(self.min_score))
+        if self.require_website:
+            clauses.append("COALESCE(c.website_url, '') != ''")
+        if self.require_contact:
+            clauses.append("(COALESCE(c.email, '') != '' OR COALESCE(c.phone, '') != '')")
+        if self.require_email:
+            clauses.append("COALESCE(c.email, '') != ''")
+        return clauses, params
+
+
 class Repository:
-    def __init__(self, db_path: str):
+    """Data access for one SQLite file over a single long-lived connection.
+
+    The connection is opened lazily in WAL mode with ``synchronous=NORMAL`` and a
+    busy timeout, and is shared by all threads (audit workers write PageSpeed
+    results) behind a lock. Use ``close()`` or ``with Repository(...) as repo``.
+    """
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = 30000):
         self.db_path = db_path
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+        self._depth = 0
 
-    def _conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+    def __enter__(self) -> Repository:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         conn.execute("PRAGMA foreign_keys=ON")
         return conn
 
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        """Locks the shared connection; the outermost block commits (or rolls back on error)."""
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            conn = self._connection
+            self._depth += 1
+            try:
+                yield conn
+            except BaseException:
+                if self._depth == 1:
+                    conn.rollback()
+                raise
+            else:
+                if self._depth == 1:
+                    conn.commit()
+            finally:
+                self._depth -= 1
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Groups all repository calls inside the block into one commit.
+
+        Nested blocks join the outer transaction. The connection stays locked for
+        the whole block, so do not wait on other threads that use this repository.
+        """
+        with self._conn():
+            yield
+
     def create_run(self, region: str, industry: str, limit: int, resumed_from_run_id: str | None = None) -> str:
         run_id = str(uuid.uuid4())
         with self._conn() as conn:
@@ -69,13 +256,11 @@ class Repository:
                 """,
                 (run_id, utcnow_iso(), region, industry, limit, resumed_from_run_id),
             )
-            conn.commit()
         return run_id
 
     def set_run_stage(self, run_id: str, stage: str) -> None:
         with self._conn() as conn:
             conn.execute("UPDATE runs SET last_stage=? WHERE id=?", (stage, run_id))
-            conn.commit()
 
     def append_run_note(self, run_id: str, note: str) -> None:
         with self._conn() as conn:
@@ -83,7 +268,6 @@ class Repository:
             prev = (current[0] if current and current[0] else "").strip()
             merged = f"{prev}\n{note}".strip() if prev else note
             conn.execute("UPDATE runs SET notes=? WHERE id=?", (merged, run_id))
-            conn.commit()
 
     def finish_run(self, run_id: str, status: str = "completed", notes: str | None = None) -> None:
         status = status if status in {"running", "completed", "partial", "failed", "success"} else "failed"
@@ -96,7 +280,6 @@ class Repository:
                 """,
                 (utcnow_iso(), status, notes, run_id),
             )
-            conn.commit()
 
     def update_run_counts(
         self,
@@ -130,95 +313,80 @@ class Repository:
 
         with self._conn() as conn:
             conn.execute(f"UPDATE runs SET {', '.join(updates)} WHERE id=?", (*values, run_id))
-            conn.commit()
 
     def upsert_company(self, payload: dict[str, Any]) -> str:
-        name = payload["name"]
-        city = payload["city"]
-        website_url = payload.get("website_url")
-        website_domain = domain_of(website_url)
-        n_name = normalize_name(name)
-        domain_norm = website_domain or ""
+        return self.upsert_companies([payload])[0]
+
+    def upsert_companies(self, payloads: Iterable[dict[str, Any]], chunk_size: int = 500) -> list[str]:
+        """Inserts or updates companies keyed by (name_normalized, city, website_domain_norm).
+
+        One ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` statement per chunk;
+        returns the company ids in input order (duplicates map to the same id).
+        """
+        rows: list[tuple[Any, ...]] = []
+        for payload in payloads:
+            website_url = payload.get("website_url")
+            website_domain = domain_of(website_url)
+            enrichment_present = any(payload.get(k) for k in ("email", "address_enriched", "contact_source_url"))
+            now = utcnow_iso()
+            rows.append(
+                (
+                    str(uuid.uuid4()),
+                    payload["name"],
+                    normalize_name(payload["name"]),
+                    payload.get("industry", "Unbekannt"),
+                    payload["city"],
+                    payload.get("postal_code"),
+                    payload.get("address"),
+                    website_url,
+                    website_domain,
+                    website_domain or "",
+                    payload.get("phone"),
+                    payload.get("email"),
+                    payload.get("address_enriched"),
+                    payload.get("contact_source_url"),
+                    now if enrichment_present else None,
+                    payload.get("source_primary", "unknown"),
+                    payload.get("source_ref"),
+                    now,
+                    now,
+                )
+            )
 
+        ids: dict[tuple[str, str, str], str] = {}
         with self._conn() as conn:
-            cur = conn.execute(
-                """
-                SELECT id FROM companies
-                WHERE name_normalized=? AND city=? AND website_domain_norm=?
-                """,
-                (n_name, city, domain_norm),
-            )
-            row = cur.fetchone()
-            if row:
-                company_id = row["id"]
-                enrichment_present = any(payload.get(k) for k in ("email", "address_enriched", "contact_source_url"))
-                conn.execute(
-                    """
-                    UPDATE companies
-                    SET industry=?, postal_code=?, address=?, website_url=?, website_domain=?, website_domain_norm=?,
-                        phone=?,
-                        email=COALESCE(?, email),
-                        address_enriched=COALESCE(?, address_enriched),
-                        contact_source_url=COALESCE(?, contact_source_url),
-                        enrichment_updated_at=CASE WHEN ? THEN ? ELSE enrichment_updated_at END,
-                        source_primary=?, source_ref=?, updated_at=?
-                    WHERE id=?
-                    """,
-                    (
-                        payload.get("industry", "Unbekannt"),
-                        payload.get("postal_code"),
-                        payload.get("address"),
-                        website_url,
-                        website_domain,
-                        domain_norm,
-                        payload.get("phone"),
-                        payload.get("email"),
-                        payload.get("address_enriched"),
-                        payload.get("contact_source_url"),
-                        1 if enrichment_present else 0,
-                        utcnow_iso(),
-                        payload.get("source_primary", "unknown"),
-                        payload.get("source_ref"),
-                        utcnow_iso(),
-                        company_id,
-                    ),
-                )
-            else:
-                company_id = str(uuid.uuid4())
-                enrichment_present = any(payload.get(k) for k in ("email", "address_enriched", "contact_source_url"))
-                conn.execute(
-                    """
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i : i + chunk_size]
+                values = ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)"] * len(chunk))
+                cur = conn.execute(
+                    f"""
                     INSERT INTO companies(
                       id, name, name_normalized, industry, city, postal_code, address,
                       website_url, website_domain, website_domain_norm, phone,
                       email, address_enriched, contact_source_url, enrichment_updated_at,
                       source_primary, source_ref, is_public_b2b, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+                    ) VALUES {values}
+                    ON CONFLICT(name_normalized, city, website_domain_norm) DO UPDATE SET
+                      industry=excluded.industry,
+                      postal_code=excluded.postal_code,
+                      address=excluded.address,
+                      website_url=excluded.website_url,
+                      website_domain=excluded.website_domain,
+                      phone=excluded.phone,
+                      email=COALESCE(excluded.email, email),
+                      address_enriched=COALESCE(excluded.address_enriched, address_enriched),
+                      contact_source_url=COALESCE(excluded.contact_source_url, contact_source_url),
+                      enrichment_updated_at=COALESCE(excluded.enrichment_updated_at, enrichment_updated_at),
+                      source_primary=excluded.source_primary,
+                      source_ref=excluded.source_ref,
+                      updated_at=excluded.updated_at
+                    RETURNING id, name_normalized, city, website_domain_norm
                     """,
-                    (
-                        company_id,
-                        name,
-                        n_name,
-                        payload.get("industry", "Unbekannt"),
-                        city,
-                        payload.get("postal_code"),
-                        payload.get("address"),
-                        website_url,
-                        website_domain,
-                        domain_norm,
-                        payload.get("phone"),
-                        payload.get("email"),
-                        payload.get("address_enriched"),
-                        payload.get("contact_source_url"),
-                        utcnow_iso() if enrichment_present else None,
-                        payload.get("source_primary", "unknown"),
-                        payload.get("source_ref"),
-                        utcnow_iso(),
-                        utcnow_iso(),
-                    ),
+                    [value for row in chunk for value in row],
                 )
-            conn.commit()
-        return company_id
+                for r in cur.fetchall():
+                    ids[(r["name_normalized"], r["city"], r["website_domain_norm"])] = r["id"]
+        return [ids[(row[2], row[4], row[9])] for row in rows]
 
     def update_company_enrichment(
         self,
@@ -243,42 +411,139 @@ class Repository:
                 """,
                 (email, address_enriched, contact_source_url, utcnow_iso(), utcnow_iso(), company_id),
             )
-            conn.commit()
 
     def insert_source_record(self, company_id: str, run_id: str, source_name: str, source_url: str | None, raw_payload: dict[str, Any]) -> None:
+        self.insert_source_records(
+            run_id,
+            [{"company_id": company_id, "source_name": source_name, "source_url": source_url, "raw_payload": raw_payload}],
+        )
+
+    def insert_source_records(self, run_id: str, records: Iterable[dict[str, Any]]) -> None:
+        """Bulk variant; each record has company_id, source_name, source_url, raw_payload.
+
+        Payloads are stored once per content hash (compressed, see ``payloads``).
+        Also registers the companies as members of the run (``run_companies``).
+        """
+        rows: list[tuple[Any, ...]] = []
+        blobs: dict[str, bytes] = {}
+        for r in records:
+            digest, blob = encode_payload(r.get("raw_payload") or {})
+            blobs.setdefault(digest, blob)
+            rows.append((str(uuid.uuid4()), r["company_id"], r["source_name"], r.get("source_url"), "", utcnow_iso(), run_id, digest))
         with self._conn() as conn:
-            conn.execute(
+            conn.executemany(
+                "INSERT OR IGNORE INTO payloads(hash, codec, data) VALUES (?, ?, ?)",
+                ((digest, CODEC_ZLIB, blob) for digest, blob in blobs.items()),
+            )
+            conn.executemany(
                 """
-                INSERT INTO source_records(id, company_id, source_name, source_url, raw_payload_json, collected_at, run_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO source_records(id, company_id, source_name, source_url, raw_payload_json, collected_at, run_id, payload_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    str(uuid.uuid4()),
-                    company_id,
-                    source_name,
-                    source_url,
-                    json.dumps(raw_payload, ensure_ascii=False),
-                    utcnow_iso(),
-                    run_id,
-                ),
+                rows,
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO run_companies(run_id, company_id) VALUES (?, ?)",
+                ((run_id, row[1]) for row in rows),
             )
-            conn.commit()
 
-    def get_companies_for_run(self, run_id: str) -> list[CompanyRecord]:
+    def iter_source_records(self, run_id: str, chunk_size: int = 500) -> Iterator[dict[str, Any]]:
+        """Source records of the run with ``raw_payload`` decoded."""
+        rows = self._iter_rows(
+            """
+            SELECT s.id, s.company_id, s.source_name, s.source_url, s.collected_at, s.raw_payload_json, p.codec, p.data
+            FROM source_records s
+            LEFT JOIN payloads p ON p.hash = s.payload_hash
+            WHERE s.run_id=?
+            ORDER BY s.collected_at, s.id
+            """,
+            (run_id,),
+            chunk_size,
+        )
+        for r in rows:
+            record = {k: r[k] for k in ("id", "company_id", "source_name", "source_url", "collected_at")}
+            if r["data"] is not None:
+                record["raw_payload"] = decode_payload(r["codec"], r["data"])
+            else:
+                # rows written before content-addressed storage
+                record["raw_payload"] = json.loads(r["raw_payload_json"] or "{}")
+            yield record
+
+    def _has_db_file(self) -> bool:
+        return self.db_path not in ("", ":memory:") and Path(self.db_path).is_file()
+
+    def _iter_shared_rows(self, sql: str, params: tuple[Any, ...], chunk_size: int) -> Iterator[sqlite3.Row]:
         with self._conn() as conn:
-            cur = conn.execute(
-                """
-                SELECT DISTINCT c.*
-                FROM companies c
-                JOIN source_records s ON s.company_id = c.id
-                WHERE s.run_id = ?
-                ORDER BY c.name ASC
-                """,
-                (run_id,),
-            )
-            rows = cur.fetchall()
-        return [
-            CompanyRecord(
+            cur = conn.execute(sql, params)
+        try:
+            while True:
+                with self._conn():
+                    rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            with self._lock:
+                cur.close()
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout_ms / 1000, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        return conn
+
+    def _iter_rows(self, sql: str, params: tuple[Any, ...], chunk_size: int = 500) -> Iterator[sqlite3.Row]:
+        """Streams a query in ``chunk_size`` batches from a read-only connection of its own.
+
+        The reader keeps one WAL snapshot for the whole iteration, so callers may
+        write and commit through the repository (or other threads may) between
+        rows. Inside an open ``transaction()`` the rows are read on the shared
+        connection instead, so the block's uncommitted writes stay visible.
+        Without a DB file to reopen (``":memory:"``, temporary DBs) the shared
+        connection is streamed, taking its lock per chunk.
+        """
+        with self._lock:
+            in_transaction = self._depth > 0
+            if in_transaction:
+                rows = self._connection.execute(sql, params).fetchall()  # type: ignore[union-attr]
+        if in_transaction:
+            yield from rows
+            return
+        if not self._has_db_file():
+            yield from self._iter_shared_rows(sql, params, chunk_size)
+            return
+
+        reader = self._connect_reader()
+        try:
+            cur = reader.execute(sql, params)
+            while rows := cur.fetchmany(chunk_size):
+                yield from rows
+        finally:
+            reader.close()
+
+    def count_companies_for_run(self, run_id: str) -> int:
+        with self._conn() as conn:
+            row = conn.execute("SELECT COUNT(*) FROM run_companies WHERE run_id=?", (run_id,)).fetchone()
+        return int(row[0])
+
+    def get_companies_for_run(self, run_id: str) -> list[CompanyRecord]:
+        return list(self.iter_companies_for_run(run_id))
+
+    def iter_companies_for_run(self, run_id: str, chunk_size: int = 500) -> Iterator[CompanyRecord]:
+        rows = self._iter_rows(
+            """
+            SELECT c.*
+            FROM run_companies rc
+            JOIN companies c ON c.id = rc.company_id
+            WHERE rc.run_id = ?
+            ORDER BY c.name ASC
+            """,
+            (run_id,),
+            chunk_size,
+        )
+        for r in rows:
+            yield CompanyRecord(
                 id=r["id"],
                 name=r["name"],
                 industry=r["industry"],
@@ -294,27 +559,26 @@ class Repository:
                 source_ref=r["source_ref"],
                 contact_source_url=r["contact_source_url"],
             )
-            for r in rows
-        ]
 
     def clear_run_audits(self, run_id: str) -> None:
         with self._conn() as conn:
             conn.execute("DELETE FROM website_audits WHERE run_id=?", (run_id,))
-            conn.commit()
 
     def clear_run_scores(self, run_id: str) -> None:
         with self._conn() as conn:
             conn.execute("DELETE FROM lead_scores WHERE run_id=?", (run_id,))
-            conn.commit()
 
     def clear_run_sync_logs(self, run_id: str) -> None:
         with self._conn() as conn:
             conn.execute("DELETE FROM notion_sync WHERE run_id=?", (run_id,))
-            conn.commit()
 
     def insert_website_audit(self, company_id: str, run_id: str, audit: dict[str, Any]) -> None:
+        self.insert_website_audits(run_id, [(company_id, audit)])
+
+    def insert_website_audits(self, run_id: str, audits: Iterable[tuple[str, dict[str, Any]]]) -> None:
+        """Bulk variant over (company_id, audit) pairs."""
         with self._conn() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO website_audits(
                   id, company_id, run_id, http_status, website_present, mobile_pagespeed_score,
@@ -323,129 +587,350 @@ class Repository:
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
-                    str(uuid.uuid4()),
-                    company_id,
-                    run_id,
-                    audit.get("http_status"),
-                    int(bool(audit.get("website_present"))),
-                    audit.get("mobile_pagespeed_score"),
-                    audit.get("seo_score"),
-                    audit.get("cwv_lcp_ms"),
-                    audit.get("cwv_cls"),
-                    audit.get("cwv_tbt_ms"),
-                    int(bool(audit.get("has_contact_cta"))),
-                    int(bool(audit.get("has_contact_form"))),
-                    audit.get("tech_health_score"),
-                    json.dumps(audit.get("warnings", []), ensure_ascii=False),
-                    utcnow_iso(),
+                    (
+                        str(uuid.uuid4()),
+                        company_id,
+                        run_id,
+                        audit.get("http_status"),
+                        int(bool(audit.get("website_present"))),
+                        audit.get("mobile_pagespeed_score"),
+                        audit.get("seo_score"),
+                        audit.get("cwv_lcp_ms"),
+                        audit.get("cwv_cls"),
+                        audit.get("cwv_tbt_ms"),
+                        int(bool(audit.get("has_contact_cta"))),
+                        int(bool(audit.get("has_contact_form"))),
+                        audit.get("tech_health_score"),
+                        json.dumps(audit.get("warnings", []), ensure_ascii=False),
+                        utcnow_iso(),
+                    )
+                    for company_id, audit in audits
                 ),
             )
-            conn.commit()
 
     def latest_audit_for_run(self, run_id: str) -> dict[str, dict[str, Any]]:
+        return {audit["company_id"]: audit for audit in self.iter_latest_audits_for_run(run_id)}
+
+    def iter_latest_audits_for_run(self, run_id: str, chunk_size: int = 500) -> Iterator[dict[str, Any]]:
+        """Latest audit per company of the run, ordered by company name."""
+        rows = self._iter_rows(
+            """
+            SELECT wa.*
+            FROM website_audits wa
+            JOIN (
+                SELECT company_id, MAX(audited_at) max_audited
+                FROM website_audits
+                WHERE run_id=?
+                GROUP BY company_id
+            ) x ON x.company_id=wa.company_id AND x.max_audited=wa.audited_at
+            JOIN companies c ON c.id = wa.company_id
+            WHERE wa.run_id=?
+            ORDER BY c.name ASC
+            """,
+            (run_id, run_id),
+            chunk_size,
+        )
+        for r in rows:
+            yield dict(r)
+
+    def iter_latest_audits(
+        self, fields: Iterable[str], run_ids: Iterable[str] | None = None, chunk_size: int = 5000
+    ) -> Iterator[dict[str, Any]]:
+        """Latest audit per company across all runs (or ``run_ids``), reduced to company_id, name and ``fields``.
+
+        Meant for bulk reads over the whole history (scoring simulation), so only the requested
+        columns are fetched and rows are streamed in large chunks.
+        """
         with self._conn() as conn:
-            cur = conn.execute(
-                """
-                SELECT wa.*
+            known = {r["name"] for r in conn.execute("PRAGMA table_info(website_audits)").fetchall()}
+        selected = list(dict.fromkeys(fields))
+        unknown = [f for f in selected if f not in known]
+        if unknown:
+            raise ValueError(f"unknown audit fields: {', '.join(unknown)}")
+
+        run_filter = ""
+        run_params: list[Any] = []
+        if run_ids is not None:
+            run_params = list(run_ids)
+            run_filter = f"WHERE wa.run_id IN ({', '.join('?' for _ in run_params)})" if run_params else "WHERE 0"
+        columns = "".join(f", wa.{f}" for f in selected)
+        rows = self._iter_rows(
+            f"""
+            SELECT * FROM (
+                SELECT wa.company_id, c.name{columns},
+                       ROW_NUMBER() OVER (PARTITION BY wa.company_id ORDER BY wa.audited_at DESC) AS recency
                 FROM website_audits wa
-                JOIN (
-                    SELECT company_id, MAX(audited_at) max_audited
-                    FROM website_audits
-                    WHERE run_id=?
-                    GROUP BY company_id
-                ) x ON x.company_id=wa.company_id AND x.max_audited=wa.audited_at
-                WHERE wa.run_id=?
+                JOIN companies c ON c.id = wa.company_id
+                {run_filter}
+            )
+            WHERE recency = 1
+            """,
+            tuple(run_params),
+            chunk_size,
+        )
+        return map(dict, rows)
+
+    def get_cached_audit(self, website_domain: str, max_age_hours: float) -> dict[str, Any] | None:
+        cutoff = (datetime.now(UTC) - timedelta(hours=max_age_hours)).isoformat()
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT audit_json FROM audit_cache WHERE website_domain=? AND audited_at>=?",
+                (website_domain, cutoff),
+            ).fetchone()
+        return json.loads(row["audit_json"]) if row else None
+
+    def put_cached_audit(self, website_domain: str, website_url: str | None, audit: dict[str, Any]) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO audit_cache(website_domain, website_url, audit_json, audited_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(website_domain) DO UPDATE SET
+                  website_url=excluded.website_url,
+                  audit_json=excluded.audit_json,
+                  audited_at=excluded.audited_at
                 """,
-                (run_id, run_id),
+                (website_domain, website_url, json.dumps(audit, ensure_ascii=False), utcnow_iso()),
             )
-            rows = cur.fetchall()
 
+    def get_pagespeed_measurements(self, urls: list[str], strategy: str) -> dict[str, dict[str, Any]]:
+        """Returns {url: {"result": ..., "measured_at": ...}} for all cached URLs."""
         out: dict[str, dict[str, Any]] = {}
-        for r in rows:
-            out[r["company_id"]] = dict(r)
+        unique = list(dict.fromkeys(urls))
+        with self._conn() as conn:
+            for i in range(0, len(unique), 500):
+                chunk = unique[i : i + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT url, result_json, measured_at FROM pagespeed_cache WHERE strategy=? AND url IN ({placeholders})",
+                    (strategy, *chunk),
+                ).fetchall()
+                for r in rows:
+                    out[r["url"]] = {"result": json.loads(r["result_json"]), "measured_at": r["measured_at"]}
         return out
 
-    def insert_lead_score(self, company_id: str, run_id: str, score_total: int, score_class: str, breakdown: dict[str, Any], priority_rank: int | None) -> None:
+    def put_pagespeed_measurement(self, url: str, strategy: str, result: dict[str, Any]) -> None:
+        self.put_pagespeed_measurements(strategy, {url: result})
+
+    def put_pagespeed_measurements(self, strategy: str, results: Mapping[str, dict[str, Any]]) -> None:
+        measured_at = utcnow_iso()
+        with self._conn() as conn:
+            conn.executemany(
+                """
+                INSERT INTO pagespeed_cache(url, strategy, result_json, measured_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(url, strategy) DO UPDATE SET
+                  result_json=excluded.result_json,
+                  measured_at=excluded.measured_at
+                """,
+                [(url, strategy, json.dumps(result, ensure_ascii=False), measured_at) for url, result in results.items()],
+            )
+
+    def reserve_pagespeed_calls(self, day: str, wanted: int, daily_quota: int) -> int:
+        """Atomically books up to ``wanted`` API calls for ``day``; returns how many were granted."""
+        with self._conn() as conn:
+            conn.execute("INSERT OR IGNORE INTO pagespeed_quota(day, calls) VALUES (?, 0)", (day,))
+            row = conn.execute("SELECT calls FROM pagespeed_quota WHERE day=?", (day,)).fetchone()
+            granted = max(0, min(int(wanted), int(daily_quota) - int(row["calls"])))
+            if granted:
+                conn.execute("UPDATE pagespeed_quota SET calls=calls+? WHERE day=?", (granted, day))
+        return granted
+
+    def release_pagespeed_calls(self, day: str, calls: int) -> None:
+        """Gives reserved but unspent calls back to ``day``."""
+        with self._conn() as conn:
+            conn.execute("UPDATE pagespeed_quota SET calls=MAX(0, calls-?) WHERE day=?", (int(calls), day))
+
+    def exhaust_pagespeed_quota(self, day: str, daily_quota: int) -> None:
         with self._conn() as conn:
             conn.execute(
                 """
-                INSERT INTO lead_scores(id, company_id, run_id, score_total, score_class, score_breakdown_json, priority_rank, scored_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO pagespeed_quota(day, calls) VALUES (?, ?)
+                ON CONFLICT(day) DO UPDATE SET calls=MAX(calls, excluded.calls)
+                """,
+                (day, daily_quota),
+            )
+
+    def insert_lead_score(self, company_id: str, run_id: str, score_total: int, score_class: str, breakdown: dict[str, Any], priority_rank: int | None) -> None:
+        self.insert_lead_scores(
+            run_id,
+            [
+                {
+                    "company_id": company_id,
+                    "score_total": score_total,
+                    "score_class": score_class,
+                    "breakdown": breakdown,
+                    "priority_rank": priority_rank,
+                }
+            ],
+        )
+
+    def insert_lead_scores(self, run_id: str, scores: Iterable[dict[str, Any]]) -> None:
+        """Bulk variant; each score has company_id, score_total, score_class, breakdown, priority_rank
+        and optionally input_fingerprint."""
+        with self._conn() as conn:
+            conn.executemany(
+                """
+                INSERT INTO lead_scores(
+                  id, company_id, run_id, score_total, score_class, score_breakdown_json, priority_rank, scored_at, input_fingerprint
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
-                    str(uuid.uuid4()),
-                    company_id,
-                    run_id,
-                    score_total,
-                    score_class,
-                    json.dumps(breakdown, ensure_ascii=False),
-                    priority_rank,
-                    utcnow_iso(),
+                    (
+                        str(uuid.uuid4()),
+                        r["company_id"],
+                        run_id,
+                        r["score_total"],
+                        r["score_class"],
+                        json.dumps(r.get("breakdown") or {}, ensure_ascii=False),
+                        r.get("priority_rank"),
+                        utcnow_iso(),
+                        r.get("input_fingerprint"),
+                    )
+                    for r in scores
                 ),
             )
-            conn.commit()
 
-    def get_scored_leads_for_run(self, run_id: str, min_class: str = "C") -> list[dict[str, Any]]:
-        class_rank = {"A": 3, "B": 2, "C": 1}
-        min_rank = class_rank.get(min_class.upper(), 1)
+    def score_fingerprints_for_run(self, run_id: str) -> dict[str, str | None]:
+        """company_id -> input fingerprint of its stored score (None for scores written before fingerprints)."""
+        with self._conn() as conn:
+            rows = conn.execute("SELECT company_id, input_fingerprint FROM lead_scores WHERE run_id=?", (run_id,)).fetchall()
+        return {r["company_id"]: r["input_fingerprint"] for r in rows}
+
+    def delete_lead_scores(self, run_id: str, company_ids: Iterable[str]) -> None:
+        with self._conn() as conn:
+            conn.executemany("DELETE FROM lead_scores WHERE run_id=? AND company_id=?", ((run_id, cid) for cid in company_ids))
+
+    def update_priority_ranks(self, run_id: str, partition_by: Iterable[str] = ()) -> int:
+        """Ranks the run's scores in SQL: ``RANK()`` by score_total, optionally per region/industry.
 
+        Equal totals share a rank. Only rows whose rank actually moves are written; returns their count.
+        """
         with self._conn() as conn:
             cur = conn.execute(
-                """
-                SELECT
-                  ls.*,
-                  c.name,
-                  c.industry,
-                  c.city,
-                  c.website_url,
-                  c.website_domain,
-                  c.phone,
-                  c.email,
-                  c.address AS address_source,
-                  c.address_enriched,
-                  COALESCE(c.address_enriched, c.address) AS address,
-                  c.contact_source_url
-                FROM lead_scores ls
-                JOIN companies c ON c.id = ls.company_id
-                WHERE ls.run_id=?
-                ORDER BY ls.score_total DESC
+                f"""
+                UPDATE lead_scores
+                SET priority_rank = ranked.new_rank
+                FROM (
+                    SELECT ls.id, {_rank_window(partition_by)} AS new_rank
+                    FROM lead_scores ls
+                    JOIN companies c ON c.id = ls.company_id
+                    WHERE ls.run_id=?
+                ) AS ranked
+                WHERE lead_scores.id = ranked.id AND lead_scores.priority_rank IS NOT ranked.new_rank
                 """,
                 (run_id,),
             )
-            rows = [dict(r) for r in cur.fetchall()]
-
-        filtered = [r for r in rows if class_rank.get(r["score_class"], 0) >= min_rank]
-        return filtered
+            return cur.rowcount
+
+    def get_scored_leads_for_run(self, run_id: str, min_class: str = "C") -> list[LeadRow]:
+        return list(self.iter_scored_leads_for_run(run_id, min_class=min_class))
+
+    def iter_scored_leads_for_run(self, run_id: str, min_class: str = "C", chunk_size: int = 500) -> Iterator[LeadRow]:
+        return self.iter_scored_leads(run_id, LeadQuery(min_class=min_class), chunk_size=chunk_size)
+
+    def iter_scored_leads(self, run_id: str, query: LeadQuery, chunk_size: int = 500) -> Iterator[LeadRow]:
+        """Scored leads of the run joined with company data, best score first; filtering happens in SQL."""
+        clauses, params = query.where()
+        where = " AND ".join(["ls.run_id=?", *clauses])
+        rows = self._iter_rows(
+            f"""
+            SELECT {LEAD_COLUMNS}
+            FROM lead_scores ls
+            JOIN companies c ON c.id = ls.company_id
+            WHERE {where}
+            ORDER BY ls.score_total DESC
+            """,
+            (run_id, *params),
+            chunk_size,
+        )
+        return map(LeadRow, rows)
+
+    def iter_global_ranking(
+        self,
+        query: LeadQuery | None = None,
+        partition_by: Iterable[str] = (),
+        run_ids: Iterable[str] | None = None,
+        limit: int | None = None,
+        chunk_size: int = 500,
+    ) -> Iterator[LeadRow]:
+        """Cross-run ranking: the latest score of every company (over all runs or ``run_ids``),
+        ranked with ``RANK()`` by score_total, optionally per region/industry.
+
+        Rows carry ``global_rank`` and the ``run_id`` of the score; filters apply before ranking.
+        """
+        partition_columns = _partition_columns(partition_by)
+        clauses, params = (query or LeadQuery()).where()
+        run_filter = ""
+        run_params: list[Any] = []
+        if run_ids is not None:
+            run_params = list(run_ids)
+            run_filter = f"WHERE s.run_id IN ({', '.join('?' for _ in run_params)})" if run_params else "WHERE 0"
+        where = " AND ".join(["ls.recency = 1", *clauses])
+        sql = f"""
+            WITH latest AS (
+                SELECT s.*, ROW_NUMBER() OVER (PARTITION BY s.company_id ORDER BY s.scored_at DESC) AS recency
+                FROM lead_scores s
+                {run_filter}
+            )
+            SELECT {LEAD_COLUMNS}, {_rank_window(partition_by)} AS global_rank
+            FROM latest ls
+            JOIN companies c ON c.id = ls.company_id
+            WHERE {where}
+            ORDER BY {''.join(f'{col}, ' for col in partition_columns)}global_rank, c.name
+            """
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = [*params, int(limit)]
+        return map(LeadRow, self._iter_rows(sql, (*run_params, *params), chunk_size))
 
     def insert_notion_sync(self, company_id: str, run_id: str, status: str, notion_page_id: str | None = None, sync_error: str | None = None) -> None:
+        self.insert_notion_syncs(
+            run_id,
+            [{"company_id": company_id, "status": status, "notion_page_id": notion_page_id, "sync_error": sync_error}],
+        )
+
+    def insert_notion_syncs(self, run_id: str, syncs: Iterable[dict[str, Any]]) -> None:
+        """Bulk variant; each entry has company_id, status and optionally notion_page_id, sync_error."""
         with self._conn() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO notion_sync(id, company_id, run_id, notion_page_id, sync_status, sync_error, synced_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                (str(uuid.uuid4()), company_id, run_id, notion_page_id, status, sync_error, utcnow_iso()),
+                (
+                    (str(uuid.uuid4()), r["company_id"], run_id, r.get("notion_page_id"), r["status"], r.get("sync_error"), utcnow_iso())
+                    for r in syncs
+                ),
             )
-            conn.commit()
 
     def insert_compliance_event(self, run_id: str, severity: str, rule_id: str, message: str, context: dict[str, Any] | None = None) -> None:
+        self.insert_compliance_events(
+            run_id,
+            [{"severity": severity, "rule_id": rule_id, "message": message, "context": context}],
+        )
+
+    def insert_compliance_events(self, run_id: str, events: Iterable[dict[str, Any]]) -> None:
+        """Bulk variant; each event has severity, rule_id, message and optionally context."""
         with self._conn() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO compliance_events(id, run_id, severity, rule_id, message, context_json, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
-                    str(uuid.uuid4()),
-                    run_id,
-                    severity,
-                    rule_id,
-                    message,
-                    json.dumps(context or {}, ensure_ascii=False),
-                    utcnow_iso(),
+                    (
+                        str(uuid.uuid4()),
+                        run_id,
+                        ev["severity"],
+                        ev["rule_id"],
+                        ev["message"],
+                        json.dumps(ev.get("context") or {}, ensure_ascii=False),
+                        utcnow_iso(),
+                    )
+                    for ev in events
                 ),
             )
-            conn.commit()
 
     def get_run(self, run_id: str) -> dict[str, Any] | None:
         with self._conn() as conn:
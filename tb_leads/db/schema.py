@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import json
 import sqlite3
 
+from tb_leads.db.payloads import CODEC_ZLIB, encode_payload
+
 SCHEMA_SQL = """
 PRAGMA foreign_keys=ON;
 
@@ -55,10 +58,26 @@ CREATE TABLE IF NOT EXISTS source_records (
     raw_payload_json TEXT NOT NULL,
     collected_at TEXT NOT NULL,
     run_id TEXT NOT NULL,
+    payload_hash TEXT,
     FOREIGN KEY(company_id) REFERENCES companies(id),
     FOREIGN KEY(run_id) REFERENCES runs(id)
 );
 
+-- raw collector payloads, content-addressed; source_records.payload_hash points here
+CREATE TABLE IF NOT EXISTS payloads (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS run_companies (
+    run_id TEXT NOT NULL,
+    company_id TEXT NOT NULL,
+    PRIMARY KEY(run_id, company_id),
+    FOREIGN KEY(company_id) REFERENCES companies(id),
+    FOREIGN KEY(run_id) REFERENCES runs(id)
+) WITHOUT ROWID;
+
 CREATE TABLE IF NOT EXISTS website_audits (
     id TEXT PRIMARY KEY,
     company_id TEXT NOT NULL,
@@ -88,6 +107,7 @@ CREATE TABLE IF NOT EXISTS lead_scores (
     score_breakdown_json TEXT NOT NULL,
     priority_rank INTEGER,
     scored_at TEXT NOT NULL,
+    input_fingerprint TEXT,
     FOREIGN KEY(company_id) REFERENCES companies(id),
     FOREIGN KEY(run_id) REFERENCES runs(id)
 );
@@ -127,9 +147,30 @@ CREATE TABLE IF NOT EXISTS compliance_events (
     FOREIGN KEY(run_id) REFERENCES runs(id)
 );
 
+CREATE TABLE IF NOT EXISTS audit_cache (
+    website_domain TEXT PRIMARY KEY,
+    website_url TEXT,
+    audit_json TEXT NOT NULL,
+    audited_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS pagespeed_cache (
+    url TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    result_json TEXT NOT NULL,
+    measured_at TEXT NOT NULL,
+    PRIMARY KEY(url, strategy)
+);
+
+CREATE TABLE IF NOT EXISTS pagespeed_quota (
+    day TEXT PRIMARY KEY,
+    calls INTEGER NOT NULL DEFAULT 0
+);
+
 CREATE INDEX IF NOT EXISTS idx_companies_domain ON companies(website_domain);
 CREATE INDEX IF NOT EXISTS idx_companies_city_industry ON companies(city, industry);
-CREATE INDEX IF NOT EXISTS idx_scores_class_total ON lead_scores(score_class, score_total DESC);
+CREATE INDEX IF NOT EXISTS idx_scores_class_total ON lead_scores(run_id, score_class, score_total DESC);
+CREATE INDEX IF NOT EXISTS idx_lead_scores_company_scored ON lead_scores(company_id, scored_at DESC);
 CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at DESC);
 """
 
@@ -152,8 +193,12 @@ def _ensure_runs_status_constraint(conn: sqlite3.Connection) -> None:
     if "completed" in sql:
         return
 
-    # Rebuild runs table with updated CHECK constraint.
+    # Rebuild runs table with updated CHECK constraint. With foreign keys off (init_db
+    # migrates with them off) and legacy_alter_table on, child tables keep referencing
+    # "runs" instead of following the rename.
+    conn.execute("PRAGMA legacy_alter_table=ON")
     conn.execute("ALTER TABLE runs RENAME TO runs_old")
+    conn.execute("PRAGMA legacy_alter_table=OFF")
     conn.execute(
         """
         CREATE TABLE runs (
@@ -204,8 +249,18 @@ def _ensure_runs_status_constraint(conn: sqlite3.Connection) -> None:
     conn.execute("DROP TABLE runs_old")
 
 
-def _apply_migrations(conn: sqlite3.Connection) -> None:
-    # Backward-compatible migration path for already initialized DB files
+# Per-run lookups (stage queries, report, clear_run_*) filter on run_id first.
+RUN_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_source_records_run_company ON source_records(run_id, company_id)",
+    "CREATE INDEX IF NOT EXISTS idx_website_audits_run_company ON website_audits(run_id, company_id, audited_at)",
+    "CREATE INDEX IF NOT EXISTS idx_lead_scores_run_total ON lead_scores(run_id, score_total DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_notion_sync_run_company ON notion_sync(run_id, company_id)",
+    "CREATE INDEX IF NOT EXISTS idx_compliance_events_run ON compliance_events(run_id, severity)",
+)
+
+
+def _migrate_legacy_columns(conn: sqlite3.Connection) -> None:
+    # Backward-compatible migration path for DB files created before schema versioning
     _ensure_column(conn, "companies", "website_domain_norm", "TEXT NOT NULL DEFAULT ''")
     _ensure_column(conn, "companies", "email", "TEXT")
     _ensure_column(conn, "companies", "address_enriched", "TEXT")
@@ -222,11 +277,104 @@ def _apply_migrations(conn: sqlite3.Connection) -> None:
     conn.execute("UPDATE companies SET website_domain_norm='' WHERE website_domain_norm IS NULL")
 
 
+def _create_run_indexes(conn: sqlite3.Connection) -> None:
+    for statement in RUN_INDEXES:
+        conn.execute(statement)
+
+
+def _backfill_run_companies(conn: sqlite3.Connection) -> None:
+    # table itself comes from SCHEMA_SQL; membership of older runs is derived once from source_records
+    conn.execute("INSERT OR IGNORE INTO run_companies(run_id, company_id) SELECT DISTINCT run_id, company_id FROM source_records")
+
+
+def _extend_scores_class_index(conn: sqlite3.Connection) -> None:
+    # sync filters by run and class; the old (score_class, score_total) index could not narrow to a run
+    conn.execute("DROP INDEX IF EXISTS idx_scores_class_total")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_class_total ON lead_scores(run_id, score_class, score_total DESC)")
+
+
+def _store_payloads_by_hash(conn: sqlite3.Connection, chunk_size: int = 1000) -> None:
+    # move inline raw_payload_json into the deduplicated, compressed payloads table
+    _ensure_column(conn, "source_records", "payload_hash", "TEXT")
+    while True:
+        rows = conn.execute(
+            "SELECT id, raw_payload_json FROM source_records WHERE payload_hash IS NULL AND raw_payload_json != '' LIMIT ?",
+            (chunk_size,),
+        ).fetchall()
+        if not rows:
+            return
+        for record_id, raw in rows:
+            try:
+                payload = json.loads(raw)
+            except ValueError:
+                payload = {"raw": raw}
+            digest, blob = encode_payload(payload)
+            conn.execute("INSERT OR IGNORE INTO payloads(hash, codec, data) VALUES (?, ?, ?)", (digest, CODEC_ZLIB, blob))
+            conn.execute("UPDATE source_records SET payload_hash=?, raw_payload_json='' WHERE id=?", (digest, record_id))
+
+
+def _add_score_fingerprints(conn: sqlite3.Connection) -> None:
+    # older scores have no fingerprint and are recomputed once by the next score stage
+    _ensure_column(conn, "lead_scores", "input_fingerprint", "TEXT")
+
+
+def _create_company_scores_index(conn: sqlite3.Connection) -> None:
+    # cross-run ranking picks the latest score per company
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_lead_scores_company_scored ON lead_scores(company_id, scored_at DESC)")
+
+
+# MIGRATIONS[i] upgrades a DB from PRAGMA user_version i to i + 1. Append only; every
+# schema change (also new tables in SCHEMA_SQL) needs an entry so existing DBs pick it up.
+MIGRATIONS = (
+    _migrate_legacy_columns,
+    _create_run_indexes,
+    _backfill_run_companies,
+    _extend_scores_class_index,
+    _store_payloads_by_hash,
+    _add_score_fingerprints,
+    _create_company_scores_index,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def _apply_migrations(conn: sqlite3.Connection, from_version: int = 0) -> None:
+    """Runs each pending step and its user_version bump in one BEGIN IMMEDIATE transaction.
+
+    A failing step leaves the DB at the previous version, and concurrent processes
+    (e.g. two cron jobs) apply every step exactly once.
+    """
+    for version in range(from_version, SCHEMA_VERSION):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # another process may have applied this step while we waited for the write lock
+            if schema_version(conn) <= version:
+                MIGRATIONS[version](conn)
+                conn.execute(f"PRAGMA user_version={version + 1}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
 def init_db(db_path: str) -> None:
-    conn = sqlite3.connect(db_path)
+    """Creates or upgrades the schema; a DB already at ``SCHEMA_VERSION`` is left untouched."""
+    # explicit transactions only; wait as long as the repository does for a concurrent migration
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
     try:
-        conn.executescript(SCHEMA_SQL)
-        _apply_migrations(conn)
-        conn.commit()
+        current = schema_version(conn)
+        if current >= SCHEMA_VERSION:
+            return
+        try:
+            conn.executescript(f"BEGIN IMMEDIATE;\n{SCHEMA_SQL}\nCOMMIT;")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA foreign_keys=OFF")
+        _apply_migrations(conn, from_version=current)
     finally:
         conn.close()
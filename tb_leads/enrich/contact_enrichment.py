@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import html
 import re
 from dataclasses import dataclass
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urldefrag, urljoin, urlparse
 
 from tb_leads.utils.errors import ToolError
+from tb_leads.utils.html_document import HtmlDocument, parse_html
 from tb_leads.utils.http import HttpClient
+from tb_leads.utils.page_cache import PageCache
 
 PRIVATE_EMAIL_DOMAINS = {
     "gmail.com",
@@ -28,6 +29,18 @@ COMMON_CONTACT_PATHS = [
     "/ueber-uns",
 ]
 
+# Link text / href keywords of pages that usually carry contact data, best first.
+CONTACT_LINK_KEYWORDS = [
+    ("impressum", 0),
+    ("imprint", 0),
+    ("legal notice", 0),
+    ("kontakt", 1),
+    ("contact", 1),
+    ("ueber-uns", 2),
+    ("über uns", 2),
+    ("about", 2),
+]
+
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 
 
@@ -38,6 +51,8 @@ class ContactEnrichmentResult:
     source_url: str | None
     pages_checked: int
     warnings: list[str]
+    discovery: str = "static"
+    pages_skipped: int = 0
 
 
 def _clean_email(value: str) -> str:
@@ -88,16 +103,6 @@ def _normalize_ws(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
-def _strip_html_to_text(raw_html: str) -> str:
-    content = re.sub(r"<script\b[^>]*>[\s\S]*?</script>", " ", raw_html, flags=re.IGNORECASE)
-    content = re.sub(r"<style\b[^>]*>[\s\S]*?</style>", " ", content, flags=re.IGNORECASE)
-    content = re.sub(r"<br\s*/?>", "\n", content, flags=re.IGNORECASE)
-    content = re.sub(r"</p>|</div>|</li>|</h\d>", "\n", content, flags=re.IGNORECASE)
-    content = re.sub(r"<[^>]+>", " ", content)
-    content = html.unescape(content)
-    return content
-
-
 def _extract_emails(text: str) -> list[str]:
     found = [_clean_email(x) for x in EMAIL_RE.findall(text or "")]
     unique: list[str] = []
@@ -163,11 +168,18 @@ def _extract_addresses(text: str) -> list[str]:
     return deduped
 
 
-def _fetch_html(url: str, http_client: HttpClient) -> tuple[str | None, str | None]:
+def _fetch_document(
+    url: str,
+    http_client: HttpClient,
+    page_cache: PageCache | None = None,
+) -> tuple[HtmlDocument | None, str | None]:
     try:
-        return http_client.get_text(url), None
+        raw = page_cache.get_text(url) if page_cache is not None else http_client.get_text(url)
     except ToolError as exc:
         return None, exc.code
+    if not raw:
+        return None, None
+    return (page_cache.get_document(url) if page_cache is not None else parse_html(raw)), None
 
 
 def _candidate_urls(website_url: str) -> list[str]:
@@ -193,7 +205,54 @@ def _candidate_urls(website_url: str) -> list[str]:
     return out
 
 
-def enrich_contact_data(website_url: str | None, http_client: HttpClient, max_pages: int = 4) -> ContactEnrichmentResult:
+def _same_site(netloc_a: str, netloc_b: str) -> bool:
+    def strip(n: str) -> str:
+        n = n.lower()
+        return n[4:] if n.startswith("www.") else n
+
+    return strip(netloc_a) == strip(netloc_b)
+
+
+def _discover_contact_urls(doc: HtmlDocument, page_url: str) -> list[str]:
+    """Contact/legal pages linked from ``page_url``, ordered by how likely they hold contact data."""
+    page_netloc = urlparse(page_url).netloc
+    page_key = urldefrag(page_url)[0].rstrip("/")
+    ranked: dict[str, int] = {}
+
+    for anchor in doc.anchors:
+        href = anchor.href
+        if not href or href.startswith(("#", "mailto:", "tel:", "javascript:")):
+            continue
+        url = urldefrag(urljoin(page_url, href))[0]
+        parsed = urlparse(url)
+        if parsed.scheme not in {"http", "https"} or not _same_site(parsed.netloc, page_netloc):
+            continue
+        if url.rstrip("/") == page_key:
+            continue
+
+        haystack = f"{anchor.text} {parsed.path}".lower()
+        rank = min((r for keyword, r in CONTACT_LINK_KEYWORDS if keyword in haystack), default=None)
+        if rank is None:
+            continue
+        ranked[url] = min(rank, ranked.get(url, rank))
+
+    # stable sort keeps document order within one rank
+    return sorted(ranked, key=lambda u: ranked[u])
+
+
+def enrich_contact_data(
+    website_url: str | None,
+    http_client: HttpClient,
+    max_pages: int = 4,
+    page_cache: PageCache | None = None,
+    early_stop_min_email_score: int | None = None,
+) -> ContactEnrichmentResult:
+    """Collects email/address from the homepage and its contact pages.
+
+    With ``early_stop_min_email_score`` set, scanning stops as soon as an
+    address was found together with an email scoring at least that much
+    (6 = email on the company's own domain, see ``_score_email``).
+    """
     if not website_url:
         return ContactEnrichmentResult(email=None, address=None, source_url=None, pages_checked=0, warnings=["INPUT:NO_WEBSITE"])
 
@@ -205,14 +264,15 @@ def enrich_contact_data(website_url: str | None, http_client: HttpClient, max_pa
     warnings: list[str] = []
     pages_checked = 0
 
-    for url in _candidate_urls(website_url)[:max_pages]:
-        html_doc, err_code = _fetch_html(url, http_client=http_client)
-        if not html_doc:
+    def scan(url: str) -> HtmlDocument | None:
+        nonlocal pages_checked
+        doc, err_code = _fetch_document(url, http_client=http_client, page_cache=page_cache)
+        if doc is None:
             warnings.append(f"NETWORK:FETCH_FAILED:{err_code or 'UNKNOWN'}:{url}")
-            continue
+            return None
 
         pages_checked += 1
-        text = _strip_html_to_text(html_doc)
+        text = doc.text
 
         for email in _extract_emails(text):
             emails_scored.append((_score_email(email, website_domain), email, url))
@@ -220,6 +280,28 @@ def enrich_contact_data(website_url: str | None, http_client: HttpClient, max_pa
         found_addresses = _extract_addresses(text)
         for addr in found_addresses:
             addresses.append((addr, url))
+        return doc
+
+    def confident() -> bool:
+        if early_stop_min_email_score is None or not addresses or not emails_scored:
+            return False
+        return max(score for score, _email, _url in emails_scored) >= early_stop_min_email_score
+
+    static_candidates = _candidate_urls(website_url)
+    homepage = static_candidates[0]
+    homepage_doc = scan(homepage)
+
+    # follow the site's own Impressum/Kontakt links; blind path probing only if none are linked
+    discovered = _discover_contact_urls(homepage_doc, homepage) if homepage_doc is not None else []
+    follow_ups = (discovered or static_candidates[1:])[: max(0, max_pages - 1)]
+    discovery = "links" if discovered else "static"
+
+    pages_skipped = 0
+    for idx, url in enumerate(follow_ups):
+        if confident():
+            pages_skipped = len(follow_ups) - idx
+            break
+        scan(url)
 
     best_email = None
     best_email_source = None
@@ -242,4 +324,6 @@ def enrich_contact_data(website_url: str | None, http_client: HttpClient, max_pa
         source_url=source_url,
         pages_checked=pages_checked,
         warnings=warnings,
+        discovery=discovery,
+        pages_skipped=pages_skipped,
     )
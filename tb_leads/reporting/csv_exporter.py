@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import csv
+from collections.abc import Iterable, Mapping
 from pathlib import Path
 from typing import Any
 
 
-def export_scored_leads(scored: list[dict[str, Any]], out_dir: str, run_id: str) -> str:
+def export_scored_leads(scored: Iterable[Mapping[str, Any]], out_dir: str, run_id: str) -> str:
     path = Path(out_dir)
     path.mkdir(parents=True, exist_ok=True)
     out_file = path / f"tb-leads-{run_id}.csv"
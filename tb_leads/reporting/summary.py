@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import Any
 
 
-def summarize(scored: list[dict]) -> str:
-    classes = Counter([x.get("score_class", "?") for x in scored])
-    top = scored[:5]
+def summarize(scored: Iterable[Mapping[str, Any]]) -> str:
+    # single pass, so a streamed result set works as well as a list
+    classes: Counter = Counter()
+    top: list[Mapping[str, Any]] = []
+    total = 0
+    for lead in scored:
+        total += 1
+        classes[lead.get("score_class", "?")] += 1
+        if len(top) < 5:
+            top.append(lead)
 
     lines = []
-    lines.append(f"Leads gesamt (gefiltert): {len(scored)}")
+    lines.append(f"Leads gesamt (gefiltert): {total}")
     lines.append(f"Klassenverteilung: A={classes.get('A',0)} B={classes.get('B',0)} C={classes.get('C',0)}")
     if top:
         lines.append("Top 5 (inkl. E-Mail/Adresse):")
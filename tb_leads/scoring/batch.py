@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from tb_leads.scoring.model import TABLE_RANGE, Component, ScoringModel, compile_scoring_model
+
+try:  # optional speed-up: pip install "tb-media-leadtool[fast]"
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+@dataclass
+class AuditColumns:
+    """Audit fields of a whole run, one list per input field read by the model (same order as ``keys``)."""
+
+    flag_fields: tuple[str, ...]
+    value_fields: tuple[str, ...]
+    keys: list[Any] = field(default_factory=list)
+    flags: dict[str, list[bool]] = field(default_factory=dict)
+    values: dict[str, list[int]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for name in self.flag_fields:
+            self.flags.setdefault(name, [])
+        for name in self.value_fields:
+            self.values.setdefault(name, [])
+
+    @classmethod
+    def for_model(cls, *models: ScoringModel) -> AuditColumns:
+        """Columns for every field read by ``models``; one instance can feed several models."""
+        flag_fields = tuple(dict.fromkeys(f for m in models for f in m.flag_fields))
+        value_fields = tuple(dict.fromkeys(f for m in models for f in m.value_fields))
+        return cls(flag_fields, value_fields)
+
+    def append(self, key: Any, audit: Mapping[str, Any]) -> None:
+        self.keys.append(key)
+        get = audit.get
+        for name, column in self.flags.items():
+            column.append(bool(get(name)))
+        for name, column in self.values.items():
+            column.append(int(get(name) or 0))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def columns_from_audits(
+    audits: Iterable[Mapping[str, Any]], key: str = "company_id", model: ScoringModel | None = None
+) -> AuditColumns:
+    columns = AuditColumns.for_model(model or compile_scoring_model())
+    for audit in audits:
+        columns.append(audit.get(key), audit)
+    return columns
+
+
+@dataclass
+class BatchScores:
+    """Scores for ``AuditColumns``; ``ranks`` are 1-based priority ranks over the batch.
+
+    Ranks follow SQL ``RANK() OVER (ORDER BY score_total DESC)`` as written by
+    ``Repository.update_priority_ranks``: equal totals share a rank, the next
+    total skips the tied places.
+    """
+
+    keys: list[Any]
+    totals: list[int]
+    classes: list[str]
+    components: dict[str, list[int]]
+    ranks: list[int]
+
+    def breakdown(self, i: int) -> dict[str, int]:
+        return {name: values[i] for name, values in self.components.items()}
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        """Per-row results in input order, shaped like ``score_lead`` plus key and rank."""
+        for i, key in enumerate(self.keys):
+            yield {
+                "key": key,
+                "total": self.totals[i],
+                "class": self.classes[i],
+                "breakdown": self.breakdown(i),
+                "priority_rank": self.ranks[i],
+            }
+
+
+def _ranks(totals: list[int]) -> list[int]:
+    """1 + number of better totals."""
+    counts = Counter(totals)
+    rank_of: dict[int, int] = {}
+    better = 0
+    for total in sorted(counts, reverse=True):
+        rank_of[total] = better + 1
+        better += counts[total]
+    return [rank_of[t] for t in totals]
+
+
+def _component_python(component: Component, columns: AuditColumns) -> list[int]:
+    if component.kind in ("flag", "flags"):
+        points = [0] * len(columns)
+        for name, p in zip(component.fields, component.points):
+            points = [acc + p if on else acc for acc, on in zip(points, columns.flags[name])]
+        return points
+    table, compute = component.table, component.compute
+    low, high = TABLE_RANGE.start, TABLE_RANGE.stop
+    return [table[v - low] if low <= v < high else compute(v) for v in columns.values[component.fields[0]]]
+
+
+def _score_python(columns: AuditColumns, model: ScoringModel) -> BatchScores:
+    components = {c.name: _component_python(c, columns) for c in model.components}
+    totals = [sum(parts) for parts in zip(*components.values())] if len(columns) else []
+    return BatchScores(
+        keys=list(columns.keys),
+        totals=totals,
+        classes=[model.classify(t) for t in totals],
+        components=components,
+        ranks=_ranks(totals),
+    )
+
+
+def _component_numpy(component: Component, columns: AuditColumns, n: int) -> Any:
+    if component.kind in ("flag", "flags"):
+        points = np.zeros(n, dtype=np.int64)
+        for name, p in zip(component.fields, component.points):
+            points += np.where(np.asarray(columns.flags[name], dtype=bool), p, 0)
+        return points
+
+    values = np.asarray(columns.values[component.fields[0]], dtype=np.int64)
+    table = np.asarray(component.table, dtype=np.int64)
+    in_range = (values >= TABLE_RANGE.start) & (values < TABLE_RANGE.stop)
+    points = table[np.where(in_range, values - TABLE_RANGE.start, 0)]
+    if not in_range.all():
+        points[~in_range] = [component.value_points(int(v)) for v in values[~in_range]]
+    return points
+
+
+def _score_numpy(columns: AuditColumns, model: ScoringModel) -> BatchScores:
+    n = len(columns)
+    parts = {c.name: _component_numpy(c, columns, n) for c in model.components}
+    totals = sum(parts.values(), np.zeros(n, dtype=np.int64))
+
+    classes = np.full(n, model.default_class, dtype=object)
+    # thresholds are sorted best class first; assign from the lowest cutoff up
+    for cls, cutoff in reversed(model.thresholds):
+        classes[totals >= cutoff] = cls
+
+    # first position of a total in the negated, ascending totals = number of better totals
+    negated = np.sort(-totals)
+    ranks = np.searchsorted(negated, -totals, side="left") + 1
+
+    return BatchScores(
+        keys=list(columns.keys),
+        totals=totals.tolist(),
+        classes=classes.tolist(),
+        components={name: values.tolist() for name, values in parts.items()},
+        ranks=ranks.tolist(),
+    )
+
+
+def score_batch(columns: AuditColumns, model: ScoringModel | None = None, use_numpy: bool | None = None) -> BatchScores:
+    """Scores a whole run at once; results are identical to calling ``score_lead`` per audit.
+
+    Uses NumPy when installed (``use_numpy=None``), the pure-Python path otherwise.
+    """
+    model = model or compile_scoring_model()
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed")
+    return _score_numpy(columns, model) if use_numpy else _score_python(columns, model)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+# Integer inputs in this range are scored through a precomputed table.
+TABLE_RANGE = range(0, 101)
+
+# Must match the CHECK constraint on lead_scores.score_class.
+SCORE_CLASSES = ("A", "B", "C")
+
+DEFAULT_SCORING: dict[str, Any] = {
+    "components": [
+        {"name": "website_present", "type": "flag", "field": "website_present", "points": 20},
+        {
+            "name": "mobile_pagespeed",
+            "type": "buckets",
+            "field": "mobile_pagespeed_score",
+            "buckets": [[90, 25], [70, 15], [50, 8], [1, 2]],
+            "default": 0,
+        },
+        {"name": "seo_basics", "type": "scaled", "field": "seo_score", "max_points": 20},
+        {"name": "contact_path", "type": "flags", "points": {"has_contact_cta": 10, "has_contact_form": 10}},
+        {"name": "tech_health", "type": "scaled", "field": "tech_health_score", "max_points": 15},
+    ],
+    "classes": {"A": 80, "B": 50},
+    "default_class": "C",
+}
+
+
+@dataclass(frozen=True)
+class Component:
+    """One compiled scoring component.
+
+    ``flag``/``flags`` components read boolean fields; ``buckets``/``scaled``
+    read one integer field and answer from ``table`` for values in TABLE_RANGE.
+    """
+
+    name: str
+    kind: str
+    fields: tuple[str, ...]
+    points: tuple[int, ...]
+    table: tuple[int, ...] | None
+    compute: Callable[[int], int] | None
+
+    def value_points(self, value: int) -> int:
+        if self.table is not None and TABLE_RANGE.start <= value < TABLE_RANGE.stop:
+            return self.table[value]
+        return self.compute(value)  # type: ignore[misc]
+
+    def score(self, audit: Mapping[str, Any]) -> int:
+        if self.kind in ("flag", "flags"):
+            return sum(p for f, p in zip(self.fields, self.points) if audit.get(f))
+        return self.value_points(int(audit.get(self.fields[0]) or 0))
+
+
+def _bucket_fn(buckets: list[tuple[int, int]], default: int) -> Callable[[int], int]:
+    ordered = sorted(buckets, key=lambda b: b[0], reverse=True)
+
+    def compute(value: int) -> int:
+        for minimum, points in ordered:
+            if value >= minimum:
+                return points
+        return default
+
+    return compute
+
+
+def _scaled_fn(max_points: int) -> Callable[[int], int]:
+    def compute(value: int) -> int:
+        return round((value / 100) * max_points)
+
+    return compute
+
+
+def _compile_component(spec: Mapping[str, Any]) -> Component:
+    kind = spec["type"]
+    name = spec["name"]
+    if kind == "flag":
+        return Component(name, kind, (spec["field"],), (int(spec["points"]),), None, None)
+    if kind == "flags":
+        fields = tuple(spec["points"].keys())
+        return Component(name, kind, fields, tuple(int(spec["points"][f]) for f in fields), None, None)
+    if kind == "buckets":
+        compute = _bucket_fn([(int(m), int(p)) for m, p in spec["buckets"]], int(spec.get("default", 0)))
+    elif kind == "scaled":
+        compute = _scaled_fn(int(spec["max_points"]))
+    else:
+        raise ValueError(f"unknown scoring component type: {kind}")
+    return Component(name, kind, (spec["field"],), (), tuple(compute(v) for v in TABLE_RANGE), compute)
+
+
+class ScoringModel:
+    """Scoring rules compiled from the ``scoring`` config section.
+
+    Shared by ``score_lead``, batch scoring and the sync class threshold, so a
+    tuning change in the config affects all of them at once.
+    """
+
+    def __init__(self, spec: Mapping[str, Any]):
+        self.spec = spec
+        self.components = tuple(_compile_component(c) for c in spec["components"])
+        self.thresholds = tuple(sorted(((cls, int(cut)) for cls, cut in spec["classes"].items()), key=lambda t: t[1], reverse=True))
+        self.default_class = spec.get("default_class", "C")
+        # best class first, as classify() hands them out
+        self.classes = tuple(dict.fromkeys([*(cls for cls, _cut in self.thresholds), self.default_class]))
+        unknown = [cls for cls in self.classes if cls not in SCORE_CLASSES]
+        if unknown:
+            raise ValueError(f"scoring: unknown class {', '.join(map(str, unknown))} (allowed: {', '.join(SCORE_CLASSES)})")
+        self.flag_fields = tuple(dict.fromkeys(f for c in self.components if c.kind in ("flag", "flags") for f in c.fields))
+        self.value_fields = tuple(dict.fromkeys(c.fields[0] for c in self.components if c.kind in ("buckets", "scaled")))
+        canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+        self.fingerprint = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def classify(self, total: int) -> str:
+        for cls, cutoff in self.thresholds:
+            if total >= cutoff:
+                return cls
+        return self.default_class
+
+    def input_fingerprint(self, audit: Mapping[str, Any]) -> str:
+        """Hash of the model version plus the audit fields it reads; equal fingerprints score equal."""
+        inputs = [self.fingerprint]
+        inputs += [bool(audit.get(f)) for f in self.flag_fields]
+        inputs += [int(audit.get(f) or 0) for f in self.value_fields]
+        return hashlib.sha256(json.dumps(inputs, separators=(",", ":")).encode("utf-8")).hexdigest()[:16]
+
+    def score(self, audit: Mapping[str, Any]) -> dict[str, Any]:
+        breakdown = {c.name: c.score(audit) for c in self.components}
+        total = sum(breakdown.values())
+        return {"total": total, "class": self.classify(total), "breakdown": breakdown}
+
+
+@lru_cache(maxsize=8)
+def _compile_cached(canonical: str) -> ScoringModel:
+    return ScoringModel(json.loads(canonical))
+
+
+def compile_scoring_model(spec: Mapping[str, Any] | None = None) -> ScoringModel:
+    """Compiles (once per distinct spec) the given ``scoring`` section, or the defaults."""
+    return _compile_cached(json.dumps(spec or DEFAULT_SCORING, sort_keys=True))
+
+
+def model_from_config(cfg: Mapping[str, Any]) -> ScoringModel:
+    return compile_scoring_model(cfg.get("scoring"))
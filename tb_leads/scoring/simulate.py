@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from tb_leads.scoring.batch import AuditColumns, score_batch
+from tb_leads.scoring.model import ScoringModel
+
+
+@dataclass
+class RankMove:
+    key: Any
+    name: str
+    baseline_rank: int
+    candidate_rank: int
+    baseline_total: int
+    candidate_total: int
+
+    @property
+    def shift(self) -> int:
+        return self.baseline_rank - self.candidate_rank
+
+
+@dataclass
+class SimulationResult:
+    """Comparison of two scoring models over the same audits; nothing is written to the DB."""
+
+    audits: int = 0
+    classes: tuple[str, ...] = ()
+    baseline_classes: Counter = field(default_factory=Counter)
+    candidate_classes: Counter = field(default_factory=Counter)
+    transitions: Counter = field(default_factory=Counter)
+    changed_totals: int = 0
+    moved: int = 0
+    mean_abs_rank_shift: float = 0.0
+    top: int = 0
+    top_kept: int = 0
+    movers: list[RankMove] = field(default_factory=list)
+
+
+def simulate_scoring(
+    audits: Iterable[Mapping[str, Any]],
+    baseline: ScoringModel,
+    candidate: ScoringModel,
+    top: int = 50,
+    movers: int = 10,
+    key: str = "company_id",
+) -> SimulationResult:
+    """Scores ``audits`` with both models in batch and summarises class and rank shifts.
+
+    The audits are consumed in a single pass into columns, so a streamed result set
+    works; per-row work is limited to appending the fields each model reads.
+    """
+    columns = AuditColumns.for_model(baseline, candidate)
+    names: list[str] = []
+    for audit in audits:
+        columns.append(audit.get(key), audit)
+        names.append(audit.get("name") or str(audit.get(key)))
+
+    base = score_batch(columns, baseline)
+    cand = score_batch(columns, candidate)
+    base_ranks, cand_ranks = base.ranks, cand.ranks
+
+    n = len(names)
+    result = SimulationResult(audits=n, classes=tuple(dict.fromkeys(baseline.classes + candidate.classes)), top=top)
+    result.baseline_classes.update(base.classes)
+    result.candidate_classes.update(cand.classes)
+    result.transitions.update(zip(base.classes, cand.classes))
+    result.changed_totals = sum(1 for b, c in zip(base.totals, cand.totals) if b != c)
+
+    shifts = [b - c for b, c in zip(base_ranks, cand_ranks)]
+    result.moved = sum(1 for s in shifts if s)
+    result.mean_abs_rank_shift = sum(abs(s) for s in shifts) / n if n else 0.0
+    result.top_kept = sum(1 for b, c in zip(base_ranks, cand_ranks) if b <= top and c <= top)
+
+    biggest = heapq.nlargest(movers, (i for i in range(n) if shifts[i]), key=lambda i: abs(shifts[i]))
+    result.movers = [
+        RankMove(base.keys[i], names[i], base_ranks[i], cand_ranks[i], base.totals[i], cand.totals[i]) for i in biggest
+    ]
+    return result
+
+
+def format_simulation(result: SimulationResult) -> str:
+    lines = [f"Audits simuliert: {result.audits} (Score geändert: {result.changed_totals}, Rang geändert: {result.moved})"]
+    for label, classes in (("aktuell", result.baseline_classes), ("alternativ", result.candidate_classes)):
+        lines.append(f"Klassenverteilung {label}: " + " ".join(f"{cls}={classes.get(cls, 0)}" for cls in result.classes))
+    lines.append("Klassenwechsel (aktuell -> alternativ):")
+    for old in result.classes:
+        moves = " ".join(f"{new}={result.transitions.get((old, new), 0)}" for new in result.classes)
+        lines.append(f"  {old} -> {moves}")
+    lines.append(f"Mittlere Rangverschiebung: {result.mean_abs_rank_shift:.1f}")
+    lines.append(f"Rang <= {result.top} in beiden Modellen: {result.top_kept}")
+    if result.movers:
+        lines.append("Größte Rangänderungen:")
+        for move in result.movers:
+            lines.append(
+                f"  {move.name}: Rang {move.baseline_rank} -> {move.candidate_rank} "
+                f"(Score {move.baseline_total} -> {move.candidate_total})"
+            )
+    return "\n".join(lines)
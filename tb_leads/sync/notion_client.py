@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import Any
 from urllib.parse import urlparse
@@ -124,7 +125,7 @@ class NotionClient:
         except Exception:
             return ""
 
-    def _company_marker(self, lead: dict[str, Any]) -> str:
+    def _company_marker(self, lead: Mapping[str, Any]) -> str:
         domain = lead.get("website_domain") or self._domain_from_url(lead.get("website_url"))
         return f"{lead.get('name','').strip()} | {lead.get('city','').strip()} | {domain}".strip()
 
@@ -149,7 +150,7 @@ class NotionClient:
     def _query_database(self, payload: dict[str, Any]) -> dict[str, Any]:
         return self._request("POST", f"/databases/{self.database_id}/query", payload)
 
-    def _find_existing_page_id(self, lead: dict[str, Any], pmap: PropertyMap) -> str | None:
+    def _find_existing_page_id(self, lead: Mapping[str, Any], pmap: PropertyMap) -> str | None:
         if not pmap.title:
             return None
 
@@ -191,7 +192,7 @@ class NotionClient:
             return preferred
         return names[0] if names else None
 
-    def _build_properties_payload(self, lead: dict[str, Any], pmap: PropertyMap) -> dict[str, Any]:
+    def _build_properties_payload(self, lead: Mapping[str, Any], pmap: PropertyMap) -> dict[str, Any]:
         props_meta = self._properties()
         payload: dict[str, Any] = {}
 
@@ -284,7 +285,7 @@ class NotionClient:
 
         return payload
 
-    def upsert_lead(self, lead: dict[str, Any]) -> dict[str, Any]:
+    def upsert_lead(self, lead: Mapping[str, Any]) -> dict[str, Any]:
         if not self.enabled:
             return {"status": "skipped", "reason": "notion_credentials_missing"}
 
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from functools import cached_property
+
+# The patterns below are the ones the checks used on raw markup before the
+# document was shared; keeping them keeps SEO/CTA scores and enrichment stable.
+_TITLE_RE = re.compile(r"<title>([^<]*)</title>", re.IGNORECASE)
+_META_DESCRIPTION_RE = re.compile(r"<meta[^>]+name=[\"']description[\"'][^>]+content=[\"']([^\"']*)[\"']", re.IGNORECASE)
+_H1_RE = re.compile(r"<h1[^>]*>([^<]*)</h1>", re.IGNORECASE)
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>[\s\S]*?</script>", re.IGNORECASE)
+_STYLE_RE = re.compile(r"<style\b[^>]*>[\s\S]*?</style>", re.IGNORECASE)
+# <br> and closing block tags end a visual line in the extracted text (addresses are matched
+# line by line); the two never overlap, so one pass gives the same text as two.
+_LINE_BREAK_RE = re.compile(r"<br\s*/?>|</p>|</div>|</li>|</h\d>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_ANCHOR_RE = re.compile(
+    r"<a\b[^>]*?\bhref\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))[^>]*>([\s\S]*?)</a\s*>",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class Anchor:
+    href: str
+    text: str
+
+
+class HtmlDocument:
+    """Everything the audit and enrichment checks need from one HTML page.
+
+    Each field is its own compiled-regex pass over the markup, run on first
+    access and cached. Checks that share the document reuse those results;
+    the CPU cost per page matches the former per-check regexes rather than
+    undercutting them (see the benchmark in tests/test_html_document.py).
+    """
+
+    def __init__(self, raw_html: str = ""):
+        self.raw_html = raw_html
+
+    @cached_property
+    def search_text(self) -> str:
+        """Lowercased raw markup (attributes, form actions and scripts included) for keyword checks."""
+        return self.raw_html.lower()
+
+    @cached_property
+    def titles(self) -> list[str]:
+        return _TITLE_RE.findall(self.raw_html)
+
+    @property
+    def title(self) -> str | None:
+        return self.titles[0] if self.titles else None
+
+    @cached_property
+    def meta_descriptions(self) -> list[str]:
+        return _META_DESCRIPTION_RE.findall(self.raw_html)
+
+    @property
+    def meta_description(self) -> str | None:
+        return self.meta_descriptions[0] if self.meta_descriptions else None
+
+    @cached_property
+    def h1(self) -> list[str]:
+        """Headings without nested markup."""
+        return _H1_RE.findall(self.raw_html)
+
+    @property
+    def has_viewport(self) -> bool:
+        return "viewport" in self.search_text
+
+    @property
+    def form_count(self) -> int:
+        return self.search_text.count("<form")
+
+    @cached_property
+    def _markup(self) -> str:
+        """Raw markup without script and style blocks."""
+        return _STYLE_RE.sub(" ", _SCRIPT_RE.sub(" ", self.raw_html))
+
+    @cached_property
+    def anchors(self) -> list[Anchor]:
+        out: list[Anchor] = []
+        for dq, sq, bare, inner in _ANCHOR_RE.findall(self._markup):
+            href = html.unescape(dq or sq or bare).strip()
+            if href:
+                out.append(Anchor(href=href, text=" ".join(html.unescape(_TAG_RE.sub(" ", inner)).split())))
+        return out
+
+    @cached_property
+    def text(self) -> str:
+        """Visible text; ``<br>`` and closing block tags become line breaks."""
+        content = _LINE_BREAK_RE.sub("\n", self._markup)
+        content = _TAG_RE.sub(" ", content)
+        return html.unescape(content)
+
+
+def parse_html(raw_html: str | None) -> HtmlDocument:
+    """Wraps a page for the checks; never raises on malformed markup."""
+    return HtmlDocument(raw_html or "")
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import http.client
 import json
 import socket
-import urllib.error
 import urllib.request
 from dataclasses import dataclass
 from typing import Any
+from urllib.parse import urljoin, urlsplit
 
 from tb_leads.utils.errors import ErrorCode, ToolError
+from tb_leads.utils.http_pool import ConnectionPool, proxy_endpoint
 from tb_leads.utils.retry import RetryPolicy, retry_call
-from tb_leads.utils.throttle import RateLimiter
+from tb_leads.utils.throttle import HostRateLimiter, RateLimiter
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 10
+
+# Errors raised when a pooled keep-alive connection was closed by the server in the meantime.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+# Only these are resent on a fresh connection after a stale one; a POST/PATCH may already
+# have been processed (e.g. a Notion page created) when the connection dropped.
+_RESENDABLE_METHODS = {"GET", "HEAD"}
 
 
 @dataclass
@@ -26,11 +37,82 @@ class HttpClient:
         rate_limiter: RateLimiter | None = None,
         retry_policy: RetryPolicy | None = None,
         user_agent: str = "tb-leads/1.0",
+        pool: ConnectionPool | None = None,
+        host_limiter: HostRateLimiter | None = None,
+        proxies: dict[str, str] | None = None,
     ):
         self.timeout_s = timeout_s
         self.rate_limiter = rate_limiter
         self.retry_policy = retry_policy or RetryPolicy()
         self.user_agent = user_agent
+        self.pool = pool or ConnectionPool(timeout_s=timeout_s)
+        self.host_limiter = host_limiter
+        # HTTP(S)_PROXY / NO_PROXY from the environment, like urlopen
+        self.proxies = urllib.request.getproxies() if proxies is None else proxies
+
+    def _proxy_for(self, scheme: str, host: str) -> str | None:
+        proxy = self.proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass_environment(host, self.proxies):
+            return None
+        return proxy
+
+    def close(self) -> None:
+        self.pool.close()
+        # releases the SQLite connection of a shared limiter store
+        if self.rate_limiter:
+            self.rate_limiter.close()
+        if self.host_limiter:
+            self.host_limiter.close()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        data: bytes | None,
+    ) -> HttpResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        proxy = self._proxy_for(scheme, host)
+        if proxy and scheme == "http":
+            # plain http goes to the proxy itself with an absolute-form target
+            target = f"http://{parts.netloc.rpartition('@')[2]}{target}"
+            headers = {**headers, **proxy_endpoint(proxy)[2]}
+
+        while True:
+            conn, reused = self.pool.acquire(scheme, host, port, proxy)
+            try:
+                conn.request(method, target, body=data, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused and method in _RESENDABLE_METHODS:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+
+            self.pool.release(scheme, host, port, conn, reusable=not resp.will_close, proxy=proxy)
+            return HttpResponse(
+                status=int(resp.status),
+                body=body,
+                headers={k.lower(): v for k, v in resp.getheaders()},
+            )
+
+    def _acquire_host(self, url: str) -> None:
+        if self.host_limiter:
+            parts = urlsplit(url)
+            self.host_limiter.acquire(parts.hostname or "", parts.port)
 
     def _request_once(
         self,
@@ -38,44 +120,53 @@ class HttpClient:
         url: str,
         headers: dict[str, str] | None,
         payload: dict[str, Any] | None,
+        throttle: bool = True,
     ) -> HttpResponse:
-        if self.rate_limiter:
-            self.rate_limiter.acquire()
+        if throttle:
+            # host bucket first: a request waiting for a slow host must not hold a global slot meanwhile
+            self._acquire_host(url)
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
 
         req_headers = {"User-Agent": self.user_agent}
         if headers:
             req_headers.update(headers)
 
         data = json.dumps(payload).encode("utf-8") if payload is not None else None
-        req = urllib.request.Request(url, method=method, headers=req_headers, data=data)
 
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
-                body = resp.read()
-                return HttpResponse(
-                    status=int(resp.status),
-                    body=body,
-                    headers={k.lower(): v for k, v in resp.headers.items()},
-                )
-        except urllib.error.HTTPError as exc:
-            body = exc.read() if hasattr(exc, "read") else b""
-            status = int(exc.code)
-            headers_map = {k.lower(): v for k, v in (exc.headers.items() if exc.headers else [])}
-
-            if status == 429:
-                raise ToolError(ErrorCode.NETWORK_RATE_LIMITED, "Remote rate limited request", detail=f"HTTP {status}")
-            if 500 <= status <= 599:
-                raise ToolError(ErrorCode.NETWORK_HTTP_5XX, "Server error", detail=f"HTTP {status}")
-            if status in (401, 403):
-                raise ToolError(ErrorCode.NETWORK_HTTP_4XX, "Auth/permission error", detail=f"HTTP {status}")
-            raise ToolError(ErrorCode.NETWORK_HTTP_4XX, "Client error", detail=f"HTTP {status} body={body[:200]!r}")
-        except urllib.error.URLError as exc:
-            reason = getattr(exc, "reason", exc)
-            if isinstance(reason, socket.timeout):
-                raise ToolError(ErrorCode.NETWORK_TIMEOUT, "Network timeout", detail=str(reason))
-            raise ToolError(ErrorCode.NETWORK_UNREACHABLE, "Network unreachable", detail=str(reason))
-        except TimeoutError as exc:
-            raise ToolError(ErrorCode.NETWORK_TIMEOUT, "Timeout", detail=str(exc))
+            response = self._send(method, url, req_headers, data)
+            redirects = 0
+            while response.status in REDIRECT_STATUSES and response.headers.get("location"):
+                redirects += 1
+                if redirects > MAX_REDIRECTS:
+                    raise ToolError(ErrorCode.NETWORK_HTTP_4XX, "Too many redirects", detail=f"HTTP {response.status}")
+                url = urljoin(url, response.headers["location"])
+                if response.status == 303 or (response.status in (301, 302) and method not in ("GET", "HEAD")):
+                    # same semantics as urllib: the follow-up request is a body-less GET
+                    method = "GET"
+                    data = None
+                    req_headers = {k: v for k, v in req_headers.items() if k.lower() != "content-type"}
+                # every hop spends budget of the host it goes to (redirects often change host)
+                self._acquire_host(url)
+                response = self._send(method, url, req_headers, data)
+        except (TimeoutError, socket.timeout) as exc:
+            raise ToolError(ErrorCode.NETWORK_TIMEOUT, "Network timeout", detail=str(exc))
+        except (OSError, http.client.HTTPException) as exc:
+            raise ToolError(ErrorCode.NETWORK_UNREACHABLE, "Network unreachable", detail=str(exc))
+
+        status = response.status
+        if status < 400:
+            return response
+
+        body = response.body
+        if status == 429:
+            raise ToolError(ErrorCode.NETWORK_RATE_LIMITED, "Remote rate limited request", detail=f"HTTP {status}")
+        if 500 <= status <= 599:
+            raise ToolError(ErrorCode.NETWORK_HTTP_5XX, "Server error", detail=f"HTTP {status}")
+        if status in (401, 403):
+            raise ToolError(ErrorCode.NETWORK_HTTP_4XX, "Auth/permission error", detail=f"HTTP {status}")
+        raise ToolError(ErrorCode.NETWORK_HTTP_4XX, "Client error", detail=f"HTTP {status} body={body[:200]!r}")
 
     def _retryable(self, exc: Exception) -> bool:
         if not isinstance(exc, ToolError):
@@ -94,9 +185,20 @@ class HttpClient:
         headers: dict[str, str] | None = None,
         payload: dict[str, Any] | None = None,
     ) -> HttpResponse:
+        failed: list[ToolError] = []
+
+        def attempt() -> HttpResponse:
+            # an unreachable host received nothing, so retrying it spends no rate budget
+            throttle = not failed or failed[-1].code != ErrorCode.NETWORK_UNREACHABLE
+            try:
+                return self._request_once(method, url, headers, payload, throttle=throttle)
+            except ToolError as exc:
+                failed.append(exc)
+                raise
+
         try:
             return retry_call(
-                lambda: self._request_once(method, url, headers, payload),
+                attempt,
                 should_retry=self._retryable,
                 policy=self.retry_policy,
             )
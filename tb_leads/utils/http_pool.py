@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import base64
+import http.client
+import ssl
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import unquote, urlsplit
+
+# (scheme, host, port, proxy URL or "")
+PoolKey = tuple[str, str, int, str]
+
+
+def proxy_endpoint(proxy: str) -> tuple[str, int, dict[str, str]]:
+    """Returns (host, port, auth headers) of a proxy URL like ``http://user:pw@proxy:3128``."""
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    headers: dict[str, str] = {}
+    if parts.username:
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}".encode("utf-8")
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials).decode("ascii")
+    return parts.hostname or "", parts.port or 80, headers
+
+
+class _SessionReusingHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPS connection that resumes a previously negotiated TLS session."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int | None = None,
+        *,
+        timeout: float,
+        context: ssl.SSLContext,
+        tls_session: ssl.SSLSession | None = None,
+    ):
+        super().__init__(host, port, timeout=timeout, context=context)
+        self._tls_session = tls_session
+
+    def connect(self) -> None:
+        # opens the CONNECT tunnel as well when a proxy is set via set_tunnel()
+        http.client.HTTPConnection.connect(self)
+        server_hostname = self._tunnel_host or self.host
+        try:
+            self.sock = self._context.wrap_socket(self.sock, server_hostname=server_hostname, session=self._tls_session)
+        except ValueError:
+            # session does not belong to this context/host anymore -> full handshake
+            self.sock = self._context.wrap_socket(self.sock, server_hostname=server_hostname)
+
+
+class ConnectionPool:
+    """Per-host keep-alive pool for http.client connections.
+
+    Keeps at most ``max_per_host`` idle connections per (scheme, host, port, proxy)
+    and at most ``max_hosts`` hosts (least recently used host is evicted).
+    Idle connections older than ``max_idle_s`` are closed on the next access.
+    With a proxy, http requests go to the proxy (absolute-form target, see
+    ``HttpClient``) and https requests through a CONNECT tunnel.
+    """
+
+    def __init__(
+        self,
+        timeout_s: float = 10.0,
+        max_per_host: int = 2,
+        max_hosts: int = 64,
+        max_idle_s: float = 30.0,
+        ssl_context: ssl.SSLContext | None = None,
+    ):
+        self.timeout_s = timeout_s
+        self.max_per_host = max(1, int(max_per_host))
+        self.max_hosts = max(1, int(max_hosts))
+        self.max_idle_s = float(max_idle_s)
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._idle: OrderedDict[PoolKey, deque[tuple[http.client.HTTPConnection, float]]] = OrderedDict()
+        self._tls_sessions: OrderedDict[PoolKey, ssl.SSLSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _new_connection(self, key: PoolKey) -> http.client.HTTPConnection:
+        scheme, host, port, proxy = key
+        connect_host, connect_port = host, port
+        proxy_headers: dict[str, str] = {}
+        if proxy:
+            connect_host, connect_port, proxy_headers = proxy_endpoint(proxy)
+        if scheme == "https":
+            with self._lock:
+                session = self._tls_sessions.get(key)
+            conn = _SessionReusingHTTPSConnection(
+                connect_host,
+                connect_port,
+                timeout=self.timeout_s,
+                context=self.ssl_context,
+                tls_session=session,
+            )
+            if proxy:
+                conn.set_tunnel(host, port, headers=proxy_headers)
+            return conn
+        return http.client.HTTPConnection(connect_host, connect_port, timeout=self.timeout_s)
+
+    def _evict_stale(self, now: float) -> list[http.client.HTTPConnection]:
+        stale: list[http.client.HTTPConnection] = []
+        for key in list(self._idle.keys()):
+            bucket = self._idle[key]
+            while bucket and now - bucket[0][1] > self.max_idle_s:
+                stale.append(bucket.popleft()[0])
+            if not bucket:
+                del self._idle[key]
+        return stale
+
+    def acquire(self, scheme: str, host: str, port: int, proxy: str | None = None) -> tuple[http.client.HTTPConnection, bool]:
+        """Returns (connection, reused)."""
+        key = (scheme, host, port, proxy or "")
+        now = time.monotonic()
+        conn = None
+        with self._lock:
+            stale = self._evict_stale(now)
+            bucket = self._idle.get(key)
+            if bucket:
+                # most recently released connection is the least likely to be closed remotely
+                conn = bucket.pop()[0]
+                if not bucket:
+                    del self._idle[key]
+        for s in stale:
+            s.close()
+
+        if conn is not None:
+            return conn, True
+        return self._new_connection(key), False
+
+    def release(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        conn: http.client.HTTPConnection,
+        reusable: bool = True,
+        proxy: str | None = None,
+    ) -> None:
+        key = (scheme, host, port, proxy or "")
+        session = getattr(conn.sock, "session", None) if conn.sock is not None else None
+
+        to_close: list[http.client.HTTPConnection] = []
+        with self._lock:
+            if session is not None:
+                self._tls_sessions[key] = session
+                self._tls_sessions.move_to_end(key)
+                while len(self._tls_sessions) > self.max_hosts:
+                    self._tls_sessions.popitem(last=False)
+
+            if not reusable or conn.sock is None:
+                to_close.append(conn)
+            else:
+                bucket = self._idle.setdefault(key, deque())
+                self._idle.move_to_end(key)
+                bucket.append((conn, time.monotonic()))
+                while len(bucket) > self.max_per_host:
+                    to_close.append(bucket.popleft()[0])
+                while len(self._idle) > self.max_hosts:
+                    _key, evicted = self._idle.popitem(last=False)
+                    to_close.extend(c for c, _ts in evicted)
+
+        for c in to_close:
+            c.close()
+
+    def idle_count(
+        self, scheme: str | None = None, host: str | None = None, port: int | None = None, proxy: str | None = None
+    ) -> int:
+        with self._lock:
+            if scheme is None:
+                return sum(len(b) for b in self._idle.values())
+            return len(self._idle.get((scheme, host or "", int(port or 0), proxy or ""), ()))
+
+    def close(self) -> None:
+        with self._lock:
+            buckets = list(self._idle.values())
+            self._idle.clear()
+        for bucket in buckets:
+            for conn, _ts in bucket:
+                conn.close()
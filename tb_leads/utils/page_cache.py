@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from urllib.parse import urldefrag
+
+from tb_leads.utils.errors import ToolError
+from tb_leads.utils.html_document import HtmlDocument, parse_html
+from tb_leads.utils.http import HttpClient
+
+
+class PageCache:
+    """Per-audit GET cache keyed by URL.
+
+    Failed fetches are cached as well, so a broken homepage is not requested a
+    second time by enrichment within the same audit.
+    """
+
+    def __init__(self, http_client: HttpClient):
+        self.http_client = http_client
+        self._pages: dict[str, str | ToolError] = {}
+        self._documents: dict[str, HtmlDocument] = {}
+        self.fetch_count = 0
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return urldefrag(url)[0]
+
+    def put(self, url: str, text: str) -> None:
+        self._pages[self._key(url)] = text
+
+    def __contains__(self, url: str) -> bool:
+        return self._key(url) in self._pages
+
+    def get_text(self, url: str) -> str:
+        key = self._key(url)
+        if key not in self._pages:
+            self.fetch_count += 1
+            try:
+                self._pages[key] = self.http_client.get_text(url)
+            except ToolError as exc:
+                self._pages[key] = exc
+
+        cached = self._pages[key]
+        if isinstance(cached, ToolError):
+            raise cached
+        return cached
+
+    def get_document(self, url: str) -> HtmlDocument:
+        """Like get_text(), but returns one HtmlDocument per page, shared by all checks."""
+        key = self._key(url)
+        doc = self._documents.get(key)
+        if doc is None:
+            doc = parse_html(self.get_text(url))
+            self._documents[key] = doc
+        return doc
@@ -1,39 +1,248 @@
 from __future__ import annotations
 
+import sqlite3
 import threading
 import time
-from collections import deque
+from collections import OrderedDict
+from pathlib import Path
 
 
-class RateLimiter:
-    """Simple max-requests-per-minute limiter.
+def gcra_reserve(tat: float | None, now: float, interval_s: float, tolerance_s: float) -> tuple[float, float]:
+    """One GCRA step. Returns (new_tat, wait_seconds).
 
-    Uses a rolling 60s window and blocks when budget is exhausted.
+    ``tat`` is the theoretical arrival time of the next request. A request may
+    pass ``tolerance_s`` ahead of it (that is the burst). Requests that are too
+    early still reserve their slot and are told how long to wait for it.
     """
+    tat = now if tat is None else max(tat, now)
+    allow_at = tat - tolerance_s
+    return tat + interval_s, max(0.0, allow_at - now)
+
 
-    def __init__(self, max_requests_per_minute: int = 60):
-        self.max_requests_per_minute = max(1, int(max_requests_per_minute))
-        self._events = deque()
+class MemoryLimiterStore:
+    """In-process GCRA state: one float per key."""
+
+    def __init__(self) -> None:
+        self._tat: dict[str, float] = {}
         self._lock = threading.Lock()
 
+    def now(self) -> float:
+        return time.monotonic()
+
+    def reserve(self, key: str, interval_s: float, tolerance_s: float) -> float:
+        with self._lock:
+            new_tat, wait = gcra_reserve(self._tat.get(key), self.now(), interval_s, tolerance_s)
+            self._tat[key] = new_tat
+        return wait
+
+    def idle(self, key: str) -> bool:
+        with self._lock:
+            tat = self._tat.get(key)
+        return tat is None or tat <= self.now()
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._tat.pop(key, None)
+
+    def close(self) -> None:
+        return
+
+
+class SqliteLimiterStore:
+    """GCRA state in a small SQLite file, shared by all tb-leads processes using it.
+
+    Uses wall-clock time (monotonic clocks are not comparable across processes)
+    and ``BEGIN IMMEDIATE`` so concurrent reservations are serialized.
+    """
+
+    def __init__(self, path: str, busy_timeout_s: float = 30.0):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=busy_timeout_s, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)")
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.time()
+
+    def reserve(self, key: str, interval_s: float, tolerance_s: float) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT tat FROM rate_limits WHERE key=?", (key,)).fetchone()
+                new_tat, wait = gcra_reserve(row[0] if row else None, self.now(), interval_s, tolerance_s)
+                self._conn.execute(
+                    "INSERT INTO rate_limits(key, tat) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET tat=excluded.tat",
+                    (key, new_tat),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def idle(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT tat FROM rate_limits WHERE key=?", (key,)).fetchone()
+        return row is None or row[0] <= self.now()
+
+    def forget(self, key: str) -> None:
+        # shared state is owned by all processes; nothing to drop locally
+        return
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> SqliteLimiterStore:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+LimiterStore = MemoryLimiterStore | SqliteLimiterStore
+
+
+class RateLimiter:
+    """Max-requests-per-minute limiter (GCRA).
+
+    Requests are spaced ``60 / max_requests_per_minute`` seconds apart; up to
+    ``burst`` requests may go out back to back. State is a single timestamp per
+    key, and callers sleep exactly until their slot instead of polling. Pass a
+    ``SqliteLimiterStore`` to share the budget between processes. Fractional
+    rates (e.g. 0.5 = one request every two minutes) are kept as is.
+    """
+
+    def __init__(
+        self,
+        max_requests_per_minute: float = 60,
+        burst: int = 1,
+        store: LimiterStore | None = None,
+        key: str = "global",
+    ):
+        rate = float(max_requests_per_minute)
+        # non-positive rates fall back to 1 rpm, as before
+        self.max_requests_per_minute = rate if rate > 0 else 1.0
+        self.burst = max(1, int(burst))
+        self.store = store or MemoryLimiterStore()
+        self.key = key
+        self._interval_s = 60.0 / self.max_requests_per_minute
+        self._tolerance_s = self._interval_s * (self.burst - 1)
+
+    def reserve(self) -> float:
+        """Takes the next slot and returns how long the caller has to wait for it."""
+        return self.store.reserve(self.key, self._interval_s, self._tolerance_s)
+
     def acquire(self) -> float:
         """Acquire one request slot.
 
         Returns the waited time in seconds.
         """
-        waited = 0.0
-        while True:
-            now = time.monotonic()
-            with self._lock:
-                while self._events and now - self._events[0] >= 60:
-                    self._events.popleft()
-
-                if len(self._events) < self.max_requests_per_minute:
-                    self._events.append(now)
-                    return waited
-
-                earliest = self._events[0]
-                sleep_for = max(0.01, 60 - (now - earliest))
-
-            time.sleep(sleep_for)
-            waited += sleep_for
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    @property
+    def idle(self) -> bool:
+        """True when the full burst is available again, i.e. dropping the state changes nothing."""
+        return self.store.idle(self.key)
+
+    def close(self) -> None:
+        """Closes the state store (the SQLite connection of a shared store)."""
+        self.store.close()
+
+
+def _host_matches(host: str, pattern: str) -> bool:
+    return host == pattern or host.endswith(f".{pattern}")
+
+
+class HostRateLimiter:
+    """Per-host rate limits.
+
+    Every host gets its own limiter with ``default_requests_per_minute``. Hosts
+    listed in an API group (e.g. all Overpass mirrors) share that group's limiter
+    and rate; with a shared ``store`` the API groups are also shared between
+    processes. At most ``max_buckets`` idle host limiters are retained.
+    """
+
+    def __init__(
+        self,
+        default_requests_per_minute: float = 20,
+        burst: int = 4,
+        groups: dict[str, dict] | None = None,
+        max_buckets: int = 4096,
+        store: LimiterStore | None = None,
+    ):
+        self.default_requests_per_minute = float(default_requests_per_minute)
+        self.burst = max(1, int(burst))
+        self.max_buckets = max(1, int(max_buckets))
+        self._group_hosts: list[tuple[str, str]] = []
+        self._group_buckets: dict[str, RateLimiter] = {}
+        for name, spec in (groups or {}).items():
+            self._group_buckets[name] = RateLimiter(
+                float(spec.get("requests_per_minute", self.default_requests_per_minute)),
+                burst=int(spec.get("burst", self.burst)),
+                store=store,
+                key=f"api:{name}",
+            )
+            for host in spec.get("hosts", []):
+                self._group_hosts.append((str(host).lower(), name))
+        self._store = store
+        self._host_store = MemoryLimiterStore()
+        self._host_buckets: OrderedDict[str, RateLimiter] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def group_for(self, host: str) -> str | None:
+        host = host.lower()
+        for pattern, name in self._group_hosts:
+            if _host_matches(host, pattern):
+                return name
+        return None
+
+    def bucket_for(self, host: str, port: int | None = None) -> RateLimiter:
+        host = (host or "").lower()
+        group = self.group_for(host)
+        if group is not None:
+            return self._group_buckets[group]
+
+        key = host if port is None else f"{host}:{port}"
+        with self._lock:
+            bucket = self._host_buckets.get(key)
+            if bucket is None:
+                bucket = RateLimiter(
+                    self.default_requests_per_minute,
+                    burst=self.burst,
+                    store=self._host_store,
+                    key=f"host:{key}",
+                )
+                self._host_buckets[key] = bucket
+                self._evict()
+            else:
+                self._host_buckets.move_to_end(key)
+            return bucket
+
+    def _evict(self) -> None:
+        if len(self._host_buckets) <= self.max_buckets:
+            return
+        for key in list(self._host_buckets.keys()):
+            if len(self._host_buckets) <= self.max_buckets:
+                break
+            bucket = self._host_buckets[key]
+            if bucket.idle:
+                self._host_store.forget(bucket.key)
+                del self._host_buckets[key]
+
+    def acquire(self, host: str, port: int | None = None) -> float:
+        """Acquire one request slot for ``host`` (and ``port``, if not the default).
+
+        Returns the waited time in seconds.
+        """
+        return self.bucket_for(host, port).acquire()
+
+    def close(self) -> None:
+        """Closes the shared store of the API groups, if any."""
+        if self._store is not None:
+            self._store.close()
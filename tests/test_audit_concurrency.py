@@ -0,0 +1,89 @@
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tb_leads.audit.service import iter_audits
+from tb_leads.cli.main import RunCounters, RunLimits, _audit_records
+from tb_leads.db.repository import Repository
+from tb_leads.db.schema import init_db
+from tb_leads.utils.errors import ToolError
+from tb_leads.utils.http import HttpClient
+from tb_leads.utils.retry import RetryPolicy
+from tb_leads.utils.throttle import RateLimiter
+
+
+class _SitesHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        name = self.path.strip("/")
+        if name.startswith("broken"):
+            self.send_response(404)
+            self.end_headers()
+            return
+        if name == "site-0":
+            time.sleep(0.3)
+        body = f"<html><title>{name}</title><p>info@{name}.de</p></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        return
+
+
+class AuditConcurrencyTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _SitesHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        self.http_client = HttpClient(
+            timeout_s=2,
+            rate_limiter=RateLimiter(max_requests_per_minute=1000),
+            retry_policy=RetryPolicy(max_attempts=1, base_delay_s=0.01, max_delay_s=0.05, jitter_s=0),
+        )
+
+    def tearDown(self):
+        self.http_client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_parallel_audits_are_yielded_in_input_order(self):
+        urls = [f"{self.base}/site-{i}" for i in range(4)]
+        audits = list(
+            iter_audits(urls, None, http_client=self.http_client, enrichment_max_pages=1, workers=4)
+        )
+        self.assertEqual([a["enriched_email"] for a in audits], [f"info@site-{i}.de" for i in range(4)])
+
+    def test_abort_threshold_is_checked_per_company(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/audit.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 10)
+                for i in range(6):
+                    cid = repo.upsert_company(
+                        {
+                            "name": f"Firma {i}",
+                            "industry": "Dienstleister",
+                            "city": "Krefeld",
+                            "website_url": f"{self.base}/broken-{i}",
+                            "source_primary": "seed_public_demo",
+                        }
+                    )
+                    repo.insert_source_record(cid, run_id, "seed_public_demo", None, {"name": f"Firma {i}"})
+
+                counters = RunCounters()
+                limits = RunLimits(max_errors_per_run=1000, max_network_errors_per_run=0)
+                with self.assertRaises(ToolError):
+                    _audit_records(run_id, {"audit": {"concurrency": 3}}, repo, counters, self.http_client, limits=limits)
+
+                self.assertEqual(counters.audited, 1)
+                self.assertEqual(len(repo.latest_audit_for_run(run_id)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
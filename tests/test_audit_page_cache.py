@@ -0,0 +1,138 @@
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tb_leads.audit.service import run_audit
+from tb_leads.cli.main import RunCounters, _audit_records
+from tb_leads.db.repository import Repository
+from tb_leads.db.schema import init_db
+from tb_leads.utils.http import HttpClient
+from tb_leads.utils.retry import RetryPolicy
+from tb_leads.utils.throttle import RateLimiter
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    hits: Counter = Counter()
+
+    def do_GET(self):  # noqa: N802
+        type(self).hits[self.path] += 1
+        if self.path in ["/", "/impressum"]:
+            body = b"<html><title>Startseite Firma</title><p>info@firma.de</p></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, *_args):
+        return
+
+
+class AuditPageCacheTests(unittest.TestCase):
+    def setUp(self):
+        _CountingHandler.hits = Counter()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.http_client = HttpClient(
+            timeout_s=2,
+            rate_limiter=RateLimiter(max_requests_per_minute=1000),
+            retry_policy=RetryPolicy(max_attempts=1, base_delay_s=0.01, max_delay_s=0.05, jitter_s=0),
+        )
+
+    def tearDown(self):
+        self.http_client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_homepage_is_fetched_once_per_audit(self):
+        url = f"http://127.0.0.1:{self.server.server_port}/"
+        audit = run_audit(url, None, http_client=self.http_client, enrichment_max_pages=3)
+
+        self.assertEqual(_CountingHandler.hits["/"], 1)
+        self.assertEqual(audit["enriched_email"], "info@firma.de")
+        self.assertEqual(audit["pages_fetched"], sum(_CountingHandler.hits.values()))
+
+    def _run_with_company(self, repo: Repository, names: tuple[str, ...] = ("Firma",)) -> str:
+        run_id = repo.create_run("Krefeld", "Dienstleister", len(names))
+        for name in names:
+            self._add_company(repo, run_id, name)
+        return run_id
+
+    def _measure_pagespeed(self, repo: Repository) -> None:
+        # a fresh Google measurement in the ledger, so the audit carries a real PageSpeed value
+        repo.put_pagespeed_measurement(
+            f"http://127.0.0.1:{self.server.server_port}/",
+            "mobile",
+            {"mobile_pagespeed_score": 91, "cwv_lcp_ms": 1200, "cwv_tbt_ms": 50, "cwv_cls": 0.01, "source": "google_pagespeed"},
+        )
+
+    def _add_company(self, repo: Repository, run_id: str, name: str) -> None:
+        cid = repo.upsert_company(
+            {
+                "name": name,
+                "industry": "Dienstleister",
+                "city": "Krefeld",
+                "website_url": f"http://127.0.0.1:{self.server.server_port}/",
+                "source_primary": "seed_public_demo",
+            }
+        )
+        repo.insert_source_record(cid, run_id, "seed_public_demo", None, {"name": name})
+
+    def test_domain_audit_cache_is_reused_across_runs(self):
+        cfg = {"audit": {"concurrency": 1, "cache_enabled": True, "cache_ttl_hours": 24}, "enrichment": {"max_pages": 2}}
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/cache.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                self._measure_pagespeed(repo)
+
+                first = _audit_records(self._run_with_company(repo), cfg, repo, RunCounters(), self.http_client)
+                hits_after_first = sum(_CountingHandler.hits.values())
+                second_run = self._run_with_company(repo)
+                second = _audit_records(second_run, cfg, repo, RunCounters(), self.http_client)
+
+                self.assertEqual(first["cache_hits"], 0)
+                self.assertEqual(second["cache_hits"], 1)
+                self.assertEqual(sum(_CountingHandler.hits.values()), hits_after_first)
+                self.assertEqual(len(repo.latest_audit_for_run(second_run)), 1)
+
+                bypass = _audit_records(self._run_with_company(repo), cfg, repo, RunCounters(), self.http_client, use_cache=False)
+                self.assertEqual(bypass["cache_hits"], 0)
+                self.assertGreater(sum(_CountingHandler.hits.values()), hits_after_first)
+
+    def test_audits_with_placeholder_pagespeed_are_not_cached(self):
+        cfg = {"audit": {"concurrency": 1, "cache_enabled": True, "cache_ttl_hours": 24}, "enrichment": {"max_pages": 1}}
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/placeholder.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                # no API key and no measurement -> heuristic PageSpeed value
+                run_id = self._run_with_company(repo)
+                _audit_records(run_id, cfg, repo, RunCounters(), self.http_client)
+                self.assertIsNone(repo.get_cached_audit("127.0.0.1", max_age_hours=24))
+
+                second = _audit_records(self._run_with_company(repo), cfg, repo, RunCounters(), self.http_client)
+                self.assertEqual(second["cache_hits"], 0)
+
+    def test_domain_is_audited_once_per_run(self):
+        cfg = {"audit": {"concurrency": 2, "cache_enabled": False}, "enrichment": {"max_pages": 1}}
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/dedupe.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = self._run_with_company(repo, names=("Filiale Nord", "Filiale Süd"))
+                result = _audit_records(run_id, cfg, repo, RunCounters(), self.http_client)
+
+                self.assertEqual(_CountingHandler.hits["/"], 1)
+                self.assertEqual((result["audited"], result["cache_hits"]), (2, 1))
+                self.assertEqual(len(repo.latest_audit_for_run(run_id)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
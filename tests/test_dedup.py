@@ -24,6 +24,31 @@ class DedupTests(unittest.TestCase):
             c2 = repo.upsert_company(payload)
             self.assertEqual(c1, c2)
 
+    def test_bulk_upsert_returns_ids_in_input_order(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/bulk.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                existing = repo.upsert_company(
+                    {"name": "Bäckerei Horn", "industry": "Handwerk", "city": "Krefeld", "email": "info@horn.de", "source_primary": "seed_public_demo"}
+                )
+                payloads = [
+                    {"name": "Neue Firma", "industry": "Dienstleister", "city": "Krefeld", "source_primary": "osm_public"},
+                    {"name": "bäckerei  horn", "industry": "Bäckerei", "city": "Krefeld", "phone": "02151 1234", "source_primary": "osm_public"},
+                    {"name": "Neue Firma", "industry": "Dienstleister", "city": "Krefeld", "source_primary": "osm_public"},
+                ]
+                ids = repo.upsert_companies(payloads, chunk_size=2)
+
+                self.assertEqual(ids[1], existing)
+                self.assertEqual(ids[0], ids[2])
+                self.assertNotEqual(ids[0], existing)
+                with repo._conn() as conn:
+                    row = conn.execute("SELECT industry, phone, email FROM companies WHERE id=?", (existing,)).fetchone()
+                    count = conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+                # updated in place; enrichment fields are only overwritten by non-empty values
+                self.assertEqual((row["industry"], row["phone"], row["email"]), ("Bäckerei", "02151 1234", "info@horn.de"))
+                self.assertEqual(count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
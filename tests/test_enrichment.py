@@ -1,6 +1,25 @@
 import unittest
 
-from tb_leads.enrich.contact_enrichment import _extract_addresses, _extract_emails
+from tb_leads.enrich.contact_enrichment import (
+    _discover_contact_urls,
+    _extract_addresses,
+    _extract_emails,
+    enrich_contact_data,
+)
+from tb_leads.utils.errors import ErrorCode, ToolError
+from tb_leads.utils.html_document import parse_html
+
+
+class _FakeSiteClient:
+    def __init__(self, pages: dict[str, str]):
+        self.pages = pages
+        self.requested: list[str] = []
+
+    def get_text(self, url, headers=None):
+        self.requested.append(url)
+        if url not in self.pages:
+            raise ToolError(ErrorCode.NETWORK_HTTP_4XX, "Client error", detail="HTTP 404")
+        return self.pages[url]
 
 
 class EnrichmentParsingTests(unittest.TestCase):
@@ -25,5 +44,66 @@ class EnrichmentParsingTests(unittest.TestCase):
         self.assertTrue(any("47798 Krefeld" in a for a in addresses))
 
 
+class ContactLinkDiscoveryTests(unittest.TestCase):
+    def test_discovers_linked_legal_pages_on_same_site(self):
+        doc = parse_html(
+            """
+            <a href="/">Start</a>
+            <a href="/leistungen">Leistungen</a>
+            <a href="https://www.firma.de/kontakt-formular#top">Schreiben Sie uns</a>
+            <a href="/rechtliches/angaben">Impressum</a>
+            <a href="https://facebook.com/firma">Kontakt auf Facebook</a>
+            <a href="mailto:info@firma.de">Kontakt</a>
+            """
+        )
+        urls = _discover_contact_urls(doc, "https://firma.de/")
+        self.assertEqual(urls, ["https://firma.de/rechtliches/angaben", "https://www.firma.de/kontakt-formular"])
+
+    def test_enrichment_follows_links_instead_of_probing_paths(self):
+        client = _FakeSiteClient(
+            {
+                "https://firma.de": '<a href="/de/impressum">Impressum</a>',
+                "https://firma.de/de/impressum": "<p>info@firma.de</p><p>Hauptstraße 12<br>47798 Krefeld</p>",
+            }
+        )
+        result = enrich_contact_data("https://firma.de", http_client=client, max_pages=4)
+
+        self.assertEqual(client.requested, ["https://firma.de", "https://firma.de/de/impressum"])
+        self.assertEqual(result.email, "info@firma.de")
+        self.assertEqual(result.discovery, "links")
+        self.assertEqual(result.warnings, [])
+
+    def test_enrichment_falls_back_to_static_paths(self):
+        client = _FakeSiteClient({"https://firma.de": "<p>Willkommen</p>"})
+        result = enrich_contact_data("https://firma.de", http_client=client, max_pages=3)
+
+        self.assertEqual(client.requested, ["https://firma.de", "https://firma.de/impressum", "https://firma.de/kontakt"])
+        self.assertEqual(result.discovery, "static")
+
+
+class EarlyStopTests(unittest.TestCase):
+    PAGES = {
+        "https://firma.de": '<a href="/impressum">Impressum</a><a href="/kontakt">Kontakt</a><a href="/ueber-uns">Über uns</a>',
+        "https://firma.de/impressum": "<p>info@firma.de</p><p>Hauptstraße 12<br>47798 Krefeld</p>",
+        "https://firma.de/kontakt": "<p>vertrieb@firma.de</p>",
+    }
+
+    def test_stops_once_own_domain_email_and_address_are_found(self):
+        client = _FakeSiteClient(self.PAGES)
+        result = enrich_contact_data("https://firma.de", http_client=client, max_pages=4, early_stop_min_email_score=6)
+
+        self.assertEqual(client.requested, ["https://firma.de", "https://firma.de/impressum"])
+        self.assertEqual(result.email, "info@firma.de")
+        self.assertIsNotNone(result.address)
+        self.assertEqual(result.pages_skipped, 2)
+
+    def test_keeps_scanning_without_threshold(self):
+        client = _FakeSiteClient(self.PAGES)
+        result = enrich_contact_data("https://firma.de", http_client=client, max_pages=4)
+
+        self.assertEqual(len(client.requested), 4)
+        self.assertEqual(result.pages_skipped, 0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,138 @@
+import html
+import re
+import time
+import unittest
+
+from tb_leads.audit.cta_checks import detect_contact_signals, detect_contact_signals_in_document
+from tb_leads.audit.seo_checks import seo_score_from_document, seo_score_from_html
+from tb_leads.enrich.contact_enrichment import _extract_addresses, _extract_emails
+from tb_leads.utils.html_document import parse_html
+
+PAGE = """
+<html>
+  <head>
+    <title>Malerbetrieb Niederrhein</title>
+    <meta name="description" content="Malerarbeiten, Fassaden und Lackierungen in Krefeld und Umgebung seit 1990">
+    <meta name="viewport" content="width=device-width">
+    <script>var contact = "fake@tracker.de";</script>
+    <style>.kontakt { color: red; }</style>
+  </head>
+  <body>
+    <h1>Willkommen bei uns</h1>
+    <a href="/impressum">Impressum</a>
+    <p>Hauptstraße 12<br/>47798 Krefeld</p>
+    <p>Mail: info@maler-niederrhein.de &amp; mehr</p>
+    <form action="/anfrage"></form>
+  </body>
+</html>
+"""
+
+# pages where the old regex checks and a real HTML parser disagree
+FIXTURES = [
+    PAGE,
+    "",
+    "<html><title>kaputt<body><p>Kontakt <b>jetzt",
+    '<meta content="Beschreibung mit genug Zeichen fuer den SEO Check hier" name="description">',
+    "<h1>Willkommen <span>bei uns</span></h1><h1>Zweite</h1>",
+    "<TITLE>   kurz    </TITLE><title>Ein ausreichend langer Titel</title>",
+    '<div data-track="contact"></div><script>termin()</script>',
+    '<FORM action="/x"></FORM><p>Straße&nbsp;1</p><li>a@b.de</li><h3>Ende</h3>',
+    "<style>p{}</style><SCRIPT type=x>info@tracker.de</SCRIPT><p>ok@firma.de</p>",
+    '<meta name="viewport"><a href="/kontakt">Kontakt</a>' * 50,
+]
+
+
+# Reference implementations: the checks as they ran on raw markup before parse_html().
+def _baseline_seo_score(h: str) -> int:
+    score = 0
+    if re.search(r"<title>[^<]{10,}</title>", h, re.IGNORECASE):
+        score += 35
+    if re.search(r"<meta[^>]+name=[\"']description[\"'][^>]+content=[\"'][^\"']{40,}[\"']", h, re.IGNORECASE):
+        score += 30
+    if re.search(r"<h1[^>]*>[^<]{3,}</h1>", h, re.IGNORECASE):
+        score += 20
+    if "viewport" in h.lower():
+        score += 15
+    return min(score, 100)
+
+
+def _baseline_contact_signals(html_text: str) -> tuple[bool, bool]:
+    h = (html_text or "").lower()
+    tokens = ["kontakt", "termin", "anfrage", "jetzt anrufen", "kostenloses erstgespräch", "get in touch", "contact"]
+    return any(token in h for token in tokens), "<form" in h
+
+
+def _baseline_strip_html_to_text(raw_html: str) -> str:
+    content = re.sub(r"<script\b[^>]*>[\s\S]*?</script>", " ", raw_html, flags=re.IGNORECASE)
+    content = re.sub(r"<style\b[^>]*>[\s\S]*?</style>", " ", content, flags=re.IGNORECASE)
+    content = re.sub(r"<br\s*/?>", "\n", content, flags=re.IGNORECASE)
+    content = re.sub(r"</p>|</div>|</li>|</h\d>", "\n", content, flags=re.IGNORECASE)
+    content = re.sub(r"<[^>]+>", " ", content)
+    return html.unescape(content)
+
+
+class HtmlDocumentTests(unittest.TestCase):
+    def test_document_exposes_page_signals(self):
+        doc = parse_html(PAGE)
+        self.assertEqual(doc.title, "Malerbetrieb Niederrhein")
+        self.assertTrue(doc.meta_description.startswith("Malerarbeiten"))
+        self.assertEqual(doc.h1, ["Willkommen bei uns"])
+        self.assertTrue(doc.has_viewport)
+        self.assertEqual(doc.form_count, 1)
+        self.assertEqual([(a.href, a.text) for a in doc.anchors], [("/impressum", "Impressum")])
+        self.assertNotIn("fake@tracker.de", doc.text)
+        self.assertIn("info@maler-niederrhein.de & mehr", doc.text)
+
+    def test_checks_read_the_shared_document(self):
+        self.assertEqual(seo_score_from_html(PAGE), 100)
+        self.assertEqual(detect_contact_signals(PAGE), (True, True))
+
+        text = parse_html(PAGE).text
+        self.assertEqual(_extract_emails(text), ["info@maler-niederrhein.de"])
+        self.assertIn("Hauptstraße 12, 47798 Krefeld", _extract_addresses(text))
+
+    def test_results_match_the_raw_markup_checks(self):
+        for page in FIXTURES:
+            with self.subTest(page=page[:40]):
+                self.assertEqual(seo_score_from_html(page), _baseline_seo_score(page))
+                self.assertEqual(detect_contact_signals(page), _baseline_contact_signals(page))
+                self.assertEqual(parse_html(page).text, _baseline_strip_html_to_text(page))
+
+    def test_document_checks_cost_no_more_cpu_than_raw_markup_checks(self):
+        # benchmark: a ~400 KB page through SEO, CTA and enrichment text, as run_audit does it
+        block = '<div class="row"><h2>Leistung</h2><p>Wir bieten <a href="/l/%d">Fassaden</a> &amp; mehr. Kontakt: info@x.de</p><script>var a=1;</script></div>\n'
+        page = "<html><head><title>Malerbetrieb Test</title><meta name=\"viewport\"></head><body>" + "".join(block % i for i in range(2800)) + "</body></html>"
+
+        def baseline() -> tuple:
+            return _baseline_seo_score(page), _baseline_contact_signals(page), _baseline_strip_html_to_text(page)
+
+        def document() -> tuple:
+            doc = parse_html(page)
+            return seo_score_from_document(doc), detect_contact_signals_in_document(doc), doc.text
+
+        def best_of(fn, repeat: int = 5) -> float:
+            timings = []
+            for _ in range(repeat):
+                start = time.process_time()
+                fn()
+                timings.append(time.process_time() - start)
+            return min(timings)
+
+        self.assertEqual(document(), baseline())
+        # generous margin: the point is "not slower", timings on shared CI hosts are noisy
+        self.assertLessEqual(best_of(document), best_of(baseline) * 1.5)
+
+    def test_anchors_skip_script_content_and_unescape(self):
+        doc = parse_html(
+            "<script>'<a href=\"/fake\">x</a>'</script>"
+            "<A class=nav HREF='/kontakt?a=1&amp;b=2'>Kontakt <b>&amp; Anfahrt</b></A>"
+            "<a name=top>kein Link</a><a href=/impressum>Impressum</a>"
+        )
+        self.assertEqual(
+            [(a.href, a.text) for a in doc.anchors],
+            [("/kontakt?a=1&b=2", "Kontakt & Anfahrt"), ("/impressum", "Impressum")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import json
+import tempfile
+import unittest
+import urllib.parse
+
+from tb_leads.audit.pagespeed_client import PageSpeedLedger, fetch_pagespeed
+from tb_leads.db.repository import Repository
+from tb_leads.db.schema import init_db
+from tb_leads.utils.errors import ErrorCode, ToolError
+
+
+class _FakePageSpeedHttp:
+    def __init__(self, rate_limited: set[str] | None = None):
+        self.calls: list[str] = []
+        self.rate_limited = rate_limited or set()
+
+    def get_text(self, url, headers=None):
+        self.calls.append(url)
+        if any(f"url={urllib.parse.quote(site, safe='')}&" in url for site in self.rate_limited):
+            raise ToolError(ErrorCode.NETWORK_RATE_LIMITED, "Remote rate limited request")
+        return json.dumps(
+            {
+                "lighthouseResult": {
+                    "categories": {"performance": {"score": 0.91}},
+                    "audits": {
+                        "largest-contentful-paint": {"numericValue": 2100},
+                        "total-blocking-time": {"numericValue": 90},
+                        "cumulative-layout-shift": {"numericValue": 0.02},
+                    },
+                }
+            }
+        )
+
+
+def _calls_today(repo: Repository) -> int:
+    with repo._conn() as conn:
+        row = conn.execute("SELECT calls FROM pagespeed_quota WHERE day=?", (PageSpeedLedger._today(),)).fetchone()
+    return row[0] if row else 0
+
+
+class _RecordingStore:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def get_pagespeed_measurements(self, urls, strategy):
+        self.calls.append("get_pagespeed_measurements")
+        return {}
+
+    def put_pagespeed_measurements(self, strategy, results):
+        self.calls.append("put_pagespeed_measurements")
+
+    def reserve_pagespeed_calls(self, day, wanted, daily_quota):
+        self.calls.append("reserve_pagespeed_calls")
+        return wanted
+
+    def release_pagespeed_calls(self, day, calls):
+        self.calls.append("release_pagespeed_calls")
+
+    def exhaust_pagespeed_quota(self, day, daily_quota):
+        self.calls.append("exhaust_pagespeed_quota")
+
+
+class PageSpeedLedgerTests(unittest.TestCase):
+    def test_budget_goes_to_unmeasured_urls_and_results_are_cached(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/ps.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                repo.put_pagespeed_measurement("https://old.de", "mobile", {"mobile_pagespeed_score": 55})
+
+                http = _FakePageSpeedHttp()
+                ledger = PageSpeedLedger(repo, ttl_hours=0, daily_quota=2, runs_per_day=1)
+                ledger.plan(["https://old.de", "https://new-a.de", "https://new-b.de"])
+
+                results = {
+                    url: fetch_pagespeed(url, "key", http_client=http, ledger=ledger)
+                    for url in ["https://old.de", "https://new-a.de", "https://new-b.de"]
+                }
+
+                self.assertEqual(len(http.calls), 2)
+                self.assertEqual(results["https://old.de"]["source"], "google_pagespeed_stale")
+                self.assertEqual(results["https://old.de"]["mobile_pagespeed_score"], 55)
+                self.assertEqual(results["https://new-a.de"]["source"], "google_pagespeed")
+                ledger.close()
+                self.assertEqual(_calls_today(repo), 2)
+
+                # next run on the same day: quota used up, fresh cache is served without API calls
+                ledger = PageSpeedLedger(repo, ttl_hours=24, daily_quota=2, runs_per_day=1)
+                ledger.plan(["https://new-a.de", "https://other.de"])
+                cached = fetch_pagespeed("https://new-a.de", "key", http_client=http, ledger=ledger)
+                deferred = fetch_pagespeed("https://other.de", "key", http_client=http, ledger=ledger)
+                self.assertEqual(cached["source"], "google_pagespeed_cache")
+                self.assertEqual(cached["mobile_pagespeed_score"], 91)
+                self.assertEqual(deferred["source"], "heuristic_quota_deferred")
+                self.assertEqual(len(http.calls), 2)
+
+    def test_unspent_reservation_is_returned_on_close(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/ps.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                http = _FakePageSpeedHttp()
+                ledger = PageSpeedLedger(repo, daily_quota=10, runs_per_day=1)
+                ledger.plan(["https://a.de", "https://b.de", "https://c.de"])
+                self.assertEqual(_calls_today(repo), 3)
+
+                fetch_pagespeed("https://a.de", "key", http_client=http, ledger=ledger)
+                self.assertEqual(repo.get_pagespeed_measurements(["https://a.de"], "mobile"), {})
+
+                ledger.close()
+                self.assertEqual(_calls_today(repo), 1)
+                self.assertIn("https://a.de", repo.get_pagespeed_measurements(["https://a.de"], "mobile"))
+
+    def test_fetches_only_queue_writes_until_close(self):
+        store = _RecordingStore()
+        ledger = PageSpeedLedger(store, daily_quota=10, runs_per_day=1)
+        ledger.plan(["https://a.de", "https://limited.de", "https://c.de"])
+        self.assertEqual(store.calls, ["get_pagespeed_measurements", "reserve_pagespeed_calls"])
+
+        http = _FakePageSpeedHttp(rate_limited={"https://limited.de"})
+        fetch_pagespeed("https://a.de", "key", http_client=http, ledger=ledger)
+        fetch_pagespeed("https://limited.de", "key", http_client=http, ledger=ledger)
+        deferred = fetch_pagespeed("https://c.de", "key", http_client=http, ledger=ledger)
+        self.assertEqual(deferred["source"], "heuristic_quota_deferred")
+        self.assertEqual(len(store.calls), 2)
+
+        ledger.close()
+        # the 429 used up today's quota, so nothing is released
+        self.assertEqual(store.calls[2:], ["put_pagespeed_measurements", "exhaust_pagespeed_quota"])
+
+
+if __name__ == "__main__":
+    unittest.main()
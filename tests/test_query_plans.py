@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+
+from tb_leads.db.repository import LeadQuery, Repository
+from tb_leads.db.schema import init_db
+
+# table -> indexes (any of) every per-run query on it must use
+EXPECTED_INDEXES = {
+    "run_companies": ("PRIMARY KEY",),
+    "website_audits": ("idx_website_audits_run_company",),
+    "lead_scores": ("idx_lead_scores_run_total", "idx_scores_class_total"),
+    "notion_sync": ("idx_notion_sync_run_company",),
+}
+
+
+class RunQueryPlanTests(unittest.TestCase):
+    def test_per_run_queries_use_run_id_indexes(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/plans.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                statements: list[str] = []
+                with repo._conn() as conn:
+                    conn.set_trace_callback(statements.append)
+                connect_reader = repo._connect_reader
+
+                def traced_reader():
+                    reader = connect_reader()
+                    reader.set_trace_callback(statements.append)
+                    return reader
+
+                # streaming reads run on their own read-only connections
+                repo._connect_reader = traced_reader
+
+                repo.get_companies_for_run(run_id)
+                repo.latest_audit_for_run(run_id)
+                repo.get_scored_leads_for_run(run_id)
+                list(repo.iter_scored_leads(run_id, LeadQuery(min_class="A", min_score=80, require_email=True)))
+                repo.score_fingerprints_for_run(run_id)
+                repo.delete_lead_scores(run_id, ["c1"])
+                repo.clear_run_audits(run_id)
+                repo.clear_run_scores(run_id)
+                repo.clear_run_sync_logs(run_id)
+
+                with repo._conn() as conn:
+                    conn.set_trace_callback(None)
+                    queries = [q for q in statements if "run_id" in q and q.lstrip().upper().startswith(("SELECT", "DELETE"))]
+                    self.assertEqual(len(queries), 9)
+                    for query in queries:
+                        steps = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}")]
+                        self.assertEqual([s for s in steps if s.startswith("SCAN ")], [], msg=query)
+                        for table, indexes in EXPECTED_INDEXES.items():
+                            if table in query:
+                                self.assertTrue(any(i in s for i in indexes for s in steps), msg=f"{query}\n{steps}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,323 @@
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from tb_leads.db.repository import CompanyRecord, LeadQuery, LeadRow, Repository
+from tb_leads.db.schema import SCHEMA_SQL, init_db
+
+
+class RepositoryConnectionTests(unittest.TestCase):
+    def test_single_wal_connection_is_reused_and_closed(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/conn.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                conn = repo._connection
+                repo.set_run_stage(run_id, "collect")
+                self.assertIs(repo._connection, conn)
+
+                with repo._conn() as c:
+                    self.assertEqual(c.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+                    self.assertEqual(c.execute("PRAGMA synchronous").fetchone()[0], 1)
+                    self.assertEqual(c.execute("PRAGMA busy_timeout").fetchone()[0], 30000)
+            self.assertIsNone(repo._connection)
+
+            # a fresh repository sees the committed writes
+            with Repository(db_path) as other:
+                self.assertEqual(other.get_run(run_id)["last_stage"], "collect")
+
+    def test_failed_block_is_rolled_back(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/rollback.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                with self.assertRaises(RuntimeError):
+                    with repo._conn() as conn:
+                        conn.execute("UPDATE runs SET last_stage='audit' WHERE id=?", (run_id,))
+                        raise RuntimeError("boom")
+                self.assertEqual(repo.get_run(run_id)["last_stage"], "init")
+
+    def test_connection_is_shared_across_threads(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/threads.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                errors: list[BaseException] = []
+
+                granted: list[int] = []
+
+                def spend() -> None:
+                    try:
+                        for _ in range(20):
+                            granted.append(repo.reserve_pagespeed_calls("2026-01-01", 2, 150))
+                    except BaseException as exc:  # noqa: BLE001
+                        errors.append(exc)
+
+                threads = [threading.Thread(target=spend) for _ in range(4)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+
+                self.assertEqual(errors, [])
+                # 80 reservations of two calls each, capped at the daily quota
+                self.assertEqual(sum(granted), 150)
+                with repo._conn() as conn:
+                    self.assertEqual(conn.execute("SELECT calls FROM pagespeed_quota WHERE day='2026-01-01'").fetchone()[0], 150)
+
+
+class RepositoryBatchWriteTests(unittest.TestCase):
+    def _company(self, repo: Repository, name: str) -> str:
+        return repo.upsert_company({"name": name, "industry": "Dienstleister", "city": "Krefeld", "source_primary": "seed_public_demo"})
+
+    def test_transaction_commits_bulk_writes_once(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/bulk.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                reader = sqlite3.connect(db_path)
+                try:
+                    with repo.transaction():
+                        ids = [self._company(repo, f"Firma {i}") for i in range(3)]
+                        repo.insert_source_records(
+                            run_id,
+                            ({"company_id": cid, "source_name": "seed_public_demo", "source_url": None, "raw_payload": {}} for cid in ids),
+                        )
+                        repo.insert_website_audits(run_id, [(cid, {"website_present": True, "seo_score": 50}) for cid in ids])
+                        repo.insert_compliance_events(run_id, [{"severity": "info", "rule_id": "TEST", "message": "m"}])
+                        # nothing is visible to other connections before the block ends
+                        self.assertEqual(reader.execute("SELECT COUNT(*) FROM source_records").fetchone()[0], 0)
+
+                    self.assertEqual(reader.execute("SELECT COUNT(*) FROM source_records").fetchone()[0], 3)
+                    self.assertEqual(len(repo.latest_audit_for_run(run_id)), 3)
+                    self.assertEqual(len(repo.get_companies_for_run(run_id)), 3)
+                finally:
+                    reader.close()
+
+    def test_failed_transaction_discards_all_writes(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/bulk_rollback.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                cid = self._company(repo, "Firma")
+                with self.assertRaises(RuntimeError):
+                    with repo.transaction():
+                        repo.insert_lead_scores(
+                            run_id,
+                            [{"company_id": cid, "score_total": 70, "score_class": "B", "breakdown": {}, "priority_rank": 1}],
+                        )
+                        raise RuntimeError("boom")
+                self.assertEqual(repo.get_scored_leads_for_run(run_id), [])
+
+
+class RepositoryStreamingTests(unittest.TestCase):
+    def test_iterators_stream_in_chunks_and_allow_writes_between_rows(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/stream.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                payloads = [{"name": f"Firma {i}", "industry": "Dienstleister", "city": "Krefeld", "source_primary": "seed_public_demo"} for i in range(5)]
+                ids = repo.upsert_companies(payloads)
+                repo.insert_source_records(
+                    run_id, [{"company_id": cid, "source_name": "seed_public_demo", "source_url": None, "raw_payload": {}} for cid in ids]
+                )
+                repo.insert_lead_scores(
+                    run_id,
+                    [
+                        {"company_id": cid, "score_total": 40 + 10 * i, "score_class": "A" if i >= 4 else "B" if i >= 1 else "C", "breakdown": {}}
+                        for i, cid in enumerate(ids)
+                    ],
+                )
+
+                names = []
+                for company in repo.iter_companies_for_run(run_id, chunk_size=2):
+                    names.append(company.name)
+                    repo.update_company_enrichment(company.id, email=f"info@{company.id[:8]}.de", address_enriched=None, contact_source_url=None)
+                self.assertEqual(names, [f"Firma {i}" for i in range(5)])
+                self.assertEqual(repo.count_companies_for_run(run_id), 5)
+
+                leads = repo.iter_scored_leads_for_run(run_id, min_class="B", chunk_size=2)
+                self.assertEqual([lead["score_total"] for lead in leads], [80, 70, 60, 50])
+                self.assertTrue(all(c.email for c in repo.get_companies_for_run(run_id)))
+
+    def test_streamed_rows_come_from_one_snapshot_while_writes_commit(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/snapshot.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                payloads = [{"name": f"Firma {i}", "industry": "Dienstleister", "city": "Krefeld", "source_primary": "seed_public_demo"} for i in range(6)]
+                ids = repo.upsert_companies(payloads)
+                repo.insert_source_records(
+                    run_id, [{"company_id": cid, "source_name": "seed_public_demo", "source_url": None, "raw_payload": {}} for cid in ids]
+                )
+                repo.insert_lead_scores(
+                    run_id, [{"company_id": cid, "score_total": 90 - i, "score_class": "A", "breakdown": {}} for i, cid in enumerate(ids)]
+                )
+
+                seen = []
+                for lead in repo.iter_scored_leads_for_run(run_id, min_class="A", chunk_size=2):
+                    seen.append(lead["score_total"])
+                    # committed between chunks; the running stream neither sees nor trips over it
+                    repo.insert_notion_syncs(run_id, [{"company_id": lead["company_id"], "status": "success"}])
+                    repo.delete_lead_scores(run_id, ids)
+                self.assertEqual(seen, [90, 89, 88, 87, 86, 85])
+                self.assertEqual(repo.get_scored_leads_for_run(run_id), [])
+
+                with repo.transaction():
+                    repo.insert_lead_scores(run_id, [{"company_id": ids[0], "score_total": 95, "score_class": "A", "breakdown": {}}])
+                    # uncommitted writes of the open block are visible to its own reads
+                    self.assertEqual([lead["score_total"] for lead in repo.iter_scored_leads_for_run(run_id, min_class="A")], [95])
+
+    def test_in_memory_db_streams_on_the_shared_connection(self):
+        with Repository(":memory:") as repo:
+            with repo._conn() as conn:
+                conn.executescript(SCHEMA_SQL)
+            run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+            ids = repo.upsert_companies([{"name": f"Firma {i}", "industry": "X", "city": "Krefeld", "source_primary": "seed_public_demo"} for i in range(3)])
+            repo.insert_source_records(
+                run_id, [{"company_id": cid, "source_name": "seed_public_demo", "source_url": None, "raw_payload": {}} for cid in ids]
+            )
+            self.assertEqual([c.name for c in repo.iter_companies_for_run(run_id, chunk_size=2)], ["Firma 0", "Firma 1", "Firma 2"])
+
+
+class PayloadStorageTests(unittest.TestCase):
+    def test_identical_payloads_are_stored_once_and_decoded_on_read(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/payloads.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                cid = repo.upsert_company({"name": "Firma", "industry": "X", "city": "Krefeld", "source_primary": "osm_public"})
+                payload = {"name": "Firma", "tags": {"amenity": "dentist"}, "city": "Krefeld"}
+                runs = [repo.create_run("Krefeld", "X", 5) for _ in range(3)]
+                for run_id in runs:
+                    # same content, different key order
+                    repo.insert_source_record(cid, run_id, "osm_public", "osm:1", dict(reversed(list(payload.items()))))
+                repo.insert_source_record(cid, runs[0], "osm_public", "osm:1", {**payload, "phone": "02151 1"})
+
+                with repo._conn() as conn:
+                    self.assertEqual(conn.execute("SELECT COUNT(*) FROM payloads").fetchone()[0], 2)
+                    self.assertEqual(conn.execute("SELECT COUNT(*) FROM source_records WHERE raw_payload_json != ''").fetchone()[0], 0)
+
+                records = list(repo.iter_source_records(runs[0]))
+                self.assertEqual([r["raw_payload"] for r in records], [payload, {**payload, "phone": "02151 1"}])
+                self.assertEqual(records[0]["source_url"], "osm:1")
+
+
+class LeadQueryTests(unittest.TestCase):
+    def test_filters_are_applied_in_sql(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/filters.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                leads = [
+                    ("Mail A", {"email": "info@mail-a.de", "website_url": "https://mail-a.de"}, 90, "A"),
+                    ("Phone A", {"phone": "02151 1"}, 85, "A"),
+                    ("Bare A", {"email": ""}, 82, "A"),
+                    ("Mail B", {"email": "info@mail-b.de"}, 60, "B"),
+                ]
+                for name, extra, total, cls in leads:
+                    cid = repo.upsert_company({"name": name, "industry": "X", "city": "Krefeld", "source_primary": "seed_public_demo", **extra})
+                    repo.insert_source_record(cid, run_id, "seed_public_demo", None, {})
+                    repo.insert_lead_score(cid, run_id, total, cls, {}, None)
+
+                def names(query: LeadQuery) -> list[str]:
+                    return [lead["name"] for lead in repo.iter_scored_leads(run_id, query)]
+
+                self.assertEqual(names(LeadQuery()), ["Mail A", "Phone A", "Bare A", "Mail B"])
+                self.assertEqual(names(LeadQuery(min_class="A", require_contact=True)), ["Mail A", "Phone A"])
+                self.assertEqual(names(LeadQuery(min_score=60, require_email=True)), ["Mail A", "Mail B"])
+                self.assertEqual(names(LeadQuery(require_website=True)), ["Mail A"])
+
+                lead = next(repo.iter_scored_leads(run_id, LeadQuery(min_class="A")))
+                self.assertIsInstance(lead, LeadRow)
+                self.assertEqual((lead.name, lead.score_total, lead.email), ("Mail A", 90, "info@mail-a.de"))
+                self.assertEqual(lead.get("website_url"), "https://mail-a.de")
+                self.assertIsNone(lead.get("not_a_column"))
+                self.assertEqual(dict(lead)["company_id"], lead.company_id)
+
+    def test_records_carry_no_instance_dict(self):
+        company = CompanyRecord("c", "n", "i", "k", None, None, None, None, None, None, None, "s", None, None)
+        self.assertFalse(hasattr(company, "__dict__"))
+        with self.assertRaises(AttributeError):
+            company.extra = 1  # type: ignore[attr-defined]
+
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/rows.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "X", 5)
+                cid = repo.upsert_company({"name": "Firma", "industry": "X", "city": "Krefeld", "source_primary": "seed_public_demo"})
+                repo.insert_source_record(cid, run_id, "seed_public_demo", None, {})
+                repo.insert_lead_score(cid, run_id, 90, "A", {}, None)
+                lead = next(repo.iter_scored_leads(run_id, LeadQuery(min_class="A")))
+        self.assertFalse(hasattr(lead, "__dict__"))
+        with self.assertRaises(AttributeError):
+            lead.extra = 1  # type: ignore[attr-defined]
+
+
+class RankingTests(unittest.TestCase):
+    def _score(self, repo: Repository, run_id: str, name: str, industry: str, total: int) -> str:
+        cid = repo.upsert_company({"name": name, "industry": industry, "city": "Krefeld", "source_primary": "seed_public_demo"})
+        repo.insert_source_record(cid, run_id, "seed_public_demo", None, {})
+        repo.insert_lead_score(cid, run_id, total, "A" if total >= 80 else "B" if total >= 50 else "C", {}, None)
+        return cid
+
+    def _ranks(self, repo: Repository, run_id: str) -> dict[str, int]:
+        with repo._conn() as conn:
+            rows = conn.execute(
+                "SELECT c.name, ls.priority_rank FROM lead_scores ls JOIN companies c ON c.id = ls.company_id WHERE ls.run_id=?", (run_id,)
+            ).fetchall()
+        return {r["name"]: r["priority_rank"] for r in rows}
+
+    def test_run_ranks_share_ties_and_respect_partitions(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/ranks.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Mixed", 5)
+                for name, industry, total in [("A1", "Zahnarzt", 90), ("A2", "Zahnarzt", 70), ("B1", "Friseur", 70), ("B2", "Friseur", 40)]:
+                    self._score(repo, run_id, name, industry, total)
+
+                self.assertEqual(repo.update_priority_ranks(run_id), 4)
+                self.assertEqual(self._ranks(repo, run_id), {"A1": 1, "A2": 2, "B1": 2, "B2": 4})
+                self.assertEqual(repo.update_priority_ranks(run_id), 0)
+
+                repo.update_priority_ranks(run_id, partition_by=["industry"])
+                self.assertEqual(self._ranks(repo, run_id), {"A1": 1, "A2": 2, "B1": 1, "B2": 2})
+                with self.assertRaises(ValueError):
+                    repo.update_priority_ranks(run_id, partition_by=["website_url"])
+
+    def test_global_ranking_uses_latest_score_per_company(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/global.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                old_run = repo.create_run("Krefeld", "Zahnarzt", 5)
+                new_run = repo.create_run("Krefeld", "Friseur", 5)
+                self._score(repo, old_run, "Praxis", "Zahnarzt", 95)
+                self._score(repo, old_run, "Labor", "Zahnarzt", 60)
+                self._score(repo, new_run, "Praxis", "Zahnarzt", 55)  # rescored lower in the newer run
+                self._score(repo, new_run, "Salon", "Friseur", 75)
+
+                ranking = [(lead.name, lead["global_rank"], lead["run_id"]) for lead in repo.iter_global_ranking()]
+                self.assertEqual(ranking, [("Salon", 1, new_run), ("Labor", 2, old_run), ("Praxis", 3, new_run)])
+
+                names = [lead.name for lead in repo.iter_global_ranking(LeadQuery(min_class="B", min_score=60), limit=1)]
+                self.assertEqual(names, ["Salon"])
+                self.assertEqual([lead.name for lead in repo.iter_global_ranking(run_ids=[old_run])], ["Praxis", "Labor"])
+                self.assertEqual(list(repo.iter_global_ranking(run_ids=[])), [])
+
+                by_industry = [(lead["industry"], lead.name, lead["global_rank"]) for lead in repo.iter_global_ranking(partition_by=["industry"])]
+                self.assertEqual(by_industry, [("Friseur", "Salon", 1), ("Zahnarzt", "Labor", 1), ("Zahnarzt", "Praxis", 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from tb_leads.db import schema
+from tb_leads.db.repository import Repository
+from tb_leads.db.schema import SCHEMA_VERSION, init_db
+
+
+def _index_names(db_path: str) -> set[str]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    finally:
+        conn.close()
+
+
+def _user_version(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class SchemaVersionTests(unittest.TestCase):
+    def test_current_db_skips_migrations(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/v.db"
+            init_db(db_path)
+            conn = sqlite3.connect(db_path)
+            try:
+                self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+                conn.execute("DROP INDEX idx_lead_scores_run_total")
+                conn.commit()
+            finally:
+                conn.close()
+
+            # up to date: nothing is re-run, the dropped index stays dropped
+            init_db(db_path)
+            self.assertNotIn("idx_lead_scores_run_total", _index_names(db_path))
+
+            conn = sqlite3.connect(db_path)
+            try:
+                conn.execute("PRAGMA user_version=0")
+                conn.commit()
+            finally:
+                conn.close()
+            init_db(db_path)
+            self.assertIn("idx_lead_scores_run_total", _index_names(db_path))
+
+    def test_unversioned_legacy_db_is_upgraded(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/legacy.db"
+            conn = sqlite3.connect(db_path)
+            try:
+                conn.execute(
+                    """
+                    CREATE TABLE runs (
+                        id TEXT PRIMARY KEY, started_at TEXT NOT NULL, finished_at TEXT,
+                        status TEXT NOT NULL CHECK(status IN ('running','success','failed')),
+                        region TEXT NOT NULL, industry TEXT NOT NULL, limit_requested INTEGER NOT NULL,
+                        collected_count INTEGER NOT NULL DEFAULT 0, scored_count INTEGER NOT NULL DEFAULT 0,
+                        synced_count INTEGER NOT NULL DEFAULT 0, error_count INTEGER NOT NULL DEFAULT 0, notes TEXT
+                    )
+                    """
+                )
+                conn.execute("INSERT INTO runs(id, started_at, status, region, industry, limit_requested) VALUES ('r1', 'x', 'success', 'Krefeld', 'Handwerk', 5)")
+                conn.commit()
+            finally:
+                conn.close()
+
+            init_db(db_path)
+
+            conn = sqlite3.connect(db_path)
+            try:
+                row = conn.execute("SELECT status, last_stage, network_error_count FROM runs WHERE id='r1'").fetchone()
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+            finally:
+                conn.close()
+            self.assertEqual(row, ("completed", "init", 0))
+            self.assertEqual(version, SCHEMA_VERSION)
+            self.assertIn("idx_source_records_run_company", _index_names(db_path))
+
+            # child tables still reference the rebuilt runs table
+            with Repository(db_path) as repo:
+                cid = repo.upsert_company({"name": "Firma", "industry": "Handwerk", "city": "Krefeld", "source_primary": "seed_public_demo"})
+                repo.insert_source_record(cid, "r1", "seed_public_demo", None, {})
+                self.assertEqual([c.id for c in repo.get_companies_for_run("r1")], [cid])
+
+    def test_run_membership_is_backfilled_from_source_records(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/members.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Handwerk", 5)
+                cid = repo.upsert_company({"name": "Firma", "industry": "Handwerk", "city": "Krefeld", "source_primary": "seed_public_demo"})
+                repo.insert_source_record(cid, run_id, "seed_public_demo", None, {})
+                repo.insert_source_record(cid, run_id, "osm_public", None, {})
+                with repo._conn() as conn:
+                    self.assertEqual(conn.execute("SELECT COUNT(*) FROM run_companies").fetchone()[0], 1)
+                    conn.execute("DELETE FROM run_companies")
+                    conn.execute("PRAGMA user_version=0")
+
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                self.assertEqual([c.id for c in repo.get_companies_for_run(run_id)], [cid])
+
+    def test_inline_payloads_are_moved_to_payload_store(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/inline.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Handwerk", 5)
+                cid = repo.upsert_company({"name": "Firma", "industry": "Handwerk", "city": "Krefeld", "source_primary": "seed_public_demo"})
+                with repo._conn() as conn:
+                    for i in range(3):
+                        conn.execute(
+                            "INSERT INTO source_records(id, company_id, source_name, raw_payload_json, collected_at, run_id) VALUES (?, ?, 'csv', ?, ?, ?)",
+                            (f"s{i}", cid, '{"name": "Firma"}', f"2026-01-0{i + 1}", run_id),
+                        )
+                    conn.execute("PRAGMA user_version=0")
+
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                self.assertEqual([r["raw_payload"] for r in repo.iter_source_records(run_id)], [{"name": "Firma"}] * 3)
+                with repo._conn() as conn:
+                    self.assertEqual(conn.execute("SELECT COUNT(*) FROM payloads").fetchone()[0], 1)
+                    self.assertEqual(conn.execute("SELECT COUNT(*) FROM source_records WHERE payload_hash IS NULL").fetchone()[0], 0)
+
+    def test_failed_migration_step_leaves_previous_version(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/fail.db"
+            init_db(db_path)
+            conn = sqlite3.connect(db_path)
+            try:
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION - 1}")
+                conn.commit()
+            finally:
+                conn.close()
+
+            def broken_step(conn: sqlite3.Connection) -> None:
+                conn.execute("CREATE INDEX idx_probe ON runs(region)")
+                raise RuntimeError("boom")
+
+            with mock.patch.object(schema, "MIGRATIONS", schema.MIGRATIONS[:-1] + (broken_step,)):
+                with self.assertRaises(RuntimeError):
+                    init_db(db_path)
+
+            self.assertEqual(_user_version(db_path), SCHEMA_VERSION - 1)
+            self.assertNotIn("idx_probe", _index_names(db_path))
+
+            init_db(db_path)
+            self.assertEqual(_user_version(db_path), SCHEMA_VERSION)
+
+    def test_concurrent_upgrades_apply_each_step_once(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/race.db"
+            init_db(db_path)
+            conn = sqlite3.connect(db_path)
+            try:
+                conn.execute("PRAGMA user_version=0")
+                conn.commit()
+            finally:
+                conn.close()
+
+            errors: list[BaseException] = []
+
+            def upgrade() -> None:
+                try:
+                    init_db(db_path)
+                except BaseException as exc:  # noqa: BLE001
+                    errors.append(exc)
+
+            threads = [threading.Thread(target=upgrade) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            self.assertEqual(errors, [])
+            self.assertEqual(_user_version(db_path), SCHEMA_VERSION)
+            self.assertIn("idx_scores_class_total", _index_names(db_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,38 @@
+import argparse
+import contextlib
+import io
+import random
+import tempfile
+import time
 import unittest
 
+from tb_leads.cli.main import RunCounters, _score_records, _simulate_scoring  # type: ignore
+from tb_leads.config.loader import load_scoring_override
+from tb_leads.db.repository import Repository
+from tb_leads.db.schema import init_db
+
+from tb_leads.scoring import batch
+from tb_leads.scoring.batch import columns_from_audits, score_batch
 from tb_leads.scoring.engine import score_lead
+from tb_leads.scoring.model import DEFAULT_SCORING, compile_scoring_model
+from tb_leads.scoring.simulate import format_simulation, simulate_scoring
+
+
+def _random_audits(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    values = [None, 0, 10, 30, 49, 50, 69, 70, 89, 90, 100, 62.7]
+    return [
+        {
+            "company_id": f"c{i}",
+            "website_present": rng.random() > 0.2,
+            "mobile_pagespeed_score": rng.choice(values),
+            "seo_score": rng.choice(values),
+            "has_contact_cta": rng.random() > 0.5,
+            "has_contact_form": rng.random() > 0.5,
+            "tech_health_score": rng.choice(values),
+        }
+        for i in range(n)
+    ]
 
 
 class ScoringTests(unittest.TestCase):
@@ -30,5 +62,208 @@ class ScoringTests(unittest.TestCase):
         self.assertEqual(result["class"], "C")
 
 
+class BatchScoringTests(unittest.TestCase):
+    def _assert_matches_score_lead(self, use_numpy: bool) -> None:
+        audits = _random_audits(500)
+        scores = score_batch(columns_from_audits(audits), use_numpy=use_numpy)
+
+        expected = [score_lead(a) for a in audits]
+        for row, exp in zip(scores.rows(), expected):
+            self.assertEqual((row["total"], row["class"], row["breakdown"]), (exp["total"], exp["class"], exp["breakdown"]))
+
+        # competition ranks: 1 + number of better totals, ties share a rank
+        totals = [exp["total"] for exp in expected]
+        self.assertEqual(scores.ranks, [1 + sum(other > t for other in totals) for t in totals])
+
+    def test_python_path_matches_score_lead(self):
+        self._assert_matches_score_lead(use_numpy=False)
+
+    @unittest.skipIf(batch.np is None, "NumPy not installed")
+    def test_numpy_path_matches_score_lead(self):
+        self._assert_matches_score_lead(use_numpy=True)
+
+    def test_empty_batch(self):
+        scores = score_batch(columns_from_audits([]))
+        self.assertEqual((scores.totals, scores.ranks, list(scores.rows())), ([], [], []))
+
+    def test_ranks_match_update_priority_ranks(self):
+        audits = _random_audits(60, seed=3)
+        paths = [False] + ([True] if batch.np is not None else [])
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/ranks.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 60)
+                ids = repo.upsert_companies(
+                    [{"name": a["company_id"], "industry": "X", "city": "Krefeld", "source_primary": "seed_public_demo"} for a in audits]
+                )
+                for audit, company_id in zip(audits, ids):
+                    audit["company_id"] = company_id
+                scores = score_batch(columns_from_audits(audits), use_numpy=False)
+                repo.insert_lead_scores(
+                    run_id,
+                    (
+                        {"company_id": row["key"], "score_total": row["total"], "score_class": row["class"], "breakdown": row["breakdown"]}
+                        for row in scores.rows()
+                    ),
+                )
+                repo.update_priority_ranks(run_id)
+                with repo._conn() as conn:
+                    sql_ranks = dict(conn.execute("SELECT company_id, priority_rank FROM lead_scores WHERE run_id=?", (run_id,)).fetchall())
+
+        self.assertLess(len(set(scores.totals)), len(audits))  # the sample has ties
+        for use_numpy in paths:
+            with self.subTest(use_numpy=use_numpy):
+                scores = score_batch(columns_from_audits(audits), use_numpy=use_numpy)
+                self.assertEqual(dict(zip(scores.keys, scores.ranks)), sql_ranks)
+
+
+class ScoringModelTests(unittest.TestCase):
+    def _custom_model(self):
+        spec = {
+            "components": [
+                {"name": "website_present", "type": "flag", "field": "website_present", "points": 10},
+                {"name": "mobile_pagespeed", "type": "buckets", "field": "mobile_pagespeed_score", "buckets": [[80, 40], [40, 20]], "default": 5},
+                {"name": "seo_basics", "type": "scaled", "field": "seo_score", "max_points": 30},
+                {"name": "contact_path", "type": "flags", "points": {"has_contact_form": 20}},
+            ],
+            "classes": {"A": 90, "B": 40},
+            "default_class": "C",
+        }
+        return compile_scoring_model(spec)
+
+    def test_model_is_compiled_once_per_spec(self):
+        self.assertIs(compile_scoring_model(), compile_scoring_model(DEFAULT_SCORING))
+        self.assertIs(self._custom_model(), self._custom_model())
+        self.assertNotEqual(self._custom_model().fingerprint, compile_scoring_model().fingerprint)
+
+    def test_config_rules_change_scores_and_classes(self):
+        model = self._custom_model()
+        audit = {"website_present": True, "mobile_pagespeed_score": 85, "seo_score": 50, "has_contact_cta": True, "has_contact_form": True, "tech_health_score": 100}
+        result = score_lead(audit, model)
+        self.assertEqual(result["breakdown"], {"website_present": 10, "mobile_pagespeed": 40, "seo_basics": 15, "contact_path": 20})
+        self.assertEqual((result["total"], result["class"]), (85, "B"))
+        self.assertEqual(score_lead(audit)["class"], "A")
+
+    def test_class_names_must_be_accepted_by_the_db(self):
+        self.assertEqual(compile_scoring_model().classes, ("A", "B", "C"))
+        self.assertEqual(compile_scoring_model({**DEFAULT_SCORING, "classes": {"A": 70}}).classes, ("A", "C"))
+        with self.assertRaises(ValueError):
+            compile_scoring_model({**DEFAULT_SCORING, "classes": {"A+": 95, "A": 80}})
+        with self.assertRaises(ValueError):
+            compile_scoring_model({**DEFAULT_SCORING, "default_class": "D"})
+
+    def test_batch_uses_the_same_model(self):
+        model = self._custom_model()
+        # include values outside the precomputed 0..100 tables
+        audits = _random_audits(200) + [{"company_id": "x", "mobile_pagespeed_score": 150, "seo_score": -20}]
+        paths = [False] + ([True] if batch.np is not None else [])
+        for use_numpy in paths:
+            scores = score_batch(columns_from_audits(audits, model=model), model, use_numpy=use_numpy)
+            for row, audit in zip(scores.rows(), audits):
+                exp = score_lead(audit, model)
+                self.assertEqual((row["total"], row["class"], row["breakdown"]), (exp["total"], exp["class"], exp["breakdown"]))
+
+
+class IncrementalScoringTests(unittest.TestCase):
+    def _scores(self, repo: Repository, run_id: str) -> dict[str, tuple]:
+        with repo._conn() as conn:
+            rows = conn.execute("SELECT id, company_id, score_total, priority_rank FROM lead_scores WHERE run_id=?", (run_id,)).fetchall()
+        return {r["company_id"]: (r["id"], r["score_total"], r["priority_rank"]) for r in rows}
+
+    def test_only_changed_audits_are_rescored(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/incremental.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                ids = repo.upsert_companies([{"name": f"Firma {i}", "industry": "X", "city": "Krefeld", "source_primary": "seed_public_demo"} for i in range(3)])
+                repo.insert_source_records(run_id, [{"company_id": cid, "source_name": "seed_public_demo", "source_url": None, "raw_payload": {}} for cid in ids])
+                repo.insert_website_audits(run_id, [(cid, {"website_present": True, "seo_score": 40 + 20 * i}) for i, cid in enumerate(ids)])
+
+                counters = RunCounters()
+                self.assertEqual(_score_records(run_id, {}, repo, counters), 3)
+                self.assertEqual(counters.scores_recomputed, 3)
+                first = self._scores(repo, run_id)
+                self.assertEqual([first[cid][2] for cid in ids], [3, 2, 1])
+
+                counters = RunCounters()
+                _score_records(run_id, {}, repo, counters)
+                self.assertEqual(counters.scores_recomputed, 0)
+                self.assertEqual(self._scores(repo, run_id), first)
+
+                time.sleep(0.01)  # newer audited_at
+                repo.insert_website_audit(ids[0], run_id, {"website_present": True, "seo_score": 100})
+                counters = RunCounters()
+                _score_records(run_id, {}, repo, counters)
+                self.assertEqual(counters.scores_recomputed, 1)
+                second = self._scores(repo, run_id)
+                self.assertEqual([second[cid][2] for cid in ids], [1, 3, 2])
+                self.assertEqual(second[ids[1]][0], first[ids[1]][0])
+
+                counters = RunCounters()
+                _score_records(run_id, {"scoring": {**DEFAULT_SCORING, "classes": {"A": 90, "B": 40}}}, repo, counters)
+                self.assertEqual(counters.scores_recomputed, 3)
+
+
+class SimulationTests(unittest.TestCase):
+    def test_simulation_reports_shifts_without_writing(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/simulate.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 5)
+                ids = repo.upsert_companies([{"name": f"Firma {i}", "industry": "X", "city": "Krefeld", "source_primary": "seed_public_demo"} for i in range(3)])
+                repo.insert_website_audits(run_id, [(ids[0], {"website_present": True, "seo_score": 100, "tech_health_score": 100})])
+                repo.insert_website_audits(run_id, [(ids[1], {"website_present": True, "has_contact_form": True, "has_contact_cta": True})])
+                repo.insert_website_audits(run_id, [(ids[2], {"website_present": True, "mobile_pagespeed_score": 95})])
+                time.sleep(0.01)
+                # only the latest audit per company counts
+                repo.insert_website_audits(run_id, [(ids[2], {"website_present": True, "mobile_pagespeed_score": 95, "seo_score": 100})])
+
+                baseline = compile_scoring_model()
+                # contact path worth more, website presence worth nothing
+                spec = {**DEFAULT_SCORING, "components": [dict(c) for c in DEFAULT_SCORING["components"]]}
+                spec["components"][0]["points"] = 0
+                spec["components"][3]["points"] = {"has_contact_cta": 30, "has_contact_form": 30}
+                candidate = compile_scoring_model(spec)
+
+                fields = sorted({*baseline.flag_fields, *baseline.value_fields})
+                result = simulate_scoring(repo.iter_latest_audits(fields), baseline, candidate, top=1)
+
+                # baseline: 55 / 40 / 65 -> candidate: 35 / 60 / 45
+                self.assertEqual(result.audits, 3)
+                self.assertEqual(result.baseline_classes, {"B": 2, "C": 1})
+                self.assertEqual(result.candidate_classes, {"B": 1, "C": 2})
+                self.assertEqual(result.transitions[("B", "C")], 2)
+                self.assertEqual(result.transitions[("C", "B")], 1)
+                self.assertEqual(result.top_kept, 0)
+                moves = {m.name: (m.baseline_rank, m.candidate_rank) for m in result.movers}
+                self.assertEqual(moves, {"Firma 0": (2, 3), "Firma 1": (3, 1), "Firma 2": (1, 2)})
+                self.assertEqual(repo.get_scored_leads_for_run(run_id), [])
+
+                with self.assertRaises(ValueError):
+                    repo.iter_latest_audits(["seo_score; DROP TABLE companies"])
+
+                with open(f"{td}/alt.yaml", "w", encoding="utf-8") as fh:
+                    fh.write("scoring:\n  classes:\n    A: 60\n")
+                out = io.StringIO()
+                with contextlib.redirect_stdout(out):
+                    code = _simulate_scoring(argparse.Namespace(scoring_config=f"{td}/alt.yaml", run_id=[run_id], top=10), {}, repo)
+                self.assertEqual(code, 0)
+                self.assertIn("Klassenverteilung alternativ: A=1 B=1 C=1", out.getvalue())
+
+                # classes come from the models, not a fixed list
+                two_classes = compile_scoring_model({**DEFAULT_SCORING, "classes": {"A": 60}})
+                result = simulate_scoring(repo.iter_latest_audits(fields), two_classes, two_classes)
+                self.assertEqual(result.classes, ("A", "C"))
+                self.assertIn("  A -> A=1 C=0", format_simulation(result))
+
+                with open(f"{td}/bad.yaml", "w", encoding="utf-8") as fh:
+                    fh.write("classes:\n  S: 95\n")
+                with self.assertRaises(ValueError):
+                    load_scoring_override(f"{td}/bad.yaml", DEFAULT_SCORING)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,7 @@ from tb_leads.cli.main import _sync_records  # type: ignore
 from tb_leads.cli.main import RunCounters
 from tb_leads.db.repository import Repository
 from tb_leads.db.schema import init_db
+from tb_leads.scoring.model import DEFAULT_SCORING
 from tb_leads.utils.http import HttpClient
 from tb_leads.utils.retry import RetryPolicy
 from tb_leads.utils.throttle import RateLimiter
@@ -94,6 +95,31 @@ class SyncFilterConfigTests(unittest.TestCase):
             self.assertEqual(counts["success"], 0)
             self.assertEqual(counts["failed"], 0)
 
+    def test_min_score_maps_to_class_with_configured_cutoffs(self):
+        with tempfile.TemporaryDirectory() as td:
+            db_path = f"{td}/sync_classes.db"
+            init_db(db_path)
+            with Repository(db_path) as repo:
+                run_id = repo.create_run("Krefeld", "Dienstleister", 10)
+                cid = repo.upsert_company({"name": "Lead B", "industry": "Dienstleister", "city": "Krefeld", "source_primary": "seed_public_demo"})
+                repo.insert_source_record(cid, run_id, "seed_public_demo", "seed:1", {"name": "Lead B"})
+                # class B under the configured cutoffs below (A starts at 90)
+                repo.insert_lead_score(cid, run_id, score_total=86, score_class="B", breakdown={}, priority_rank=1)
+
+                cfg = {
+                    "min_score_for_sync": 85,
+                    "scoring": {**DEFAULT_SCORING, "classes": {"A": 90, "B": 60}},
+                    "notion_token": None,
+                    "notion_db_id": None,
+                }
+                http_client = HttpClient(
+                    timeout_s=2,
+                    rate_limiter=RateLimiter(max_requests_per_minute=1000),
+                    retry_policy=RetryPolicy(max_attempts=2, base_delay_s=0.01, max_delay_s=0.05, jitter_s=0),
+                )
+                result = _sync_records(run_id, None, None, cfg, repo, RunCounters(), http_client)
+                self.assertEqual(result["counts"]["skipped"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
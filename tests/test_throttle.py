@@ -0,0 +1,89 @@
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from tb_leads.utils.throttle import HostRateLimiter, RateLimiter, SqliteLimiterStore, gcra_reserve
+
+
+class GcraTests(unittest.TestCase):
+    def test_gcra_reserve_allows_burst_then_spaces_requests(self):
+        tat = None
+        waits = []
+        for _ in range(4):
+            tat, wait = gcra_reserve(tat, now=100.0, interval_s=2.0, tolerance_s=2.0)
+            waits.append(wait)
+        self.assertEqual(waits, [0.0, 0.0, 2.0, 4.0])
+
+    def test_rate_limiter_waits_exactly_one_interval(self):
+        limiter = RateLimiter(max_requests_per_minute=600, burst=2)
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertEqual(limiter.acquire(), 0.0)
+
+        started = time.monotonic()
+        waited = limiter.acquire()
+        elapsed = time.monotonic() - started
+        self.assertAlmostEqual(waited, 0.1, delta=0.02)
+        self.assertGreaterEqual(elapsed, 0.08)
+
+    def test_fractional_rates_are_not_rounded_up(self):
+        limiter = RateLimiter(max_requests_per_minute=0.5, burst=1)
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertAlmostEqual(limiter.reserve(), 120.0, delta=0.5)
+
+        hosts = HostRateLimiter(default_requests_per_minute=0.5, burst=1, groups={"slow": {"hosts": ["slow.example"], "requests_per_minute": 0.25}})
+        self.assertEqual(hosts.bucket_for("firma.de").max_requests_per_minute, 0.5)
+        self.assertEqual(hosts.bucket_for("slow.example").max_requests_per_minute, 0.25)
+
+    def test_closing_limiters_closes_the_shared_store(self):
+        with tempfile.TemporaryDirectory() as td:
+            store = SqliteLimiterStore(str(Path(td) / "state.ratelimit"))
+            limiter = RateLimiter(max_requests_per_minute=60, store=store)
+            hosts = HostRateLimiter(groups={"notion": {"hosts": ["api.notion.com"]}}, store=store)
+            limiter.close()
+            hosts.close()
+            with self.assertRaises(sqlite3.ProgrammingError):
+                store.reserve("global", 1.0, 0.0)
+
+    def test_sqlite_store_shares_budget_between_limiters(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = str(Path(td) / "tb_leads.db.ratelimit")
+            store_a = SqliteLimiterStore(path)
+            store_b = SqliteLimiterStore(path)
+            try:
+                a = RateLimiter(max_requests_per_minute=60, burst=1, store=store_a, key="api:nominatim")
+                b = RateLimiter(max_requests_per_minute=60, burst=1, store=store_b, key="api:nominatim")
+                self.assertEqual(a.reserve(), 0.0)
+                self.assertAlmostEqual(b.reserve(), 1.0, delta=0.05)
+            finally:
+                store_a.close()
+                store_b.close()
+
+
+class HostRateLimiterTests(unittest.TestCase):
+    def test_hosts_have_independent_buckets(self):
+        limiter = HostRateLimiter(default_requests_per_minute=1, burst=1)
+        self.assertEqual(limiter.acquire("a.example"), 0.0)
+        self.assertEqual(limiter.acquire("b.example"), 0.0)
+        self.assertIsNot(limiter.bucket_for("a.example"), limiter.bucket_for("b.example"))
+        self.assertGreater(limiter.bucket_for("a.example").reserve(), 0)
+
+    def test_api_group_hosts_share_one_bucket(self):
+        limiter = HostRateLimiter(
+            groups={"overpass": {"hosts": ["overpass-api.de", "overpass.kumi.systems"], "requests_per_minute": 10}},
+        )
+        self.assertEqual(limiter.group_for("overpass-api.de"), "overpass")
+        self.assertIs(limiter.bucket_for("overpass-api.de"), limiter.bucket_for("overpass.kumi.systems"))
+        self.assertEqual(limiter.bucket_for("overpass-api.de").max_requests_per_minute, 10)
+        self.assertIsNone(limiter.group_for("firma.de"))
+
+    def test_idle_host_buckets_are_evicted(self):
+        limiter = HostRateLimiter(default_requests_per_minute=60, burst=1, max_buckets=2)
+        for host in ["a.example", "b.example", "c.example"]:
+            limiter.bucket_for(host)
+        self.assertLessEqual(len(limiter._host_buckets), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()